@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils.timezone import now
 from .models import News, Page
 
 
@@ -19,7 +20,7 @@ class NewsAdmin(admin.ModelAdmin):
     """
 
     # Fields to display in the admin list view
-    list_display = ('title', 'is_published', 'views', 'created_at', 'updated_at')
+    list_display = ('title', 'is_published', 'total_views', 'created_at', 'updated_at')
 
     # Filters to enable in the sidebar
     list_filter = ('is_published', 'created_at', 'tags')
@@ -46,20 +47,30 @@ class NewsAdmin(admin.ModelAdmin):
         """
         Custom action to mark selected news articles as published.
         """
-        queryset.update(is_published=True)
+        queryset.update(is_published=True, updated_at=now())  # update() skips auto_now
         self.message_user(request, f"{queryset.count()} articles marked as published.")
 
     def mark_as_unpublished(self, request, queryset):
         """
         Custom action to mark selected news articles as unpublished.
         """
-        queryset.update(is_published=False)
+        queryset.update(is_published=False, updated_at=now())
         self.message_user(request, f"{queryset.count()} articles marked as unpublished.")
 
+    def total_views(self, obj):
+        """
+        Displays the stored view count plus the hits not yet flushed.
+        """
+        return obj.total_views
+
     # Descriptions for custom actions
     mark_as_published.short_description = "Mark selected articles as published"
     mark_as_unpublished.short_description = "Mark selected articles as unpublished"
 
+    # Column label and sorting for the view count
+    total_views.short_description = "Views Count"
+    total_views.admin_order_field = 'views'
+
 
 # -------------------------------
 # Admin Configuration for Page
@@ -0,0 +1,95 @@
+import os
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.db import connections, router
+from django.shortcuts import redirect, render
+
+from bike_connect.apps.users.middleware import auth_query_stats
+from bike_connect.db_pool import pool_stats
+from .caching import cache_stats
+
+
+# -------------------------------
+# Cache Inspection
+# -------------------------------
+
+def _backend_details(cache):
+    """
+    Returns the number of entries, their size in bytes and the server-side
+    hit / miss counters of a cache, where the backend exposes them.
+    """
+    details = {'entries': None, 'size': None, 'hits': None, 'misses': None}
+    backend = type(cache).__name__
+    if backend == 'LocMemCache':
+        details['entries'] = len(cache._cache)
+    elif backend == 'FileBasedCache':
+        files = cache._list_cache_files()
+        details['entries'] = len(files)
+        details['size'] = sum(os.path.getsize(name) for name in files if os.path.exists(name))
+    elif backend == 'DatabaseCache':
+        connection = connections[router.db_for_read(cache.cache_model_class)]
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(cache._table)}')
+            details['entries'] = cursor.fetchone()[0]
+    elif backend == 'RedisCache':
+        client = cache._cache.get_client()
+        info = client.info()
+        details.update(
+            entries=client.dbsize(), size=info.get('used_memory'),
+            hits=info.get('keyspace_hits'), misses=info.get('keyspace_misses'),
+        )
+    return details
+
+
+def describe_caches():
+    """
+    Returns one row per configured cache with its backend, location and usage.
+    """
+    rows = []
+    for alias, config in settings.CACHES.items():
+        cache = caches[alias]
+        row = {
+            'alias': alias,
+            'backend': type(cache).__name__,
+            'location': config.get('LOCATION', ''),
+            'timeout': config.get('TIMEOUT', 300),
+            'error': None,
+        }
+        try:
+            row.update(_backend_details(cache))
+        except Exception as e:  # An unreachable backend must not break the page
+            row.update(entries=None, size=None, hits=None, misses=None, error=str(e))
+        rows.append(row)
+    return rows
+
+
+# -------------------------------
+# Admin Page
+# -------------------------------
+
+@staff_member_required
+def cache_stats_view(request):
+    """
+    Shows the configured caches, the hit / miss counters and the database
+    connection pools of this process.
+    Superusers can clear a cache with a POST request.
+    """
+    if request.method == 'POST' and request.user.is_superuser:
+        alias = request.POST.get('alias')
+        if alias in settings.CACHES:
+            caches[alias].clear()
+            messages.success(request, f"Cache '{alias}' cleared.")
+        return redirect('admin_cache_stats')
+
+    counters = sorted(cache_stats().items())
+    return render(request, 'admin/cache_stats.html', {
+        **admin.site.each_context(request),
+        'title': 'Cache statistics',
+        'caches': describe_caches(),
+        'counters': counters,
+        'auth': auth_query_stats(),
+        'databases': sorted(pool_stats().items()),
+    })
@@ -1,13 +1,75 @@
+from django.db.models import F, Sum
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+from .conditional import ConditionalAPIMixin, collection_validators, object_validators
+from .fastjson import FastJSONMixin
 from .models import News
-from .serializers import NewsSerializer
+from .pagination import KeysetPagination
+from .replicas import ReplicaReadMixin
+from .search import search
+from .serializers import NewsSerializer, SearchResultSerializer
+from .viewcounts import pending_total, pending_views
 
 
-class NewsListAPI(ListAPIView):
+class NewsListAPI(ReplicaReadMixin, ConditionalAPIMixin, FastJSONMixin, ListAPIView):
     queryset = News.objects.filter(is_published=True).order_by('-created_at')
     serializer_class = NewsSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
 
+    def get_list_validators(self):
+        # View counts change without touching updated_at
+        validators = collection_validators(self.get_queryset(), total_views=Sum('views'))
+        validators['pending_views'] = pending_total()
+        return validators
 
-class NewsDetailAPI(RetrieveAPIView):
+
+class NewsDetailAPI(ReplicaReadMixin, ConditionalAPIMixin, FastJSONMixin, RetrieveAPIView):
     queryset = News.objects.filter(is_published=True)
     serializer_class = NewsSerializer
+
+    def get_object_validators(self):
+        queryset = self.get_queryset().filter(pk=self.kwargs['pk'])
+        validators = object_validators(queryset, total_views=F('views'))
+        if validators is not None:
+            validators['total_views'] += pending_views(self.kwargs['pk'])
+        return validators
+
+
+class SearchAPI(ReplicaReadMixin, APIView):
+    """
+    Ranked full-text search across events, news and bike posts.
+
+    Query parameters:
+        q: The search query (required).
+        kind: Optional comma-separated kinds to search ('event', 'news', 'bikepost').
+        page: Page number, starting at 1.
+    """
+    page_size = 20
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        kinds = [kind for kind in request.query_params.get('kind', '').split(',') if kind]
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+
+        # Fetch one extra result to find out whether there is a next page
+        offset = (page - 1) * self.page_size
+        results = search(query, kinds=kinds, limit=self.page_size + 1, offset=offset)
+        has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        url = request.build_absolute_uri()
+        previous_url = None
+        if page > 1:
+            previous_url = (replace_query_param(url, 'page', page - 1) if page > 2
+                            else remove_query_param(url, 'page'))
+        return Response({
+            'next': replace_query_param(url, 'page', page + 1) if has_next else None,
+            'previous': previous_url,
+            'results': SearchResultSerializer(results, many=True).data,
+        })
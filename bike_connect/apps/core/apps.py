@@ -13,3 +13,11 @@ class CoreConfig(AppConfig):
 
     # The name of the application. This must match the app directory name.
     name = 'bike_connect.apps.core'
+
+    def ready(self):
+        """
+        Connects the signal receivers of the application once all models are loaded.
+        """
+        from . import signals
+
+        signals.connect_signals()
@@ -0,0 +1,609 @@
+import asyncio
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import BytesIO
+from types import SimpleNamespace
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, connections
+from django.template import Context, Template
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.events.participation import refresh_participant_counts
+from bike_connect.apps.events.serializers import EventListSerializer, EventSerializer
+from .serializers import NewsSerializer
+from bike_connect.apps.posts.models import BikePost, Comment
+from . import geo, images
+from .fastjson import encode, get_plan, plan_paths, render_rows
+from .models import News
+from .profiling import QueryRecorder
+from .search import rebuild_index
+
+User = get_user_model()
+
+# Password of every seeded user
+BENCH_PASSWORD = 'bench-password'
+
+# Filler giving seeded events a realistically long description
+RIDE_DETAILS = (
+    "We meet at the main square, ride at a conversational pace and regroup at every junction. "
+    "Bring two spare tubes, a pump, lights and enough water for four hours. The route climbs "
+    "steadily for the first hour, then follows quiet roads along the river back to town. "
+) * 3
+
+# Pages and APIs measured by default: name -> URL pattern name
+DEFAULT_TARGETS = {
+    'landing': 'home',
+    'event_list': 'events:event_list',
+    'post_list': 'posts:bikepost_list',
+    'news_list': 'core:news_list',
+    'events_api': 'event-list',
+    'news_api': 'core:api_news_list',
+}
+
+
+# -------------------------------
+# Synthetic Dataset
+# -------------------------------
+
+def _located(instance):
+    # bulk_create skips the signal that geocodes locations
+    geo.locate(instance)
+    return instance
+
+
+def seed_dataset(users=20, events=200, participations=500, posts=100, comments=300, news=50, seed=42):
+    """
+    Fills the database with a reproducible synthetic dataset using bulk inserts.
+
+    Returns:
+        dict: The number of rows created per model.
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCH_PASSWORD)
+    today = date.today()
+
+    user_objs = User.objects.bulk_create(
+        User(username=f'bench{i}', password=password, email=f'bench{i}@example.com') for i in range(users)
+    )
+    event_objs = Event.objects.bulk_create(
+        _located(Event(
+            title=f'Ride {i}', description=f'Group ride number {i} through the hills. ' + RIDE_DETAILS,
+            location=rng.choice(['Sofia', 'Plovdiv', 'Varna', 'Burgas']),
+            date=today + timedelta(days=rng.randint(-30, 180)), organizer=rng.choice(user_objs),
+        ))
+        for i in range(events)
+    ) if user_objs else []
+
+    pairs = {(rng.randrange(users), rng.randrange(len(event_objs))) for _ in range(participations)} if event_objs else set()
+    Participation.objects.bulk_create(
+        Participation(user=user_objs[u], event=event_objs[e], status=rng.choice(['joined', 'joined', 'cancelled']))
+        for u, e in pairs
+    )
+    refresh_participant_counts()
+
+    categories = [choice for choice, _ in BikePost.CATEGORY_CHOICES]
+    post_objs = BikePost.objects.bulk_create(
+        _located(BikePost(
+            title=f'Bike {i}', description=f'Well kept bike number {i}', category=rng.choice(categories),
+            price=rng.randint(50, 3000), location='Sofia', posted_by=rng.choice(user_objs),
+        ))
+        for i in range(posts)
+    ) if user_objs else []
+    Comment.objects.bulk_create(
+        Comment(text=f'Comment {i}', bike_post=rng.choice(post_objs), posted_by=rng.choice(user_objs))
+        for i in range(comments if post_objs else 0)
+    )
+    News.objects.bulk_create(
+        News(title=f'News {i}', content=f'Cycling news number {i}', tags='bench') for i in range(news)
+    )
+
+    # bulk_create skips the signals that maintain the search index
+    rebuild_index()
+    return {
+        'users': len(user_objs), 'events': len(event_objs), 'participations': len(pairs),
+        'posts': len(post_objs), 'comments': comments if post_objs else 0, 'news': news,
+    }
+
+
+# -------------------------------
+# Measuring
+# -------------------------------
+
+def percentile(values, pct):
+    """
+    Returns the nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure(client, url, requests=50, warmup=5):
+    """
+    Requests the URL repeatedly and returns its latency and query statistics.
+
+    Latencies are in milliseconds; `rps` is the sequential throughput of a
+    single in-process client.
+    """
+    for _ in range(warmup):
+        client.get(url)
+
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for _ in range(requests):
+        with QueryRecorder() as recorder:
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(recorder.count)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{url} returned {response.status_code}')
+    elapsed = time.perf_counter() - started
+
+    return {
+        'url': url,
+        'requests': requests,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'rps': round(requests / elapsed, 1) if elapsed else None,
+        'queries_per_request': round(statistics.fmean(queries), 2),
+    }
+
+
+def run_benchmarks(targets=None, requests=50, warmup=5, username=None):
+    """
+    Measures every target through the Django test client.
+
+    Args:
+        targets: Mapping of result name -> URL pattern name or path.
+        requests: Measured requests per target.
+        warmup: Unmeasured requests per target, to warm caches.
+        username: Seeded user to log in as; anonymous if None.
+    """
+    client = Client()
+    if username:
+        client.login(username=username, password=BENCH_PASSWORD)
+    results = {}
+    for name, target in (targets or DEFAULT_TARGETS).items():
+        url = target if target.startswith('/') else reverse(target)
+        results[name] = measure(client, url, requests=requests, warmup=warmup)
+    return results
+
+
+# -------------------------------
+# Serializer Benchmarks
+# -------------------------------
+
+class LegacyEventSerializer(serializers.ModelSerializer):
+    """
+    The Event serializer as it was before the list/detail split, for comparison.
+    """
+
+    class Meta:
+        model = Event
+        fields = '__all__'
+
+
+def _api_request(params=None):
+    return Request(APIRequestFactory().get('/', params or {}))
+
+
+def event_serializer_variants():
+    """
+    Returns name -> (queryset factory, serializer class, request) for every way
+    of serializing the event list that is compared.
+    """
+    sparse = EventListSerializer.model_fields({'id', 'title', 'date'})
+    full = EventListSerializer.model_fields()
+    return {
+        'legacy_all_fields': (
+            lambda: Event.objects.only('id', 'title', 'description', 'date', 'image'),
+            LegacyEventSerializer, _api_request(),
+        ),
+        'detail_serializer': (
+            lambda: Event.objects.select_related('organizer').only('organizer', *EventSerializer.model_fields()),
+            EventSerializer, _api_request(),
+        ),
+        'list_serializer': (
+            lambda: Event.objects.select_related('organizer').only('organizer', *full),
+            EventListSerializer, _api_request(),
+        ),
+        'list_fields_id_title_date': (
+            lambda: Event.objects.only(*sparse),
+            EventListSerializer, _api_request({'fields': 'id,title,date'}),
+        ),
+    }
+
+
+def measure_serializer(queryset_factory, serializer_class, request, repeat=3):
+    """
+    Serializes and renders a whole queryset to JSON, `repeat` times.
+
+    Returns:
+        dict: Best wall time in ms, queries of one run and payload size in bytes.
+    """
+    timings, payload, queries = [], b'', 0
+    for _ in range(repeat):
+        with QueryRecorder() as recorder:
+            start = time.perf_counter()
+            data = serializer_class(queryset_factory(), many=True, context={'request': request}).data
+            payload = JSONRenderer().render(data)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = recorder.count
+    return {
+        'rows': len(data),
+        'best_ms': round(min(timings), 2),
+        'queries': queries,
+        'payload_bytes': len(payload),
+        'bytes_per_row': round(len(payload) / len(data), 1) if data else 0,
+    }
+
+
+def run_serializer_benchmarks(repeat=3):
+    return {
+        name: measure_serializer(*variant, repeat=repeat)
+        for name, variant in event_serializer_variants().items()
+    }
+
+
+# -------------------------------
+# Fast JSON Benchmarks
+# -------------------------------
+
+def measure_fast_json(queryset, serializer_class, request, repeat=3):
+    """
+    Renders a whole queryset through the fast JSON path, `repeat` times.
+
+    Returns the same statistics as `measure_serializer`.
+    """
+    plan = get_plan(serializer_class)
+    timings, payload, queries = [], b'', 0
+    for _ in range(repeat):
+        with QueryRecorder() as recorder:
+            start = time.perf_counter()
+            rows = list(queryset.values(*plan_paths(plan)))
+            data = render_rows(plan, rows, request)
+            payload = encode(data)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = recorder.count
+    return {
+        'rows': len(data),
+        'best_ms': round(min(timings), 2),
+        'queries': queries,
+        'payload_bytes': len(payload),
+        'bytes_per_row': round(len(payload) / len(data), 1) if data else 0,
+    }
+
+
+def run_json_benchmarks(repeat=3):
+    """
+    Compares the serializer path with the fast JSON path on the whole event and
+    news tables. Both paths produce the same payload, so the sizes match.
+    """
+    request = _api_request()
+    events = geo.annotate_distance(
+        Event.objects.select_related('organizer').only('organizer', *EventListSerializer.model_fields())
+    )
+    news = News.objects.all()
+    return {
+        'events_serializer': measure_serializer(lambda: events.all(), EventListSerializer, request, repeat),
+        'events_fast_json': measure_fast_json(
+            geo.annotate_distance(Event.objects.all()), EventListSerializer, request, repeat,
+        ),
+        'news_serializer': measure_serializer(lambda: news.all(), NewsSerializer, request, repeat),
+        'news_fast_json': measure_fast_json(News.objects.all(), NewsSerializer, request, repeat),
+    }
+
+
+# -------------------------------
+# Concurrency Benchmarks (WSGI vs ASGI)
+# -------------------------------
+# The same requests are served the way gunicorn sync workers serve them (one
+# request at a time per worker) and through the ASGI handler with many
+# requests in flight, as uvicorn serves them. Both run in-process, so the
+# numbers compare the request models rather than the servers' HTTP parsing.
+
+# Smallest valid GIF, the uploaded "image"
+TINY_GIF = b'GIF87a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x08\x04\x00\x01\x04\x04\x00;'
+
+
+class LatencyStorage(FileSystemStorage):
+    """
+    File system storage that waits `latency` seconds per save, standing in for
+    the round trip to a remote storage such as Cloudinary.
+    """
+
+    def __init__(self, latency=0.2, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def _save(self, name, content):
+        time.sleep(self.latency)
+        return super()._save(name, content)
+
+
+def concurrency_targets():
+    """
+    Returns name -> callable(i) giving the (path, POST data) of the i-th request.
+
+    Joining needs concurrent writers, which the in-memory SQLite test database
+    does not support, so it is only measured on other databases.
+    """
+    targets = {
+        'upload': lambda i: (
+            reverse('events:upload_event_image'),
+            {'image': SimpleUploadedFile(f'bench{i}.gif', TINY_GIF, content_type='image/gif')},
+        ),
+    }
+    if not (connection.vendor == 'sqlite' and connection.is_in_memory_db()):
+        event_ids = list(Event.objects.values_list('pk', flat=True)[:100])
+        targets['join'] = lambda i: (
+            reverse('events:join_event' if i % 2 == 0 else 'events:leave_event', args=[event_ids[i // 2 % len(event_ids)]]),
+            {},
+        )
+    return targets
+
+
+def _summarize(latencies, elapsed, errors):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+def measure_wsgi(make_request, cookies, requests=200, workers=4):
+    """
+    Serves the requests with `workers` threads that each handle one request at
+    a time through the WSGI handler, like gunicorn's sync workers.
+    """
+    numbers = iter(range(requests))
+    lock = threading.Lock()
+    latencies, errors = [], [0]
+
+    def worker():
+        client = Client()
+        client.cookies = cookies
+        try:
+            while True:
+                with lock:
+                    i = next(numbers, None)
+                if i is None:
+                    return
+                path, data = make_request(i)
+                start = time.perf_counter()
+                response = client.post(path, data)
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += response.status_code >= 500
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def measure_asgi(make_request, cookies, requests=200, concurrency=64):
+    """
+    Serves the requests through the ASGI handler with up to `concurrency`
+    requests in flight on one event loop.
+    """
+    latencies, errors = [], [0]
+
+    async def one(client, semaphore, i):
+        # Like ASGIHandler, give every request its own thread for sync code
+        async with semaphore, ThreadSensitiveContext():
+            path, data = make_request(i)
+            start = time.perf_counter()
+            response = await client.post(path, data)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors[0] += response.status_code >= 500
+
+    async def run():
+        client = AsyncClient()
+        client.cookies = cookies
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(one(client, semaphore, i) for i in range(requests)))
+
+    # A fresh thread runs the event loop with a clean context, as a server
+    # process would, unaffected by async_to_sync() state of the caller
+    failures = []
+
+    def serve():
+        try:
+            asyncio.run(run())
+        except Exception as e:
+            failures.append(e)
+
+    loop_thread = threading.Thread(target=serve)
+    started = time.perf_counter()
+    loop_thread.start()
+    loop_thread.join()
+    if failures:
+        raise failures[0]
+    return _summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def run_concurrency_benchmarks(username, requests=200, workers=4, concurrency=64, upload_latency=0.2):
+    """
+    Compares the throughput of the async JSON endpoints served the WSGI way
+    (sync workers) and the ASGI way.
+
+    Args:
+        username: Seeded user the requests are made as.
+        requests: Requests per target and server model.
+        workers: Sync workers of the WSGI run (gunicorn `--workers`).
+        concurrency: Requests in flight in the ASGI run.
+        upload_latency: Seconds every upload spends in the storage backend.
+    """
+    client = Client()
+    client.login(username=username, password=BENCH_PASSWORD)
+    storages = {
+        **settings.STORAGES,
+        'default': {
+            'BACKEND': 'bike_connect.apps.core.bench.LatencyStorage',
+            'OPTIONS': {'latency': upload_latency, 'location': tempfile.mkdtemp(prefix='bench-uploads-')},
+        },
+    }
+    results = {}
+    with override_settings(STORAGES=storages):
+        for name, make_request in concurrency_targets().items():
+            results[f'{name}_wsgi'] = measure_wsgi(make_request, client.cookies, requests, workers)
+            results[f'{name}_asgi'] = measure_asgi(make_request, client.cookies, requests, concurrency)
+    shutil.rmtree(storages['default']['OPTIONS']['location'], ignore_errors=True)
+    return results
+
+
+# -------------------------------
+# Media URL Benchmarks
+# -------------------------------
+# A listing page of image cards is rendered with the URL memo cleared before
+# every render (every URL is built by the storage, as before memoizing) and
+# with a warm memo.
+
+# The image markup of an event/news/post card
+CARD_TEMPLATE = (
+    "{% load images %}{% for image in images %}"
+    "{% picture image 'card' alt='Ride' class='card-img-top' %}{% endfor %}"
+)
+
+
+class CountingStorage(FileSystemStorage):
+    """
+    File system storage counting its url() calls, each taking `latency`
+    seconds, standing in for a storage that builds URLs remotely.
+    """
+
+    def __init__(self, latency=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.url_calls = 0
+
+    def url(self, name):
+        self.url_calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return super().url(name)
+
+
+def measure_card_page(render, storage, repeat=20, cold=False):
+    """
+    Renders a card page `repeat` times; returns the timings and the storage
+    url() calls per page.
+    """
+    timings, calls = [], []
+    for _ in range(repeat):
+        if cold:
+            images.clear_url_cache()
+        before = storage.url_calls
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+        calls.append(storage.url_calls - before)
+    return {
+        'best_ms': round(min(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'storage_calls_per_page': statistics.mean(calls),
+    }
+
+
+def run_media_benchmarks(cards=100, repeat=20, url_latency=0.0):
+    """
+    Compares rendering a page of `cards` processed images with and without
+    memoized URLs.
+
+    Args:
+        cards: Image cards on the page.
+        repeat: Renders per variant.
+        url_latency: Seconds every storage url() call takes.
+    """
+    location = tempfile.mkdtemp(prefix='bench-media-')
+    storage = CountingStorage(latency=url_latency, location=location, base_url='/media/')
+    output = BytesIO()
+    Image.new('RGB', (64, 48), 'teal').save(output, 'JPEG')
+    files = []
+    try:
+        for i in range(cards):
+            name = storage.save(f'events/card{i}.jpg', ContentFile(output.getvalue()))
+            images.process_image(storage, name)
+            files.append(SimpleNamespace(storage=storage, name=name))
+        template, context = Template(CARD_TEMPLATE), Context({'images': files})
+        render = lambda: template.render(context)
+
+        results = {'cards_cold': measure_card_page(render, storage, repeat, cold=True)}
+        render()  # Warm up the memo
+        results['cards_warm'] = measure_card_page(render, storage, repeat)
+    finally:
+        for file in files:
+            # Drops the manifests recorded in the database too
+            images.delete_image(file)
+        images.clear_url_cache()
+        shutil.rmtree(location, ignore_errors=True)
+    for row in results.values():
+        row['cards'] = cards
+    return results
+
+
+# -------------------------------
+# Baselines
+# -------------------------------
+
+def save_baseline(path, results, meta=None):
+    with open(path, 'w') as f:
+        json.dump({'meta': meta or {}, 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, metric='p95_ms', threshold=20.0):
+    """
+    Compares results with a baseline.
+
+    Returns:
+        list: (name, baseline value, current value, change in %, regressed) tuples
+        for every target present in both.
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name][metric], current[metric]
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append((name, before, after, round(change, 1), change > threshold))
+    return rows
@@ -0,0 +1,249 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.fields.files import FieldFile
+from django.utils.connection import ConnectionProxy
+
+from .replicas import reading_from_primary
+
+# Fragments, row lists and the model versions they depend on live in their
+# own named cache, so they can be sized and flushed apart from the rest
+cache = ConnectionProxy(caches, 'fragments')
+
+# Seconds a process holds the recompute lock of a cache entry at most
+LOCK_TIMEOUT = 10
+
+# Seconds between two looks at the cache while another process recomputes
+WAIT_INTERVAL = 0.05
+
+
+# -------------------------------
+# Model Versions
+# -------------------------------
+# Every cache key embeds the current version of the models its value was
+# built from. Saving or deleting any row bumps the version (see
+# `core.signals`), so stale entries are never read again and simply expire.
+
+def _version_key(model):
+    return f'model-version:{model._meta.label_lower}'
+
+
+def model_versions(*models):
+    """
+    Returns the current versions of the given models, in order.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with a timestamp rather than 1, so that a version evicted
+            # from the cache never comes back with a value used before.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidates every cache entry built from the given model.
+    """
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def versioned_key(prefix, name, models=(), vary=()):
+    """
+    Builds a cache key from a name, the versions of its models and extra values.
+    """
+    parts = [str(part) for part in (*model_versions(*models), *vary)]
+    digest = hashlib.md5(':'.join(parts).encode()).hexdigest()
+    return f'{prefix}:{name}:{digest}'
+
+
+# -------------------------------
+# Hit / Miss Counters
+# -------------------------------
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+OUTCOMES = ('hits', 'misses', 'stale')
+
+
+def _count(name, outcome):
+    with _stats_lock:
+        _stats[(name, outcome)] += 1
+
+
+def cache_stats():
+    """
+    Returns the hit, miss and stale counters of this process, per entry name.
+
+    Example:
+        {'landing:news': {'hits': 42, 'misses': 3, 'stale': 0}}
+    """
+    with _stats_lock:
+        snapshot = dict(_stats)
+    stats = {}
+    for (name, outcome), value in snapshot.items():
+        stats.setdefault(name, dict.fromkeys(OUTCOMES, 0))[outcome] = value
+    return stats
+
+
+def reset_cache_stats():
+    """
+    Clears the hit, miss and stale counters.
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+# -------------------------------
+# Read-through Cache
+# -------------------------------
+
+def _wait_for(key):
+    """
+    Polls the cache while another process recomputes the entry.
+    """
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def read_through(key, name, fetch, timeout, empty_timeout=None):
+    """
+    Returns the value stored under `key`, computing it with `fetch` on a miss.
+
+    Values are wrapped in an envelope holding their freshness deadline, so
+    empty results are cached too (for `empty_timeout` seconds) and an expired
+    entry can still be served while a single process recomputes it. On a cold
+    miss, concurrent callers wait for the process holding the lock instead of
+    all querying the database at once.
+
+    Args:
+        key: Cache key of the entry.
+        name: Name used for the hit / miss counters.
+        fetch: Callable computing the value; it must return plain, picklable data.
+        timeout: Seconds the value stays fresh.
+        empty_timeout: Seconds an empty value stays fresh, defaults to `timeout`.
+    """
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        if entry['fresh_until'] > time.time():
+            _count(name, 'hits')
+            return entry['value']
+        # Expired: one process refreshes it, the others keep serving it
+        if not cache.add(lock_key, True, LOCK_TIMEOUT):
+            _count(name, 'stale')
+            return entry['value']
+    elif not cache.add(lock_key, True, LOCK_TIMEOUT):
+        entry = _wait_for(key)
+        if entry is not None:
+            _count(name, 'hits')
+            return entry['value']
+        # The other process died or is too slow; compute without the lock
+        lock_key = None
+
+    _count(name, 'misses')
+    try:
+        # Shared entries are computed on the primary: built from a lagging
+        # replica, they would hide a change from everyone until the next one
+        with reading_from_primary():
+            value = fetch()
+        fresh_for = timeout if value or empty_timeout is None else empty_timeout
+        # Keep the entry around for another `fresh_for` seconds so that it
+        # can be served stale while it is being refreshed
+        cache.set(key, {'value': value, 'fresh_until': time.time() + fresh_for}, fresh_for * 2)
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+    return value
+
+
+# -------------------------------
+# Cached Row Lists
+# -------------------------------
+
+class CachedRow(dict):
+    """
+    A serialized row read from the cache.
+
+    Templates read the fields with the usual `row.field` syntax; `pk` mirrors
+    `id` so that rows can stand in for model instances (e.g. in the
+    participation index).
+    """
+
+    @property
+    def pk(self):
+        return self['id']
+
+
+def cached_list(name, fetch, models=(), vary=(), timeout=None, empty_timeout=None):
+    """
+    Returns a list of serialized rows from the cache, fetching it on a miss.
+
+    Args:
+        name: List name, used for the cache key and the counters.
+        fetch: Callable returning the rows as dicts with an `id` key.
+        models: Models the list depends on; saving any of them invalidates it.
+        vary: Extra values the list depends on (e.g. filters and cursor).
+        timeout: Seconds the list stays fresh, defaults to `LIST_CACHE_TIMEOUT`.
+        empty_timeout: Seconds an empty list stays fresh, defaults to `LIST_CACHE_EMPTY_TIMEOUT`.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'LIST_CACHE_TIMEOUT', 300)
+    if empty_timeout is None:
+        empty_timeout = getattr(settings, 'LIST_CACHE_EMPTY_TIMEOUT', 30)
+    key = versioned_key('list', name, models, vary)
+    rows = read_through(key, name, lambda: [dict(row) for row in fetch()], timeout, empty_timeout)
+    return [CachedRow(row) for row in rows]
+
+
+class CachedListMixin:
+    """
+    Mixin for keyset-paginated ListViews that serves each page from `cached_list`.
+
+    The rows of a page are serialized once by `serialize_row` and cached until
+    one of `list_cache_models` changes. The cache key varies on the query string,
+    so every combination of filters, search terms and cursor is cached apart.
+    Must be placed before `KeysetPaginationMixin`.
+    """
+    list_cache_models = None  # Defaults to the view's model
+
+    def serialize_row(self, obj):
+        """
+        Returns the fields of one object needed to render the list.
+
+        Defaults to the concrete fields loaded on the object, i.e. those the
+        queryset's `only()` names (all of them without it), with files stored
+        by name. Overridden for computed values; must include `id` and the
+        fields of `keyset_ordering`.
+        """
+        deferred = obj.get_deferred_fields()
+        row = {'id': obj.pk}
+        for field in obj._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            value = field.value_from_object(obj)
+            row[field.attname] = value.name if isinstance(value, FieldFile) else value
+        return row
+
+    def cache_page_rows(self, fetch):
+        models = self.list_cache_models or (self.model,)
+        name = f'{self.model._meta.label_lower}:{self.__class__.__name__}'
+        vary = [self.get_paginate_by(None), *sorted(self.request.GET.lists())]
+        return cached_list(
+            name, lambda: [self.serialize_row(obj) for obj in fetch()], models=models, vary=vary,
+        )
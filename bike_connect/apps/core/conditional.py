@@ -0,0 +1,176 @@
+import calendar
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+# Methods a conditional request can be answered with 304 Not Modified for
+CONDITIONAL_METHODS = ('GET', 'HEAD')
+
+
+# -------------------------------
+# Validators
+# -------------------------------
+
+def make_etag(*parts):
+    """
+    Returns a quoted strong ETag hashing the given parts.
+    """
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+def collection_validators(queryset, last_modified_field='updated_at', **aggregates):
+    """
+    Computes the validators of a collection with one aggregate query.
+
+    Objects are never loaded: the result holds the newest modification
+    timestamp and the row count (which catches deletions), plus any extra
+    aggregates, e.g. `views=Sum('views')`.
+
+    Returns:
+        dict: {'last_modified': datetime or None, 'count': int, **aggregates}
+    """
+    if queryset.query.is_sliced:
+        # e.g. the N nearest events: aggregate over exactly those rows
+        queryset = queryset.model._base_manager.filter(pk__in=queryset.values('pk'))
+    return queryset.order_by().aggregate(
+        last_modified=Max(last_modified_field), count=Count('pk'), **aggregates,
+    )
+
+
+def object_validators(queryset, last_modified_field='updated_at', **annotations):
+    """
+    Computes the validators of the single object matched by the queryset.
+
+    Only the modification timestamp and the given annotations (e.g. the number
+    of comments) are selected.
+
+    Returns:
+        dict or None: {'last_modified': datetime, **annotations}, or None when
+        no object matches, so that the view renders its usual 404.
+    """
+    row = queryset.order_by().annotate(**annotations).values(last_modified_field, *annotations).first()
+    if row is not None:
+        row['last_modified'] = row.pop(last_modified_field)
+    return row
+
+
+# -------------------------------
+# Conditional Responses
+# -------------------------------
+class ConditionalGetMixin:
+    """
+    Answers conditional GET/HEAD requests with 304 Not Modified.
+
+    Views pass `conditional_response()` a callable returning a dict of cheap
+    values that change whenever the response would (see `collection_validators`
+    and `object_validators`), or None to skip conditional processing. The ETag
+    hashes these values together with the full path, the user and the response
+    format; `last_modified` also becomes the Last-Modified header.
+
+    Requests carrying pending flash messages are always rendered, so that a
+    message is never swallowed by a 304.
+    """
+
+    def get_etag_parts(self, validators):
+        request = self.request
+        renderer = getattr(request, 'accepted_renderer', None)
+        return (
+            request.get_full_path(),
+            getattr(request.user, 'pk', None),
+            getattr(renderer, 'format', None),
+            sorted(validators.items()),
+        )
+
+    def conditional_response(self, request, get_validators, render):
+        """
+        Returns a 304 when the client's copy is current, else `render()` with
+        ETag and Last-Modified headers.
+
+        Args:
+            request: The current request.
+            get_validators: Callable returning the validators dict or None.
+            render: Callable rendering the full response.
+        """
+        if request.method not in CONDITIONAL_METHODS or len(get_messages(request)):
+            return render()
+        validators = get_validators()
+        if validators is None:
+            return render()
+
+        etag = make_etag(*self.get_etag_parts(validators))
+        last_modified = validators.get('last_modified')
+        timestamp = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code == 200:
+            response.headers.setdefault('ETag', etag)
+            if timestamp is not None:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+        return response
+
+
+class ConditionalDetailMixin(ConditionalGetMixin):
+    """
+    ConditionalGetMixin for Django DetailViews.
+
+    The object is looked up like `get_object()` does, but only its validators
+    are selected. Extra per-object values (comment counts...) are declared by
+    overriding `get_validator_annotations()`.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_validator_annotations(self):
+        return {}
+
+    def get_validators(self):
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        return object_validators(queryset, self.last_modified_field, **self.get_validator_annotations())
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, self.get_validators, lambda: super(ConditionalDetailMixin, self).get(request, *args, **kwargs),
+        )
+
+
+class ConditionalAPIMixin(ConditionalGetMixin):
+    """
+    ConditionalGetMixin for DRF list and retrieve actions.
+
+    Lists are validated with one aggregate over the filtered queryset (not the
+    current page only, so the query does not depend on the cursor), detail
+    responses with the object's own timestamp. Views add values with
+    `get_list_validators()` / `get_object_validators()` overrides.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_list_validators(self):
+        return collection_validators(self.filter_queryset(self.get_queryset()), self.last_modified_field)
+
+    def get_object_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return object_validators(queryset, self.last_modified_field)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, self.get_list_validators, lambda: super(ConditionalAPIMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, self.get_object_validators,
+            lambda: super(ConditionalAPIMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,136 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+
+from bike_connect.apps.events.feeds import feed_queryset
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.events.views import EventListView
+from bike_connect.apps.posts.models import BikePost, Comment
+from bike_connect.apps.posts.views import BikePostListView, BuySellView
+from .models import News
+from .pagination import KeysetPaginator
+from .views import NewsListView
+
+User = get_user_model()
+
+# Plan lines that read a whole table, per database vendor
+SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)(?! USING (?:COVERING )?INDEX)(?:\s|$)', re.MULTILINE),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+
+# Plan lines that sort the rows instead of reading them in index order
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY'),
+    'postgresql': re.compile(r'^\s*(?:->\s*)?(?:Incremental )?Sort\b', re.MULTILINE),
+}
+
+
+# -------------------------------
+# Hot Queries
+# -------------------------------
+
+def _list_view_queryset(view_class, **params):
+    """
+    Returns the queryset a list view builds for a request with the given GET parameters.
+    """
+    request = RequestFactory().get('/', params)
+    request.user = User.objects.order_by('pk').first()
+    view = view_class()
+    view.setup(request)
+    return view.get_queryset()
+
+
+def _keyset_pages(queryset, per_page, ordering):
+    """
+    Returns the first page query of a keyset-paginated list and the one of the
+    page after it, which adds the seek condition.
+    """
+    paginator = KeysetPaginator(queryset, per_page, ordering)
+    first = queryset.order_by(*ordering)[:per_page + 1]
+    rows = list(first)
+    if len(rows) <= per_page:
+        return first, None
+    position = [getattr(rows[per_page - 1], field) for field in paginator.fields]
+    return first, queryset.order_by(*ordering).filter(paginator._seek_filter(position, ordering))[:per_page + 1]
+
+
+def _list_view_pages(view_class, **params):
+    return _keyset_pages(_list_view_queryset(view_class, **params), view_class.paginate_by, view_class.keyset_ordering)
+
+
+def hot_queries():
+    """
+    Yields (name, queryset) for the queries behind the busiest pages and APIs,
+    built the way the views build them.
+    """
+    user = User.objects.order_by('pk').first()
+    event = Event.objects.order_by('pk').first()
+    post = BikePost.objects.order_by('pk').first()
+
+    pages = {
+        'event_list': _list_view_pages(EventListView),
+        'event_api': _keyset_pages(Event.objects.all(), 10, ('-date', '-id')),
+        'landing_events': _keyset_pages(Event.objects.all(), 9, ('date', 'id')),
+        'news_list': _list_view_pages(NewsListView),
+        'news_api': _keyset_pages(News.objects.filter(is_published=True), 10, ('-created_at', '-id')),
+        'bikepost_list': _list_view_pages(BikePostListView),
+        'bikepost_list_category': _list_view_pages(BikePostListView, category='sell'),
+    }
+    for name, (first, following) in pages.items():
+        yield name, first
+        if following is not None:
+            yield f'{name}_next', following
+
+    yield 'landing_news', News.objects.filter(is_published=True).order_by('-created_at')[:3]
+    yield 'buy_sell', _list_view_queryset(BuySellView)
+    if user is not None:
+        yield 'feed_joined', feed_queryset(user.pk, 'joined')
+        yield 'feed_organized', feed_queryset(user.pk, 'organized')
+        event_ids = list(Event.objects.order_by('-date').values_list('pk', flat=True)[:10])
+        yield 'participation_index', Participation.objects.filter(user=user, event_id__in=event_ids)
+    if event is not None:
+        yield 'event_participants', event.participants.filter(status='joined').select_related('user')
+    if post is not None:
+        yield 'bikepost_comments', Comment.objects.filter(bike_post=post)
+
+
+# -------------------------------
+# Plans
+# -------------------------------
+
+def plan_problems(plan, vendor=None):
+    """
+    Returns the problems found in a query plan.
+
+    Returns:
+        list: ('seq scan', table) for every table read in full and ('sort', '')
+        for every sort the database cannot avoid.
+    """
+    vendor = vendor or connection.vendor
+    problems = []
+    if vendor in SCAN_PATTERNS:
+        problems += [('seq scan', table) for table in SCAN_PATTERNS[vendor].findall(plan)]
+    if vendor in SORT_PATTERNS:
+        problems += [('sort', '')] * len(SORT_PATTERNS[vendor].findall(plan))
+    return problems
+
+
+def explain_hot_queries():
+    """
+    Runs EXPLAIN on every hot query.
+
+    Returns:
+        list: (name, plan, problems) tuples.
+    """
+    if connection.vendor in ('sqlite', 'postgresql'):
+        # Give the planner row counts, as a production database has
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    results = []
+    for name, queryset in hot_queries():
+        plan = queryset.explain()
+        results.append((name, plan, plan_problems(plan)))
+    return results
@@ -0,0 +1,294 @@
+import json
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+from django.http import HttpResponse, Http404
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .fieldsets import requested_fields
+from .images import storage_url
+
+try:
+    import orjson  # Optional, several times faster than the json module
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# -------------------------------
+# Encoding
+# -------------------------------
+
+def encode(data):
+    """
+    Encodes data to JSON bytes exactly like DRF's JSONRenderer does with the
+    default settings: compact separators, UTF-8 and escaped U+2028 / U+2029.
+
+    Values must already be JSON primitives (the converters below take care of
+    dates, decimals and files), so orjson and json produce the same bytes.
+    """
+    if orjson is not None and getattr(settings, 'FAST_JSON_USE_ORJSON', True):
+        body = orjson.dumps(data)
+        if b'\xe2\x80\xa8' in body or b'\xe2\x80\xa9' in body:
+            body = body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return body
+    text = json.dumps(
+        data, ensure_ascii=not api_settings.UNICODE_JSON, allow_nan=not api_settings.STRICT_JSON,
+        separators=(',', ':') if api_settings.COMPACT_JSON else (', ', ': '),
+    )
+    return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+# -------------------------------
+# Compiled Serializer Plans
+# -------------------------------
+
+# Field types whose representation of a non-null value is the value itself
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+
+class RenderContext:
+    """
+    Per-render state shared by the converters: the request (for absolute file
+    URLs) and the current timezone, looked up once instead of once per value.
+    """
+
+    def __init__(self, request=None):
+        self.request = request
+        self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+class FieldPlan:
+    """
+    How one serializer field is produced from a `.values()` row.
+
+    Args:
+        name: Output key.
+        paths: `.values()` paths the field reads.
+        convert: Callable (row, context) -> representation, or None when the
+            field is filled for the whole page at once by `batch`.
+        batch: Optional callable (rows) -> list of representations.
+    """
+
+    def __init__(self, name, paths, convert=None, batch=None):
+        self.name = name
+        self.paths = paths
+        self.convert = convert
+        self.batch = batch
+
+
+def _value_converter(field, path, model_field):
+    """
+    Returns a (row, context) -> representation callable for a plain model field.
+    """
+    if isinstance(field, serializers.FileField):
+        storage = model_field.storage
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+        def convert_file(row, context):
+            name = row[path]
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage_url(storage, name)
+            return context.request.build_absolute_uri(url) if context.request is not None else url
+        return convert_file
+
+    if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.DecimalField):
+        return lambda row, context: row[path]
+
+    to_representation = field.to_representation
+
+    if (isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone')
+            and (getattr(field, 'format', api_settings.DATETIME_FORMAT) or '').lower() == ISO_8601):
+        # Inlined DateTimeField.to_representation for aware ISO 8601 values
+        def convert_datetime(row, context):
+            value = row[path]
+            if not value:
+                return None
+            if context.timezone is None or timezone.is_naive(value):
+                return to_representation(value)
+            value = value.astimezone(context.timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return convert_datetime
+
+    # Dates, decimals...: reuse the field's own representation
+    def convert(row, context):
+        value = row[path]
+        return None if value is None else to_representation(value)
+    return convert
+
+
+def compile_plan(serializer_class, prefix=''):
+    """
+    Compiles a serializer class into a list of FieldPlans.
+
+    Supports plain model fields, files, nested model serializers, method fields
+    declared in `field_sources`, and fields declared in the serializer's
+    `fast_batch_fields` ({name: (paths, batch callable)}).
+
+    Raises:
+        ValueError: If a field cannot be produced from `.values()`.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    field_sources = getattr(serializer_class, 'field_sources', {})
+    batch_fields = getattr(serializer_class, 'fast_batch_fields', {})
+    plans = []
+
+    for name, field in serializer.fields.items():
+        if name in batch_fields:
+            paths, batch = batch_fields[name]
+            plans.append(FieldPlan(name, [prefix + path for path in paths], batch=batch))
+
+        elif isinstance(field, serializers.SerializerMethodField):
+            paths = list(field_sources.get(name, ()))
+            if not paths:
+                raise ValueError(f"{serializer_class.__name__}.{name} needs an entry in field_sources")
+            method = getattr(serializer, field.method_name)
+            keys = [prefix + path for path in paths]
+
+            def convert_method(row, context, method=method, paths=paths, keys=keys):
+                return method(SimpleNamespace(**{path: row[key] for path, key in zip(paths, keys)}))
+            plans.append(FieldPlan(name, keys, convert_method))
+
+        elif isinstance(field, serializers.ModelSerializer):
+            relation = prefix + field.source
+            nested = compile_plan(type(field), prefix=f'{relation}__')
+            fk_key = relation
+
+            def convert_nested(row, context, nested=nested, fk_key=fk_key):
+                if row[fk_key] is None:
+                    return None
+                return {plan.name: plan.convert(row, context) for plan in nested}
+            plans.append(FieldPlan(name, [fk_key, *[p for plan in nested for p in plan.paths]], convert_nested))
+
+        else:
+            try:
+                model_field = model._meta.get_field(field.source)
+            except Exception:
+                raise ValueError(f"{serializer_class.__name__}.{name} is not a model field")
+            key = prefix + model_field.name
+            plans.append(FieldPlan(name, [key], _value_converter(field, key, model_field)))
+    return plans
+
+
+_plans = {}
+
+
+def get_plan(serializer_class):
+    """
+    Returns the compiled plan of a serializer class, compiling it once per process.
+    """
+    plan = _plans.get(serializer_class)
+    if plan is None:
+        plan = _plans[serializer_class] = compile_plan(serializer_class)
+    return plan
+
+
+def render_rows(plan, rows, request=None, fields=None):
+    """
+    Converts `.values()` rows into the same dicts the serializer would produce.
+
+    Args:
+        plan: Compiled plan of the serializer.
+        rows: List of `.values()` dicts.
+        request: Request used for absolute file URLs.
+        fields: Optional set of field names to keep (sparse fieldsets).
+    """
+    plan = [field for field in plan if not fields or field.name in fields]
+    context = RenderContext(request)
+    output = [{} for _ in rows]
+    for field in plan:
+        if field.batch is not None:
+            values = field.batch(rows)
+        else:
+            convert = field.convert
+            values = [convert(row, context) for row in rows]
+        name = field.name
+        for item, value in zip(output, values):
+            item[name] = value
+    return output
+
+
+def plan_paths(plan, fields=None):
+    """
+    Returns the `.values()` paths needed to render the (requested) fields of a plan.
+    """
+    paths = []
+    for field in plan:
+        if not fields or field.name in fields:
+            paths.extend(path for path in field.paths if path not in paths)
+    return paths
+
+
+# -------------------------------
+# View Integration
+# -------------------------------
+
+class FastJSONResponse(HttpResponse):
+    """
+    Already-encoded JSON response. Keeps the rendered `data` around like DRF's
+    Response does, for middleware and tests.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(encode(data), **kwargs)
+        self.data = data
+
+
+class FastJSONMixin:
+    """
+    Read-only fast path for DRF list and retrieve endpoints.
+
+    When the response is negotiated as JSON, rows are fetched with `.values()`,
+    converted by the compiled plan of the view's serializer and encoded in one
+    pass, bypassing field-by-field serializer instances. The output is byte for
+    byte what the serializer and JSONRenderer would produce. Other renderers
+    (e.g. the browsable API) and views with `FAST_JSON_API = False` use the
+    regular path.
+    """
+
+    def use_fast_json(self, request):
+        return (
+            getattr(settings, 'FAST_JSON_API', True)
+            and getattr(request, 'accepted_renderer', None) is not None
+            and request.accepted_renderer.format == 'json'
+        )
+
+    def _fast_queryset(self, plan, fields):
+        # get_queryset() still validates `?fields=`; values() supersedes its only()
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = [field.lstrip('-') for field in getattr(self, 'keyset_ordering', ())]
+        paths = plan_paths(plan, fields)
+        return queryset.values(*paths, *[field for field in ordering if field not in paths])
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_json(request):
+            return super().list(request, *args, **kwargs)
+        plan = get_plan(self.get_serializer_class())
+        fields = requested_fields(request)
+        queryset = self._fast_queryset(plan, fields)
+
+        page = self.paginate_queryset(queryset)
+        rows = list(page) if page is not None else list(queryset)
+        data = render_rows(plan, rows, request, fields)
+        if page is not None:
+            data = self.get_paginated_response(data).data
+        return FastJSONResponse(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_fast_json(request):
+            return super().retrieve(request, *args, **kwargs)
+        plan = get_plan(self.get_serializer_class())
+        fields = requested_fields(request)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self._fast_queryset(plan, fields).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        rows = list(queryset[:1])
+        if not rows:
+            # Same message as get_object_or_404() in the regular path
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        return FastJSONResponse(render_rows(plan, rows, request, fields)[0])
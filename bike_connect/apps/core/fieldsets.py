@@ -0,0 +1,85 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+# Query parameter selecting the fields of a response, e.g. ?fields=id,title
+FIELDS_PARAM = 'fields'
+
+
+def requested_fields(request):
+    """
+    Returns the set of field names passed in `?fields=`, or None if absent.
+    """
+    if request is None:
+        return None
+    value = request.query_params.get(FIELDS_PARAM, '')
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    return names or None
+
+
+# -------------------------------
+# Serializer Side
+# -------------------------------
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin that drops every field not listed in the request's `?fields=`
+    and knows which model fields each serializer field reads.
+
+    `field_sources` maps serializer fields to the model fields (or related paths)
+    they read when that differs from their `source`, e.g. a nested organizer
+    reading `organizer__username`. Views use `model_fields()` to build `.only()`.
+    """
+    field_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get('request'))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def model_fields(cls, requested=None):
+        """
+        Returns the model field paths needed to render the requested fields.
+        """
+        paths = []
+        for name, field in cls().fields.items():
+            if requested and name not in requested:
+                continue
+            for path in cls.field_sources.get(name, (field.source,)):
+                if path != '*' and path not in paths:
+                    paths.append(path)
+        return paths
+
+
+# -------------------------------
+# View Side
+# -------------------------------
+class SparseFieldsetViewMixin:
+    """
+    GenericAPIView mixin restricting the queryset to the fields being rendered.
+
+    On reads, the queryset gets `.only()` with exactly the model fields the
+    serializer needs (plus the keyset ordering fields), and `select_related()`
+    for every relation a nested field reads, so no deferred field is ever
+    fetched row by row. Unknown names in `?fields=` are rejected with a 400.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in SAFE_METHODS:
+            return queryset  # Writes need the complete instance
+
+        serializer_class = self.get_serializer_class()
+        requested = requested_fields(self.request)
+        if requested:
+            unknown = requested - set(serializer_class().fields)
+            if unknown:
+                raise ValidationError({FIELDS_PARAM: f"Unknown fields: {', '.join(sorted(unknown))}"})
+
+        paths = serializer_class.model_fields(requested)
+        ordering = [field.lstrip('-') for field in getattr(self, 'keyset_ordering', ())]
+        relations = sorted({path.split('__')[0] for path in paths if '__' in path})
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(queryset.model._meta.pk.name, *relations, *paths, *ordering)
@@ -0,0 +1,23 @@
+from django.conf import settings
+
+from .caching import read_through, versioned_key
+
+
+# -------------------------------
+# Fragment Cache
+# -------------------------------
+
+def cached_fragment(name, render, models=(), vary=(), timeout=None):
+    """
+    Returns a rendered fragment from the cache, rendering and storing it on a miss.
+
+    Args:
+        name: Fragment name, used for the cache key and the counters.
+        render: Callable producing the fragment (a string or plain, picklable data).
+        models: Models the fragment depends on; saving any of them invalidates it.
+        vary: Extra values the fragment depends on (e.g. the page cursor).
+        timeout: Cache timeout in seconds, defaults to `FRAGMENT_CACHE_TIMEOUT`.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 300)
+    return read_through(versioned_key('fragment', name, models, vary), name, render, timeout)
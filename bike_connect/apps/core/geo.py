@@ -0,0 +1,383 @@
+import csv
+import functools
+import math
+import re
+import unicodedata
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+# Places the geocoder knows, with their alternative spellings
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Characters of a geohash, in order
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Stored geohash length; 9 characters locate a point within about 5 m
+GEOHASH_PRECISION = 9
+
+# Most geohash cells a radius query prefilters on
+MAX_CELLS = 16
+
+# Radii tried in turn when looking for the N nearest rows (km); the last one
+# covers the whole globe
+NEAREST_RADII = (10, 50, 200, 1000, 20038)
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 1000
+MAX_NEAREST = 50
+
+
+# -------------------------------
+# Geohash
+# -------------------------------
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Returns the geohash of a point.
+
+    Points that are close usually share a long prefix, and all points within a
+    cell share its geohash as prefix, so a range of an ordinary index on the
+    geohash column reads one cell.
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """
+    Returns the (height, width) of a geohash cell in degrees.
+    """
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def covering_cells(south, west, north, east, max_cells=MAX_CELLS):
+    """
+    Returns the geohashes of the smallest cells covering a bounding box, or
+    None if it takes more than `max_cells` cells even at the coarsest precision.
+
+    `west` may be below -180 and `east` above 180 for boxes crossing the
+    antimeridian.
+    """
+    south, north = max(south, -90.0), min(north, 90.0)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        last_row = min(math.floor((north + 90) / height), round(180 / height) - 1)
+        rows = range(math.floor((south + 90) / height), last_row + 1)
+        columns = range(math.floor((west + 180) / width), math.floor((east + 180) / width) + 1)
+        if len(rows) * len(columns) <= max_cells:
+            break
+    else:
+        return None
+
+    column_count = round(360 / width)
+    if len(columns) >= column_count:
+        columns = range(column_count)
+    cells = {
+        encode(-90 + (row + 0.5) * height, -180 + (column % column_count + 0.5) * width, precision)
+        for row in rows for column in columns
+    }
+    return sorted(cells)
+
+
+def _prefix_end(prefix):
+    """
+    Returns the smallest geohash greater than every geohash starting with
+    `prefix`, or None if there is none.
+    """
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+
+# -------------------------------
+# Distances
+# -------------------------------
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance between two points in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Returns the (south, west, north, east) box around the circle of
+    `radius_km` around a point; west / east leave [-180, 180] when the box
+    crosses the antimeridian.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    south, north = latitude - math.degrees(angle), latitude + math.degrees(angle)
+    if south <= -90 or north >= 90 or math.sin(angle) >= math.cos(math.radians(latitude)):
+        # The circle contains a pole: every longitude is in reach
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    delta = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(latitude))))
+    return south, longitude - delta, north, longitude + delta
+
+
+def distance_expression(latitude, longitude):
+    """
+    Returns the haversine distance (km) from a point to the row's coordinates
+    as a database expression. The trigonometric functions are native on
+    PostgreSQL and registered by Django on SQLite.
+    """
+    phi = math.radians(latitude)
+    row_phi = Radians(F('latitude'))
+    a = (
+        Power(Sin((row_phi - Value(phi)) / Value(2.0)), 2)
+        + Value(math.cos(phi)) * Cos(row_phi)
+        * Power(Sin((Radians(F('longitude')) - Value(math.radians(longitude))) / Value(2.0)), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, Value(1.0))), output_field=FloatField())
+
+
+# -------------------------------
+# Queries
+# -------------------------------
+
+def annotate_distance(queryset, latitude=None, longitude=None):
+    """
+    Annotates a queryset with the `distance` (km) of its rows from a point,
+    or with a null distance without a point, for serializers that render it.
+    """
+    if latitude is None or longitude is None:
+        return queryset.annotate(distance=Value(None, output_field=FloatField()))
+    return queryset.annotate(distance=distance_expression(latitude, longitude))
+
+
+def within(queryset, latitude, longitude, radius_km):
+    """
+    Filters a queryset to the rows within `radius_km` of a point and
+    annotates them with their `distance` in kilometres.
+
+    The geohash cells covering the bounding box select candidate rows
+    through the geohash index; the box and the exact distance trim them.
+    """
+    south, west, north, east = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(latitude__range=(south, north))
+    if east - west < 360:
+        if west < -180:
+            queryset = queryset.filter(Q(longitude__gte=west + 360) | Q(longitude__lte=east))
+        elif east > 180:
+            queryset = queryset.filter(Q(longitude__gte=west) | Q(longitude__lte=east - 360))
+        else:
+            queryset = queryset.filter(longitude__range=(west, east))
+
+    cells = covering_cells(south, west, north, east)
+    if cells is not None:
+        prefilter = Q()
+        for cell in cells:
+            end = _prefix_end(cell)
+            prefilter |= Q(geohash__gte=cell, geohash__lt=end) if end else Q(geohash__gte=cell)
+        queryset = queryset.filter(prefilter)
+
+    return annotate_distance(queryset, latitude, longitude).filter(distance__lte=radius_km)
+
+
+def nearest_radius(queryset, latitude, longitude, count):
+    """
+    Returns the smallest of `NEAREST_RADII` holding at least `count` rows
+    around a point (the last one if none does).
+    """
+    for radius in NEAREST_RADII[:-1]:
+        if within(queryset, latitude, longitude, radius).count() >= count:
+            return radius
+    return NEAREST_RADII[-1]
+
+
+def nearest(queryset, latitude, longitude, count, radius=None):
+    """
+    Returns the `count` rows nearest to a point, closest first, annotated
+    with their `distance`.
+
+    The search radius grows until it holds `count` rows; rows outside a
+    radius are farther than all rows inside it, so the result is exact.
+    `radius` skips that search when it is already known.
+    """
+    if radius is None:
+        radius = nearest_radius(queryset, latitude, longitude, count)
+    return within(queryset, latitude, longitude, radius).order_by('distance', 'pk')[:count]
+
+
+# -------------------------------
+# Geocoding
+# -------------------------------
+
+def normalize(text):
+    """
+    Lowercases a place name and strips accents and punctuation.
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.sub(r'[^\w]+', ' ', text.casefold()).split())
+
+
+@functools.lru_cache(maxsize=1)
+def gazetteer():
+    """
+    Returns {normalized name: (latitude, longitude)} for every name and alias
+    of the bundled gazetteer (`GEO_GAZETTEER` overrides its path).
+    """
+    path = getattr(settings, 'GEO_GAZETTEER', '') or GAZETTEER_PATH
+    places = {}
+    with open(path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            point = (float(row['latitude']), float(row['longitude']))
+            for name in [row['name'], *(row.get('aliases') or '').split('|')]:
+                if normalize(name):
+                    places.setdefault(normalize(name), point)
+    return places
+
+
+def geocode(text):
+    """
+    Returns the (latitude, longitude) of a free-text location, or None.
+
+    Works offline from the gazetteer: the whole text is looked up first, then
+    its runs of words, longest and leftmost first, so "Vitosha, Sofia" resolves
+    to Vitosha and "Sofia city centre" to Sofia.
+    """
+    words = normalize(text).split()
+    places = gazetteer()
+    for size in range(len(words), 0, -1):
+        for start in range(len(words) - size + 1):
+            point = places.get(' '.join(words[start:start + size]))
+            if point is not None:
+                return point
+    return None
+
+
+def locate(instance):
+    """
+    Sets the coordinates and geohash of a model instance from its `location`.
+    Unknown places clear them.
+    """
+    point = geocode(instance.location)
+    instance.latitude, instance.longitude = point if point else (None, None)
+    instance.geohash = encode(*point) if point else ''
+
+
+# -------------------------------
+# Views
+# -------------------------------
+
+def parse_geo_query(params):
+    """
+    Reads a distance query from request parameters:
+
+    - `near` (a place name) or `lat` and `lon`: the point to search around;
+    - `radius`: kilometres around it (default `DEFAULT_RADIUS_KM`);
+    - `nearest`: return the N nearest rows instead of a radius.
+
+    Returns:
+        dict or None: {'latitude', 'longitude', 'radius', 'nearest'}, or None
+        without a point.
+
+    Raises:
+        ValueError: If a parameter is invalid or the place is unknown.
+    """
+    near, lat, lon = params.get('near'), params.get('lat'), params.get('lon')
+    if near:
+        point = geocode(near)
+        if point is None:
+            raise ValueError(f"Unknown place: {near}")
+    elif lat or lon:
+        try:
+            point = (float(lat), float(lon))
+        except (TypeError, ValueError):
+            raise ValueError("lat and lon must both be numbers")
+        if not (-90 <= point[0] <= 90 and -180 <= point[1] <= 180):
+            raise ValueError("lat / lon out of range")
+    else:
+        return None
+
+    try:
+        radius = float(params.get('radius') or DEFAULT_RADIUS_KM)
+        nearest_count = int(params.get('nearest') or 0)
+    except ValueError:
+        raise ValueError("radius and nearest must be numbers")
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValueError(f"radius must be between 0 and {MAX_RADIUS_KM} km")
+    if not 0 <= nearest_count <= MAX_NEAREST:
+        raise ValueError(f"nearest must be at most {MAX_NEAREST}")
+    return {'latitude': point[0], 'longitude': point[1], 'radius': radius, 'nearest': nearest_count}
+
+
+def filter_by_distance(queryset, query):
+    """
+    Applies a query returned by `parse_geo_query` to a queryset.
+
+    For nearest-N queries, the radius found is stored in the query, so that
+    filtering the same queryset again (e.g. for the validators of a
+    conditional request) does not search for it twice.
+    """
+    if query is None:
+        return queryset
+    if query['nearest']:
+        if 'nearest_radius' not in query:
+            query['nearest_radius'] = nearest_radius(queryset, query['latitude'], query['longitude'], query['nearest'])
+        return nearest(
+            queryset, query['latitude'], query['longitude'], query['nearest'], radius=query['nearest_radius'],
+        )
+    return within(queryset, query['latitude'], query['longitude'], query['radius'])
+
+
+class NearbyListMixin:
+    """
+    ListView mixin filtering by distance (see `parse_geo_query`).
+
+    Radius queries keep the view's keyset pagination and list cache; nearest-N
+    queries are ordered by distance and returned as one unpaginated page.
+    Invalid parameters are ignored, like other unknown filters.
+    """
+
+    def get_geo_params(self):
+        return self.request.GET
+
+    def get_geo_query(self):
+        if not hasattr(self, '_geo_query'):
+            try:
+                self._geo_query = parse_geo_query(self.get_geo_params())
+            except ValueError:
+                self._geo_query = None
+        return self._geo_query
+
+    def filter_by_distance(self, queryset):
+        return filter_by_distance(queryset, self.get_geo_query())
+
+    def get_paginate_by(self, queryset):
+        query = self.get_geo_query()
+        if query and query['nearest']:
+            return None
+        return super().get_paginate_by(queryset)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['geo_query'] = self.get_geo_query()
+        return context
@@ -0,0 +1,400 @@
+import io
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import close_old_connections
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .caching import _count
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> longest side in pixels. Images are never upscaled.
+VARIANTS = {'thumb': 160, 'card': 480, 'full': 1600}
+
+# Output format -> (Pillow format, file extension, MIME type, save options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Originals are stored in the format they were uploaded in, when Pillow writes it
+ORIGINAL_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+
+MANIFEST_PREFIX = 'images:manifest:'
+
+
+# -------------------------------
+# Storage
+# -------------------------------
+
+def media_storage():
+    """
+    Returns the storage of uploaded images: Cloudinary in production, the
+    local file system in development and tests (see the `media` alias of
+    the STORAGES setting).
+    """
+    return storages['media']
+
+
+def _resolve(image):
+    """
+    Returns (storage, name) for a FieldFile or a stored file name.
+    """
+    if hasattr(image, 'storage'):
+        return image.storage, image.name
+    return media_storage(), str(image)
+
+
+# -------------------------------
+# URLs
+# -------------------------------
+# Building a URL is storage work: Cloudinary signs and formats every URL, and
+# some configurations look the resource up over HTTP. A listing page asks for
+# up to seven URLs per card (the variants and the fallback), so resolved URLs
+# are memoized per storage, in process memory.
+
+URL_STATS_NAME = 'media:urls'
+
+# storage -> OrderedDict of name -> (url, expires), least recently used first
+_urls = weakref.WeakKeyDictionary()
+_urls_lock = threading.Lock()
+
+
+def storage_url(storage, name):
+    """
+    Returns `storage.url(name)`, memoized.
+
+    At most IMAGE_URL_CACHE_SIZE URLs are kept per storage, for
+    IMAGE_URL_CACHE_TIMEOUT seconds; the least recently used are evicted
+    first. Files replaced through the image pipeline are forgotten right away
+    (see `forget_urls`); the timeout bounds how long other processes may keep
+    serving a replaced file's URL.
+    """
+    now = time.monotonic()
+    with _urls_lock:
+        urls = _urls.get(storage)
+        entry = urls.get(name) if urls is not None else None
+        if entry is not None and entry[1] > now:
+            urls.move_to_end(name)
+            _count(URL_STATS_NAME, 'hits')
+            return entry[0]
+
+    url = storage.url(name)
+    max_size = getattr(settings, 'IMAGE_URL_CACHE_SIZE', 10_000)
+    timeout = getattr(settings, 'IMAGE_URL_CACHE_TIMEOUT', 3600)
+    with _urls_lock:
+        urls = _urls.setdefault(storage, OrderedDict())
+        urls[name] = (url, now + timeout)
+        urls.move_to_end(name)
+        while len(urls) > max_size:
+            urls.popitem(last=False)
+    _count(URL_STATS_NAME, 'misses' if entry is None else 'stale')
+    return url
+
+
+def forget_urls(storage, *names):
+    """
+    Drops the memoized URLs of files that were written or deleted.
+    """
+    with _urls_lock:
+        urls = _urls.get(storage)
+        for name in names if urls is not None else ():
+            urls.pop(name, None)
+
+
+def clear_url_cache():
+    """
+    Drops every memoized URL of this process.
+    """
+    with _urls_lock:
+        _urls.clear()
+
+
+# -------------------------------
+# Validation
+# -------------------------------
+
+def _too_many_pixels():
+    max_pixels = getattr(settings, 'IMAGE_MAX_PIXELS', 40_000_000)
+    return ValidationError(f"Images may have at most {max_pixels // 1_000_000} megapixels.")
+
+
+def validate_image(file):
+    """
+    Rejects uploads above IMAGE_MAX_UPLOAD_BYTES or IMAGE_MAX_PIXELS.
+
+    Only the image header is read, so oversized files are rejected before
+    anything is decoded.
+    """
+    max_bytes = getattr(settings, 'IMAGE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024)
+    max_pixels = getattr(settings, 'IMAGE_MAX_PIXELS', 40_000_000)
+    if getattr(file, '_committed', False):
+        return  # Already stored; only new uploads are checked
+    if file.size is not None and file.size > max_bytes:
+        raise ValidationError(f"Images may be at most {max_bytes // (1024 * 1024)} MB.")
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        # Pillow refuses to even open images far above its own pixel limit
+        raise _too_many_pixels()
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("Upload a valid image.")
+    finally:
+        file.seek(0)
+    if width * height > max_pixels:
+        raise _too_many_pixels()
+
+
+
+# -------------------------------
+# Processing
+# -------------------------------
+
+def _open(file):
+    """
+    Opens an image upright, as the camera meant it (the EXIF orientation is applied).
+    """
+    image = Image.open(file)
+    image.load()
+    return ImageOps.exif_transpose(image)
+
+
+def sanitize_upload(file):
+    """
+    Re-encodes an uploaded original without its metadata (EXIF, GPS...) and
+    with its longest side capped at IMAGE_MAX_DIMENSION.
+
+    Returns:
+        ContentFile or None: The cleaned file, or None when the upload is left
+        as is (animations, formats Pillow does not write).
+
+    Raises:
+        ValidationError: The image has too many pixels to be decoded safely.
+    """
+    max_dimension = getattr(settings, 'IMAGE_MAX_DIMENSION', 2560)
+    file.seek(0)
+    try:
+        image = Image.open(file)
+        fmt = image.format
+        if fmt not in ORIGINAL_FORMATS or getattr(image, 'is_animated', False):
+            return None
+        image = _open(file)
+    except Image.DecompressionBombError:
+        raise _too_many_pixels()
+    except (UnidentifiedImageError, OSError):
+        return None
+    finally:
+        file.seek(0)
+
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    if fmt == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    # Pillow only writes metadata it is given, so nothing is carried over
+    image.save(output, fmt, quality=90, optimize=True)
+    return ContentFile(output.getvalue())
+
+
+def variant_name(name, variant, fmt):
+    """
+    Returns the storage name of a variant, e.g. events/ride.jpg -> events/ride__card.webp.
+    """
+    stem, _ = os.path.splitext(name)
+    return f'{stem}__{variant}.{FORMATS[fmt][1]}'
+
+
+def render_variants(image):
+    """
+    Encodes every variant of an image in every output format.
+
+    Yields:
+        (variant, format, width, height, bytes) tuples.
+    """
+    for variant, size in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        for fmt, (pillow_format, _, _, options) in FORMATS.items():
+            if pillow_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                # JPEG has no alpha channel: flatten onto white
+                source = Image.new('RGB', resized.size, 'white')
+                source.paste(resized, mask=resized.convert('RGBA').getchannel('A'))
+            else:
+                source = resized
+            output = io.BytesIO()
+            source.save(output, pillow_format, **options)
+            yield variant, fmt, resized.width, resized.height, output.getvalue()
+
+
+def _manifest_key(storage, name):
+    return f'{MANIFEST_PREFIX}{_storage_label(storage)}:{name}'
+
+
+def _storage_label(storage):
+    return type(storage).__name__
+
+
+def manifest_cache():
+    """
+    Returns the cache in front of the manifest table (`IMAGE_CACHE_ALIAS`).
+    """
+    return caches[getattr(settings, 'IMAGE_CACHE_ALIAS', 'default')]
+
+
+def _manifests():
+    # core.models imports this module
+    from .models import ImageManifest
+    return ImageManifest.objects
+
+
+def get_manifest(image):
+    """
+    Returns the variants of a processed image, or None if it was not processed (yet).
+
+    Manifests are stored in the database and read through the cache; images
+    without one are remembered for IMAGE_MANIFEST_MISS_TIMEOUT seconds.
+
+    Example:
+        {'width': 3000, 'height': 2000,
+         'variants': {'card': {'width': 480, 'height': 320, 'webp': name, 'jpeg': name}, ...}}
+    """
+    storage, name = _resolve(image)
+    if not name:
+        return None
+    key = _manifest_key(storage, name)
+    manifest = manifest_cache().get(key)
+    if manifest is None:
+        manifest = (
+            _manifests().filter(storage=_storage_label(storage), name=name).values_list('data', flat=True).first()
+        )
+        if manifest is None:
+            # An empty dict marks an unprocessed image
+            manifest_cache().set(key, {}, timeout=getattr(settings, 'IMAGE_MANIFEST_MISS_TIMEOUT', 300))
+        else:
+            manifest_cache().set(key, manifest, timeout=None)
+    return manifest or None
+
+
+def process_image(storage, name):
+    """
+    Writes the variants of a stored image and records its manifest.
+
+    Variants are saved next to the original (see `variant_name`); the names
+    the storage actually used are kept in the manifest, in the database. Existing variants are
+    replaced, so the function can be re-run safely.
+    """
+    with storage.open(name, 'rb') as file:
+        image = _open(file)
+    variants = {}
+    for variant, fmt, width, height, data in render_variants(image):
+        target = variant_name(name, variant, fmt)
+        if storage.exists(target):
+            storage.delete(target)
+        forget_urls(storage, target)
+        entry = variants.setdefault(variant, {'width': width, 'height': height})
+        entry[fmt] = storage.save(target, ContentFile(data))
+    manifest = {'width': image.width, 'height': image.height, 'variants': variants}
+    _manifests().update_or_create(storage=_storage_label(storage), name=name, defaults={'data': manifest})
+    manifest_cache().set(_manifest_key(storage, name), manifest, timeout=None)
+    return manifest
+
+
+def delete_image(image):
+    """
+    Deletes a stored image together with its variants.
+    """
+    storage, name = _resolve(image)
+    if not name:
+        return
+    manifest = get_manifest(image) or {'variants': {}}
+    for variant in VARIANTS:
+        for fmt in FORMATS:
+            entry = manifest['variants'].get(variant, {})
+            target = entry.get(fmt) or variant_name(name, variant, fmt)
+            storage.delete(target)
+            forget_urls(storage, target)
+    storage.delete(name)
+    forget_urls(storage, name)
+    _manifests().filter(storage=_storage_label(storage), name=name).delete()
+    manifest_cache().delete(_manifest_key(storage, name))
+
+
+# -------------------------------
+# Background Workers
+# -------------------------------
+
+_executor = None
+
+
+def executor():
+    """
+    Returns the worker pool images are processed in, created on first use.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_WORKERS', 2), thread_name_prefix='images',
+        )
+    return _executor
+
+
+def _run(storage, name):
+    try:
+        process_image(storage, name)
+    except Exception:
+        logger.exception("Processing image %s failed", name)
+    finally:
+        # The manifest is written from this worker thread
+        close_old_connections()
+
+
+def schedule(image):
+    """
+    Processes an image in the background worker pool, or right away when
+    IMAGE_PROCESSING_EAGER is set (tests, management commands).
+
+    Until the variants exist, templates keep serving the original.
+    """
+    storage, name = _resolve(image)
+    if not name:
+        return None
+    if getattr(settings, 'IMAGE_PROCESSING_EAGER', False):
+        return process_image(storage, name)
+    return executor().submit(_run, storage, name)
+
+
+# -------------------------------
+# Rendering
+# -------------------------------
+
+def responsive(image, variant='card'):
+    """
+    Returns the URLs a responsive <img> needs, with a single manifest lookup
+    and no storage work once the URLs are memoized (see `storage_url`).
+
+    Returns:
+        (src, srcsets): The URL of the JPEG `variant` and {format: srcset value},
+        or the original's URL and None while the image has not been processed.
+    """
+    storage, name = _resolve(image)
+    manifest = get_manifest(image)
+    if not manifest or variant not in manifest['variants']:
+        return storage_url(storage, name), None
+    entries = manifest['variants'].values()
+    srcsets = {
+        fmt: ', '.join(f"{storage_url(storage, entry[fmt])} {entry['width']}w" for entry in entries)
+        for fmt in FORMATS
+    }
+    return storage_url(storage, manifest['variants'][variant]['jpeg']), srcsets
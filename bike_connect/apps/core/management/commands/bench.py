@@ -0,0 +1,188 @@
+import platform
+import sys
+
+import django
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from bike_connect.apps.core import bench
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the main pages and APIs in-process, on a throwaway database.
+
+    A test database is created and filled with a synthetic dataset, every
+    target is requested through the Django test client, and p50/p95/p99
+    latency, requests/sec and queries per request are reported. Results can
+    be saved as a JSON baseline and compared against a previous one.
+
+    Examples:
+        python manage.py bench --events 2000 --save bench.json
+        python manage.py bench --compare bench.json --threshold 15
+        python manage.py bench --suite serializers --events 10000
+        python manage.py bench --suite json --events 10000 --news 10000
+        python manage.py bench --suite asgi --workers 4 --concurrency 64 --upload-latency 200
+        python manage.py bench --suite media --cards 100 --url-latency 0.5
+    """
+    help = "Benchmark the main pages and APIs on a synthetic dataset."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--suite', choices=['http', 'serializers', 'json', 'asgi', 'media'], default='http',
+            help="'http' requests pages and APIs; 'serializers' serializes the whole event table; "
+                 "'json' compares the serializer and fast JSON paths; 'asgi' compares the "
+                 "throughput of the async JSON endpoints under sync workers and under ASGI; 'media' "
+                 "renders a page of image cards with cold and warm memoized URLs.",
+        )
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--events', type=int, default=200)
+        parser.add_argument('--participations', type=int, default=500)
+        parser.add_argument('--posts', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=300)
+        parser.add_argument('--news', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42, help="Random seed of the dataset.")
+        parser.add_argument('--requests', type=int, default=50, help="Measured requests per target.")
+        parser.add_argument('--warmup', type=int, default=5, help="Unmeasured requests per target.")
+        parser.add_argument(
+            '--target', action='append', choices=sorted(bench.DEFAULT_TARGETS),
+            help="Only benchmark this target (repeatable).",
+        )
+        parser.add_argument('--workers', type=int, default=4, help="Sync workers of the 'asgi' suite's WSGI run.")
+        parser.add_argument(
+            '--concurrency', type=int, default=64, help="Requests in flight in the 'asgi' suite's ASGI run.",
+        )
+        parser.add_argument(
+            '--upload-latency', type=float, default=200.0, help="Milliseconds every upload spends in storage.",
+        )
+        parser.add_argument('--cards', type=int, default=100, help="Image cards of the 'media' suite's page.")
+        parser.add_argument(
+            '--url-latency', type=float, default=0.0, help="Milliseconds every storage url() call takes.",
+        )
+        parser.add_argument('--anonymous', action='store_true', help="Do not log in before requesting.")
+        parser.add_argument('--save', metavar='PATH', help="Write the results to a JSON baseline.")
+        parser.add_argument('--compare', metavar='PATH', help="Compare the results with a JSON baseline.")
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help="Percentage above the baseline p95 / queries counted as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 and not options['anonymous']:
+            raise CommandError("At least one user is needed unless --anonymous is given.")
+        targets = {
+            name: pattern for name, pattern in bench.DEFAULT_TARGETS.items()
+            if not options['target'] or name in options['target']
+        }
+        baseline = bench.load_baseline(options['compare']) if options['compare'] else None
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            counts = bench.seed_dataset(
+                users=options['users'], events=options['events'], participations=options['participations'],
+                posts=options['posts'], comments=options['comments'], news=options['news'], seed=options['seed'],
+            )
+            self.stdout.write("Seeded " + ", ".join(f"{count} {name}" for name, count in counts.items()))
+            for cache in caches.all():
+                cache.clear()
+            if options['suite'] == 'serializers':
+                results = bench.run_serializer_benchmarks()
+            elif options['suite'] == 'json':
+                results = bench.run_json_benchmarks()
+            elif options['suite'] == 'asgi':
+                results = bench.run_concurrency_benchmarks(
+                    'bench0', requests=options['requests'], workers=options['workers'],
+                    concurrency=options['concurrency'], upload_latency=options['upload_latency'] / 1000,
+                )
+            elif options['suite'] == 'media':
+                results = bench.run_media_benchmarks(
+                    cards=options['cards'], repeat=options['requests'], url_latency=options['url_latency'] / 1000,
+                )
+            else:
+                results = bench.run_benchmarks(
+                    targets, requests=options['requests'], warmup=options['warmup'],
+                    username=None if options['anonymous'] else 'bench0',
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['suite'] in ('serializers', 'json'):
+            self.report_serializers(results)
+            return
+        if options['suite'] == 'asgi':
+            self.report_concurrency(results)
+            return
+        if options['suite'] == 'media':
+            self.report_media(results)
+            return
+        self.report(results)
+
+        if options['save']:
+            meta = {
+                'dataset': counts, 'requests': options['requests'], 'anonymous': options['anonymous'],
+                'python': platform.python_version(), 'django': django.get_version(),
+                'database': connection.vendor,
+            }
+            bench.save_baseline(options['save'], results, meta)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['save']}"))
+
+        if baseline is not None and self.report_comparison(results, baseline, options['threshold']):
+            sys.exit(1)
+
+    def report(self, results):
+        header = f"{'target':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<12}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+                f"{row['rps']:>10.1f}{row['queries_per_request']:>10.2f}"
+            )
+
+    def report_serializers(self, results):
+        header = f"{'variant':<28}{'rows':>8}{'best ms':>10}{'queries':>9}{'bytes':>12}{'bytes/row':>11}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<28}{row['rows']:>8}{row['best_ms']:>10.1f}{row['queries']:>9}"
+                f"{row['payload_bytes']:>12}{row['bytes_per_row']:>11.1f}"
+            )
+
+    def report_concurrency(self, results):
+        header = f"{'target':<14}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<14}{row['requests']:>10}{row['errors']:>8}{row['p50_ms']:>10.2f}"
+                f"{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['rps']:>10.1f}"
+            )
+
+    def report_media(self, results):
+        header = f"{'variant':<14}{'cards':>8}{'best ms':>10}{'p50 ms':>10}{'storage calls':>15}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<14}{row['cards']:>8}{row['best_ms']:>10.2f}{row['p50_ms']:>10.2f}"
+                f"{row['storage_calls_per_page']:>15.1f}"
+            )
+
+    def report_comparison(self, results, baseline, threshold):
+        """
+        Prints the change against the baseline; returns True if anything regressed.
+        """
+        regressed = False
+        for metric in ('p95_ms', 'queries_per_request'):
+            for name, before, after, change, worse in bench.compare(results, baseline, metric, threshold):
+                line = f"{name:<12}{metric:<20}{before:>10}{after:>10}{change:>+9.1f}%"
+                self.stdout.write(self.style.ERROR(line) if worse else line)
+                regressed = regressed or worse
+        if regressed:
+            self.stdout.write(self.style.ERROR(f"Regression above {threshold}% against the baseline."))
+        return regressed
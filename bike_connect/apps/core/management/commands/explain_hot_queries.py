@@ -0,0 +1,68 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from bike_connect.apps.core import bench
+from bike_connect.apps.core.explain import explain_hot_queries
+
+
+class Command(BaseCommand):
+    """
+    Explains the queries behind the list pages and APIs on a seeded database.
+
+    A throwaway test database is migrated and filled with the benchmark
+    dataset, then every hot query (see core.explain.hot_queries) is run
+    through EXPLAIN. Plans that read a whole table or sort rows an index could
+    deliver in order are flagged.
+
+    Examples:
+        python manage.py explain_hot_queries --events 20000 --posts 5000
+        python manage.py explain_hot_queries --plans --fail-on-problems
+    """
+    help = "EXPLAIN the hot list queries on a seeded dataset and flag sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--events', type=int, default=5000)
+        parser.add_argument('--participations', type=int, default=20000)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--news', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42, help="Random seed of the dataset.")
+        parser.add_argument('--plans', action='store_true', help="Print every plan, not only the flagged ones.")
+        parser.add_argument(
+            '--fail-on-problems', action='store_true', help="Exit with status 1 if any plan is flagged.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            counts = bench.seed_dataset(
+                users=options['users'], events=options['events'], participations=options['participations'],
+                posts=options['posts'], comments=options['comments'], news=options['news'], seed=options['seed'],
+            )
+            self.stdout.write("Seeded " + ", ".join(f"{count} {name}" for name, count in counts.items()))
+            results = explain_hot_queries()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        flagged = 0
+        for name, plan, problems in results:
+            if problems:
+                flagged += 1
+                details = ', '.join(f"{kind} {table}".strip() for kind, table in problems)
+                self.stdout.write(self.style.WARNING(f"{name:<28}{details}"))
+            else:
+                self.stdout.write(f"{name:<28}ok")
+            if problems or options['plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        summary = f"{flagged} of {len(results)} queries flagged on {connection.vendor}."
+        self.stdout.write(self.style.WARNING(summary) if flagged else self.style.SUCCESS(summary))
+        if flagged and options['fail_on_problems']:
+            sys.exit(1)
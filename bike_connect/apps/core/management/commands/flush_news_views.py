@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from bike_connect.apps.core.viewcounts import flush_views
+
+
+class Command(BaseCommand):
+    """
+    Writes the buffered news view counts to the database.
+
+    Intended to be run periodically (e.g. from cron) so that articles that stop
+    receiving traffic still get their last hits persisted.
+    """
+    help = "Flush buffered news view counts to the database."
+
+    def handle(self, *args, **options):
+        flushed = flush_views()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} buffered views."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from bike_connect.apps.core import geo
+from bike_connect.apps.core.caching import bump_model_version
+from bike_connect.apps.core.signals import GEO_MODELS
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """
+    Geocodes the location of every event and bike post from the bundled gazetteer.
+
+    Rows are geocoded when saved; run this after the migration adding the
+    coordinates, or after adding places to the gazetteer. No network access
+    is needed.
+    """
+    help = "Set the coordinates and geohash of events and bike posts from their location."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true', help="Geocode rows that already have coordinates too.",
+        )
+
+    def handle(self, *args, **options):
+        for model in GEO_MODELS:
+            queryset = model._default_manager.only('pk', 'location', 'latitude', 'longitude', 'geohash')
+            if not options['force']:
+                queryset = queryset.filter(latitude__isnull=True)
+            located = unknown = 0
+            batch = []
+            for instance in queryset.iterator(chunk_size=BATCH_SIZE):
+                geo.locate(instance)
+                if instance.latitude is None:
+                    unknown += 1
+                else:
+                    located += 1
+                batch.append(instance)
+                if len(batch) == BATCH_SIZE:
+                    model._default_manager.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+                    batch = []
+            if batch:
+                model._default_manager.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+            # bulk_update sends no signals: drop the cached lists by hand
+            bump_model_version(model)
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name_plural}: {located} located, {unknown} unknown places."
+            ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from bike_connect.apps.core import images
+from bike_connect.apps.core.signals import IMAGE_FIELDS
+
+
+class Command(BaseCommand):
+    """
+    Renders the responsive variants of every stored image.
+
+    Images uploaded before the image pipeline existed are served as originals
+    until this is run.
+    """
+    help = "Render the thumb/card/full variants of stored images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true', help="Re-render images that already have variants.",
+        )
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+        storage = images.media_storage()
+        for model, fields in IMAGE_FIELDS.items():
+            for field in fields:
+                names = (
+                    model._default_manager.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                    .values_list(field, flat=True).iterator()
+                )
+                for name in names:
+                    if not options['force'] and images.get_manifest(name):
+                        continue
+                    try:
+                        images.process_image(storage, name)
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"{name}: {e}")
+                        continue
+                    processed += 1
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} images ({failed} failed)."))
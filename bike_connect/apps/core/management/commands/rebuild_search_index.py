@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bike_connect.apps.core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the search index for events, news and bike posts from scratch.
+
+    Useful after bulk imports or `QuerySet.update()` calls, which bypass the
+    signals that normally keep the index up to date.
+    """
+    help = "Rebuild the full-text search index."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} objects."))
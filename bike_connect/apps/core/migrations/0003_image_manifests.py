@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('storage', models.CharField(max_length=100, verbose_name='Storage')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('data', models.JSONField(verbose_name='Manifest')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Image Manifest',
+                'verbose_name_plural': 'Image Manifests',
+                'unique_together': {('storage', 'name')},
+            },
+        ),
+    ]
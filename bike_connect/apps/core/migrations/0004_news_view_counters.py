@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_image_manifests'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsViewCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Shard')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Hits')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_counters', to='core.news', verbose_name='News')),
+            ],
+            options={
+                'verbose_name': 'News View Counter',
+                'verbose_name_plural': 'News View Counters',
+                'unique_together': {('news', 'shard')},
+            },
+        ),
+    ]
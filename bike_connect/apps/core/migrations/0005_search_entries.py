@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:25
+
+import bike_connect.apps.core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_news_view_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='news',
+            name='image',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=bike_connect.apps.core.images.media_storage, upload_to='news_images/', validators=[bike_connect.apps.core.images.validate_image], verbose_name='Image'),
+        ),
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('news', 'News'), ('bikepost', 'Bike Post')], max_length=20, verbose_name='Kind')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Object ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Title')),
+                ('body', models.TextField(blank=True, verbose_name='Body')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
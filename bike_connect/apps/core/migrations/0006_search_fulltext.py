@@ -0,0 +1,71 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:40
+
+from django.db import migrations
+
+# Full-text structures on top of the SearchEntry table, per database vendor.
+# PostgreSQL gets a generated, weighted tsvector column with a GIN index;
+# SQLite an external-content FTS5 table kept in sync by triggers. Other
+# backends fall back to LIKE matching and get nothing.
+FULLTEXT_SQL = {
+    'postgresql': [
+        """ALTER TABLE core_searchentry ADD COLUMN IF NOT EXISTS document tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+            ) STORED""",
+        "CREATE INDEX IF NOT EXISTS core_searchentry_document_gin ON core_searchentry USING GIN (document)",
+    ],
+    'sqlite': [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS core_searchentry_fts USING fts5(
+            title, body, content='core_searchentry', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS core_searchentry_ai AFTER INSERT ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS core_searchentry_ad AFTER DELETE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS core_searchentry_au AFTER UPDATE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        # Index rows that existed before the FTS table was created
+        "INSERT INTO core_searchentry_fts(core_searchentry_fts) VALUES ('rebuild')",
+    ],
+}
+
+REVERSE_FULLTEXT_SQL = {
+    'postgresql': [
+        "DROP INDEX IF EXISTS core_searchentry_document_gin",
+        "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS document",
+    ],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS core_searchentry_ai",
+        "DROP TRIGGER IF EXISTS core_searchentry_ad",
+        "DROP TRIGGER IF EXISTS core_searchentry_au",
+        "DROP TABLE IF EXISTS core_searchentry_fts",
+    ],
+}
+
+
+class RunVendorSQL(migrations.RunSQL):
+    """
+    RunSQL taking {vendor: statements}; vendors not listed run nothing.
+    """
+
+    def _run_sql(self, schema_editor, sqls):
+        super()._run_sql(schema_editor, sqls.get(schema_editor.connection.vendor, []))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_search_entries'),
+    ]
+
+    operations = [
+        RunVendorSQL(FULLTEXT_SQL, REVERSE_FULLTEXT_SQL),
+    ]
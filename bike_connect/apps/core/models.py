@@ -1,8 +1,9 @@
-from cloudinary_storage.storage import MediaCloudinaryStorage
 from django.db import models
 from django.urls import reverse
 from cloudinary.models import CloudinaryField
 
+from .images import media_storage, validate_image
+
 
 # -------------------------------
 # News Model
@@ -26,7 +27,8 @@ class News(models.Model):
     # Optional image for the news article, stored using a custom storage backend
     image = models.ImageField(
         upload_to='news_images/',
-        storage=MediaCloudinaryStorage(),
+        storage=media_storage,
+        validators=[validate_image],
         blank=True,
         null=True,
         max_length=255,
@@ -78,11 +80,73 @@ class News(models.Model):
         """
         return reverse('core:news_detail', kwargs={'pk': self.pk})
 
+    @property
+    def total_views(self):
+        """
+        Returns the stored view count plus the hits still waiting in the buffer.
+        """
+        from .viewcounts import pending_views
+        return self.views + pending_views(self.pk)
+
     class Meta:
         """
         Meta options for the News model.
         """
         ordering = ['-created_at']  # Default ordering: newest articles first
+        indexes = [
+            # Published news, newest first: the news API and the landing page
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_published=True), name='news_published_idx',
+            ),
+            # The news list pages, also filtered by year / month
+            models.Index(fields=['-created_at', '-id'], name='news_created_idx'),
+        ]
+
+
+# -------------------------------
+# NewsViewCounter Model
+# -------------------------------
+class NewsViewCounter(models.Model):
+    """
+    Hits of a news article not yet added to `News.views` (see `core.viewcounts`).
+
+    Every article has up to VIEW_COUNTER_SHARDS rows; each hit increments a
+    random one with a single upsert, so concurrent visits to a hot article
+    rarely wait on the same row, and never on the article's own row.
+    """
+
+    # The article the hits belong to
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        related_name='view_counters',
+        verbose_name="News"  # User-friendly label for the field
+    )
+
+    # Which of the article's counter rows this is
+    shard = models.PositiveSmallIntegerField(
+        verbose_name="Shard"  # User-friendly label for the field
+    )
+
+    # Buffered hits
+    hits = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Hits"  # User-friendly label for the field
+    )
+
+    def __str__(self):
+        """
+        Returns the string representation of the NewsViewCounter object.
+        """
+        return f"{self.news_id}#{self.shard}: {self.hits}"
+
+    class Meta:
+        """
+        Meta options for the NewsViewCounter model.
+        """
+        unique_together = ('news', 'shard')  # The upsert target of every hit
+        verbose_name = 'News View Counter'  # Singular name in the admin panel
+        verbose_name_plural = 'News View Counters'  # Plural name in the admin panel
 
 
 # -------------------------------
@@ -147,3 +211,116 @@ class Page(models.Model):
         ordering = ['title']  # Default ordering: alphabetically by title
         verbose_name = 'Static Page'  # Singular name in the admin panel
         verbose_name_plural = 'Static Pages'  # Plural name in the admin panel
+
+
+# -------------------------------
+# SearchEntry Model
+# -------------------------------
+class SearchEntry(models.Model):
+    """
+    Precomputed search document for a BikePost, Event or News object.
+
+    Rows are kept in sync by signals (see `core.search`). The full-text index on
+    top of this table is backend specific: a weighted tsvector column with a GIN
+    index on PostgreSQL, or an FTS5 virtual table on SQLite.
+    """
+
+    KIND_CHOICES = [
+        ('event', 'Event'),
+        ('news', 'News'),
+        ('bikepost', 'Bike Post'),
+    ]
+
+    # Type of the indexed object
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name="Kind"  # User-friendly label for the field
+    )
+
+    # Primary key of the indexed object
+    object_id = models.PositiveBigIntegerField(
+        verbose_name="Object ID"  # User-friendly label for the field
+    )
+
+    # Text weighted highest when ranking (the object's title)
+    title = models.CharField(
+        max_length=200,
+        verbose_name="Title"  # User-friendly label for the field
+    )
+
+    # Remaining searchable text (description, content, location, tags...)
+    body = models.TextField(
+        blank=True,
+        verbose_name="Body"  # User-friendly label for the field
+    )
+
+    # Timestamp when the entry was last refreshed (auto-updated)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At"  # User-friendly label for the field
+    )
+
+    def __str__(self):
+        """
+        Returns the string representation of the SearchEntry object.
+        """
+        return f"{self.kind}:{self.object_id} {self.title}"
+
+    class Meta:
+        """
+        Meta options for the SearchEntry model.
+        """
+        unique_together = ('kind', 'object_id')  # One document per indexed object
+        verbose_name = 'Search Entry'  # Singular name in the admin panel
+        verbose_name_plural = 'Search Entries'  # Plural name in the admin panel
+
+
+# -------------------------------
+# ImageManifest Model
+# -------------------------------
+class ImageManifest(models.Model):
+    """
+    Responsive variants rendered for a stored image (see `core.images`).
+
+    The manifest is the only record of the names the storage gave the variant
+    files, so it lives in the database; the cache only holds a copy for
+    rendering.
+    """
+
+    # Storage class the image is stored in
+    storage = models.CharField(
+        max_length=100,
+        verbose_name="Storage"  # User-friendly label for the field
+    )
+
+    # Storage name of the original image
+    name = models.CharField(
+        max_length=255,
+        verbose_name="Name"  # User-friendly label for the field
+    )
+
+    # Original size and the variants' sizes and file names
+    data = models.JSONField(
+        verbose_name="Manifest"  # User-friendly label for the field
+    )
+
+    # Timestamp when the variants were last rendered (auto-updated)
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At"  # User-friendly label for the field
+    )
+
+    def __str__(self):
+        """
+        Returns the string representation of the ImageManifest object.
+        """
+        return self.name
+
+    class Meta:
+        """
+        Meta options for the ImageManifest model.
+        """
+        unique_together = ('storage', 'name')  # One manifest per stored image
+        verbose_name = 'Image Manifest'  # Singular name in the admin panel
+        verbose_name_plural = 'Image Manifests'  # Plural name in the admin panel
@@ -0,0 +1,328 @@
+import base64
+import datetime
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+# -------------------------------
+# Cursor Encoding
+# -------------------------------
+
+def encode_cursor(position, backwards=False):
+    """
+    Encodes a keyset position into an opaque, URL-safe token.
+
+    Args:
+        position: Sequence of the ordering values of the boundary row.
+        backwards: True when the cursor points to the previous page.
+    """
+    values = [value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else value
+              for value in position]
+    payload = json.dumps({'p': values, 'b': int(backwards)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decodes a token produced by `encode_cursor`.
+
+    Returns:
+        tuple: The position values and the backwards flag.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload['p']), bool(payload['b'])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor(f"Invalid cursor: {token!r}")
+
+
+# -------------------------------
+# Approximate Counting
+# -------------------------------
+
+def approximate_count(queryset, timeout=60):
+    """
+    Returns a cheap estimate of the number of rows in the queryset.
+
+    Unfiltered tables on PostgreSQL use the planner statistics from `pg_class`.
+    Everything else falls back to an exact COUNT(*) whose result is cached for
+    `timeout` seconds, so it is paid at most once per interval per filter.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # Tables that were never analyzed report -1
+        if row and row[0] >= 0:
+            return row[0]
+
+    key = 'keyset:count:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+# -------------------------------
+# Keyset Paginator
+# -------------------------------
+
+def _reverse_ordering(ordering):
+    """
+    Flips the direction of every field in an ordering tuple.
+    """
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+def _row_value(row, field):
+    """
+    Reads an ordering value from a model instance or a `.values()` dict.
+    """
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+class KeysetPage:
+    """
+    A single page of results, exposing the same interface as Django's `Page`
+    where it makes sense (`has_next`, `has_previous`, iteration, length), plus
+    the cursors of the adjacent pages.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def count(self):
+        """
+        Returns the approximate total number of rows across all pages.
+        """
+        return self.paginator.count
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the last row seen instead of using OFFSET.
+
+    Every page is fetched with `WHERE (key) < (last key) ORDER BY key LIMIT n`,
+    so deep pages cost the same as the first one and no COUNT(*) is needed.
+    The ordering must end with a unique field (usually `id`) to be total.
+
+    Args:
+        queryset: The queryset to paginate.
+        per_page: Number of rows per page.
+        ordering: Tuple of field names, e.g. ('-date', '-id').
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(field.lstrip('-') for field in self.ordering)
+
+    @property
+    def count(self):
+        """
+        Returns the approximate total number of rows.
+        """
+        return approximate_count(self.queryset)
+
+    def _seek_filter(self, position, ordering):
+        """
+        Builds the lexicographic "comes after `position`" condition for `ordering`.
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': position[i]})
+            for previous_field, value in zip(self.fields[:i], position[:i]):
+                term &= Q(**{previous_field: value})
+            condition |= term
+        return condition
+
+    def page(self, cursor=None, read_through=None):
+        """
+        Returns the page identified by the cursor (the first page if None).
+
+        Args:
+            cursor: Opaque cursor of the page, or None.
+            read_through: Optional callable wrapping the row fetch, e.g. to serve
+                the rows from a cache. It receives the fetch callable and must
+                return the rows.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed.
+        """
+        position, backwards = decode_cursor(cursor) if cursor else (None, False)
+        if position is not None and len(position) != len(self.fields):
+            raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+        ordering = _reverse_ordering(self.ordering) if backwards else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._seek_filter(position, ordering))
+            except (ValidationError, ValueError, TypeError):
+                # The token decoded, but its values do not fit the ordering fields
+                raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+        # Fetch one extra row to find out whether there is another page
+        def fetch():
+            return list(queryset[:self.per_page + 1])
+
+        rows = read_through(fetch) if read_through else fetch()
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = position is not None if backwards else has_more
+        has_previous = has_more if backwards else position is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor([_row_value(rows[-1], f) for f in self.fields])
+        if rows and has_previous:
+            previous_cursor = encode_cursor([_row_value(rows[0], f) for f in self.fields], backwards=True)
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def get_page(self, cursor=None):
+        """
+        Returns the page for the cursor, falling back to the first page if it is invalid.
+        """
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+
+# -------------------------------
+# Class-based View Integration
+# -------------------------------
+
+class KeysetPaginationMixin:
+    """
+    Mixin for ListView that replaces OFFSET/LIMIT pagination with keyset pagination.
+
+    Set `keyset_ordering` on the view; `paginate_by` keeps controlling the page size.
+    The context gets the usual `page_obj`, `paginator` and `is_paginated` entries,
+    with `page_obj.next_cursor` / `page_obj.previous_cursor` for the links.
+    """
+    keyset_ordering = ('-id',)
+    cursor_kwarg = 'cursor'
+
+    def cache_page_rows(self, fetch):
+        """
+        Fetches the rows of the current page; overridden by `CachedListMixin`.
+        """
+        return fetch()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg), read_through=self.cache_page_rows)
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+# -------------------------------
+# Django REST Framework Integration
+# -------------------------------
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination class backed by `KeysetPaginator`.
+
+    The ordering is taken from the view's `keyset_ordering` attribute. Responses
+    contain `next`/`previous` links with opaque cursors and, when the client
+    passes `?with_count=1`, an approximate `count`.
+    """
+    page_size = 10
+    ordering = ('-id',)
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        paginator = KeysetPaginator(queryset, self.page_size, ordering)
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound("Invalid cursor")
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+        }
+        if self.request.query_params.get(self.count_query_param):
+            payload['count'] = self.page.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
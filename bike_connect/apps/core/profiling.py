@@ -0,0 +1,254 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import resolve
+
+logger = logging.getLogger('bike_connect.queries')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a view runs more queries than its declared budget allows.
+    """
+
+
+# -------------------------------
+# Recording Queries
+# -------------------------------
+class QueryRecorder:
+    """
+    Context manager recording every SQL query run on any database connection.
+
+    Usage:
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.total_time, recorder.duplicates
+    """
+
+    def __init__(self):
+        self.queries = []  # (sql, params, seconds)
+        self._stack = None
+
+    def _record(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        """
+        Returns the time spent in the database, in seconds.
+        """
+        return sum(seconds for _, _, seconds in self.queries)
+
+    @property
+    def duplicates(self):
+        """
+        Returns {sql: times} for every statement run more than once.
+
+        Statements are compared without their parameters, so the same query run
+        for each row of a list (an N+1) shows up as one duplicated statement.
+        """
+        counts = Counter(sql for sql, _, _ in self.queries)
+        return {sql: times for sql, times in counts.items() if times > 1}
+
+
+# -------------------------------
+# Per-view Budgets
+# -------------------------------
+class QueryBudget:
+    """
+    Maximum number of queries (and of duplicated statements) a view may run.
+
+    Declare it on a class-based view with `query_budget = QueryBudget(...)`,
+    or on a function view with the `@query_budget(...)` decorator.
+    """
+
+    def __init__(self, max_queries=None, max_duplicates=None):
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+
+    def violations(self, recorder):
+        """
+        Returns a list of human-readable reasons the recorder exceeds the budget.
+        """
+        problems = []
+        if self.max_queries is not None and recorder.count > self.max_queries:
+            problems.append(f"{recorder.count} queries (budget {self.max_queries})")
+        duplicated = sum(times - 1 for times in recorder.duplicates.values())
+        if self.max_duplicates is not None and duplicated > self.max_duplicates:
+            problems.append(f"{duplicated} duplicated queries (budget {self.max_duplicates})")
+        return problems
+
+
+def query_budget(max_queries=None, max_duplicates=None):
+    """
+    Decorator declaring the query budget of a function-based view.
+    """
+    def decorator(view_func):
+        view_func.query_budget = QueryBudget(max_queries, max_duplicates)
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func):
+    """
+    Returns the budget declared on a view function or its class, if any.
+    """
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    return getattr(view_func, 'query_budget', None) or getattr(view_class, 'query_budget', None)
+
+
+def check_query_budget(budget, recorder, label):
+    """
+    Raises QueryBudgetExceeded, listing the duplicated SQL, if the budget is exceeded.
+    """
+    problems = budget.violations(recorder) if budget else []
+    if problems:
+        details = '\n'.join(f'  {times}x {sql}' for sql, times in recorder.duplicates.items())
+        raise QueryBudgetExceeded(f"{label} ran {', '.join(problems)}" + (f"\n{details}" if details else ''))
+
+
+# -------------------------------
+# Middleware
+# -------------------------------
+class QueryProfilingMiddleware:
+    """
+    Records the queries of every request and reports them.
+
+    - Adds a `Server-Timing` header with the DB time, query count and duplicates.
+    - Logs one structured line per request on the `bike_connect.queries` logger.
+    - Checks the budget declared on the view; exceeding it logs a warning, or
+      raises QueryBudgetExceeded when `QUERY_BUDGET_RAISE` is set (e.g. in CI).
+
+    Opt-in: only active when the `QUERY_PROFILING` setting is True.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        # Async views run their queries in the request's thread-sensitive
+        # thread, so the recorder is installed on that thread's connections
+        start = time.perf_counter()
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+        return self.report(request, response, recorder, time.perf_counter() - start)
+
+    def report(self, request, response, recorder, elapsed):
+        """
+        Adds the Server-Timing header, logs the profile and checks the view's budget.
+        """
+        duplicated = sum(times - 1 for times in recorder.duplicates.values())
+        response['Server-Timing'] = (
+            f'db;dur={recorder.total_time * 1000:.2f};desc="{recorder.count} queries", '
+            f'dupes;desc="{duplicated} duplicated", '
+            f'total;dur={elapsed * 1000:.2f}'
+        )
+
+        match = getattr(request, 'resolver_match', None) or self._resolve(request.path_info)
+        view_name = match.view_name if match else None
+        profile = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'duplicated': duplicated,
+            'db_ms': round(recorder.total_time * 1000, 2),
+            'total_ms': round(elapsed * 1000, 2),
+        }
+        logger.info("query profile %s", json.dumps(profile), extra={'query_profile': profile})
+
+        budget = get_query_budget(match.func) if match else None
+        try:
+            check_query_budget(budget, recorder, view_name)
+        except QueryBudgetExceeded as e:
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise
+            logger.warning("query budget exceeded: %s", e)
+        return response
+
+    @staticmethod
+    def _resolve(path):
+        try:
+            return resolve(path)
+        except Exception:
+            return None
+
+
+# -------------------------------
+# Test Helper
+# -------------------------------
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin failing a test when a view exceeds its declared budget.
+
+    Usage:
+        class MyTest(QueryBudgetTestMixin, TestCase):
+            def test_budget(self):
+                self.assertWithinQueryBudget(reverse('events:event_list'))
+    """
+
+    def assertWithinQueryBudget(self, url, data=None, budget=None):
+        """
+        Requests the URL with the test client and checks the view's query budget.
+
+        Args:
+            url: URL to request with GET.
+            data: Optional query string parameters.
+            budget: QueryBudget overriding the one declared on the view.
+        """
+        match = resolve(url.split('?')[0])
+        budget = budget or get_query_budget(match.func)
+        if budget is None:
+            self.fail(f"{match.view_name} declares no query budget")
+        with QueryRecorder() as recorder:
+            response = self.client.get(url, data)
+        self.assertLess(response.status_code, 400)
+        try:
+            check_query_budget(budget, recorder, match.view_name)
+        except QueryBudgetExceeded as e:
+            self.fail(str(e))
+        return response
@@ -0,0 +1,196 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Cookie holding the time until which a client reads from the primary
+PIN_COOKIE = 'primary_until'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Models read on every request to authenticate it; a lagging replica could
+# log a user out right after they signed in
+PRIMARY_ONLY_MODELS = ('sessions.session',)
+
+# Database the current request / task reads from; None reads from the primary
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_alias():
+    """
+    Returns the alias of the read replica, or None when no replica is configured.
+    """
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', '')
+    return alias if alias and alias in settings.DATABASES else None
+
+
+# -------------------------------
+# Router
+# -------------------------------
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica inside `reading_from_replica()` blocks, and
+    everything else to the primary.
+
+    Writes always go to the primary; the replica is never migrated, it gets
+    the schema through replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and model._meta.label_lower not in PRIMARY_ONLY_MODELS:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same rows
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+@contextmanager
+def reading_from_replica():
+    """
+    Reads from the replica inside the block, if one is configured.
+    """
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def reading_from_primary():
+    """
+    Reads from the primary inside the block, e.g. to fill a shared cache.
+    """
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+# -------------------------------
+# Read-your-writes
+# -------------------------------
+
+def is_pinned(request):
+    """
+    Returns True while the client's recent writes may not have reached the replica yet.
+    """
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_to_primary(response):
+    """
+    Makes the client read from the primary for the next `REPLICA_PIN_SECONDS`.
+    """
+    seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 15)
+    response.set_cookie(
+        PIN_COOKIE, f'{time.time() + seconds:.0f}', max_age=seconds, httponly=True, samesite='Lax',
+    )
+    return response
+
+
+def use_replica(request):
+    """
+    Returns True if the request may be answered from the replica: a safe
+    method, from a client that did not write recently.
+    """
+    return replica_alias() is not None and request.method in SAFE_METHODS and not is_pinned(request)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pins a client to the primary after any write it makes (POST, PUT, PATCH,
+    DELETE), so that the pages it loads next show its own changes even if
+    the replica lags behind.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def process(self, request, response):
+        if request.method not in SAFE_METHODS and replica_alias() is not None:
+            pin_to_primary(response)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+
+# -------------------------------
+# Views
+# -------------------------------
+
+def _render(response):
+    # Template responses query lazily while rendering; render them while the
+    # replica is still selected
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    return response
+
+
+def read_from_replica(view_func):
+    """
+    Decorator answering safe requests to a function-based view from the replica.
+    """
+    if iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if not use_replica(request):
+                return await view_func(request, *args, **kwargs)
+            with reading_from_replica():
+                return _render(await view_func(request, *args, **kwargs))
+    else:
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not use_replica(request):
+                return view_func(request, *args, **kwargs)
+            with reading_from_replica():
+                return _render(view_func(request, *args, **kwargs))
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """
+    View mixin answering safe requests from the replica; works for Django and
+    DRF class-based views. Must come first in the bases, before mixins that
+    query in `dispatch` (e.g. conditional requests).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not use_replica(request):
+            return super().dispatch(request, *args, **kwargs)
+        with reading_from_replica():
+            return _render(super().dispatch(request, *args, **kwargs))
@@ -0,0 +1,264 @@
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.posts.models import BikePost
+from .models import News, SearchEntry
+
+# Upper bound on the number of words taken from a query
+MAX_TERMS = 10
+
+# Relative weight of the title compared to the body when ranking on SQLite
+TITLE_WEIGHT = 10.0
+
+SEARCH_TABLE = SearchEntry._meta.db_table
+FTS_TABLE = f'{SEARCH_TABLE}_fts'
+
+
+# -------------------------------
+# Indexed Sources
+# -------------------------------
+class SearchSource:
+    """
+    Describes how objects of one model are turned into search documents.
+
+    Args:
+        kind: Value stored in `SearchEntry.kind` for this model.
+        model: The indexed model class.
+        title_field: Name of the field used as the document title.
+        body_fields: Names of the fields concatenated into the document body.
+        url_name: URL pattern name of the object's detail view.
+        visible_field: Optional boolean field; objects where it is False are not indexed.
+    """
+
+    def __init__(self, kind, model, title_field, body_fields, url_name, visible_field=None):
+        self.kind = kind
+        self.model = model
+        self.title_field = title_field
+        self.body_fields = body_fields
+        self.url_name = url_name
+        self.visible_field = visible_field
+
+    def is_visible(self, instance):
+        return self.visible_field is None or getattr(instance, self.visible_field)
+
+    def document(self, instance):
+        """
+        Returns the (title, body) pair to index for the instance.
+        """
+        body = ' '.join(str(getattr(instance, field) or '') for field in self.body_fields)
+        return getattr(instance, self.title_field), body.strip()
+
+    def url(self, object_id):
+        return reverse(self.url_name, kwargs={'pk': object_id})
+
+
+SOURCES = {
+    source.kind: source for source in (
+        SearchSource('event', Event, 'title', ('description', 'location'), 'events:event_detail'),
+        SearchSource('news', News, 'title', ('content', 'tags'), 'core:news_detail', visible_field='is_published'),
+        SearchSource('bikepost', BikePost, 'title', ('description', 'location', 'category'), 'posts:bikepost_detail'),
+    )
+}
+
+SOURCES_BY_MODEL = {source.model: source for source in SOURCES.values()}
+
+
+# -------------------------------
+# Keeping the Index Up to Date
+# -------------------------------
+
+def index_instance(instance):
+    """
+    Creates, refreshes or removes the search entry of a saved instance.
+    """
+    source = SOURCES_BY_MODEL[type(instance)]
+    if not source.is_visible(instance):
+        remove_instance(instance)
+        return
+    title, body = source.document(instance)
+    SearchEntry.objects.update_or_create(
+        kind=source.kind, object_id=instance.pk,
+        defaults={'title': title[:200], 'body': body},
+    )
+
+
+def index_new_instances(instances):
+    """
+    Indexes freshly created instances of one model in bulk.
+
+    `bulk_create()` sends no post_save signals, so bulk imports call this
+    instead of relying on `index_instance`.
+    """
+    entries = []
+    for instance in instances:
+        source = SOURCES_BY_MODEL[type(instance)]
+        if source.is_visible(instance):
+            title, body = source.document(instance)
+            entries.append(SearchEntry(kind=source.kind, object_id=instance.pk, title=title[:200], body=body))
+    SearchEntry.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
+
+
+def remove_instance(instance):
+    """
+    Deletes the search entry of an instance.
+    """
+    source = SOURCES_BY_MODEL[type(instance)]
+    SearchEntry.objects.filter(kind=source.kind, object_id=instance.pk).delete()
+
+
+def rebuild_index():
+    """
+    Reindexes every object of every source from scratch.
+
+    Returns:
+        int: The number of entries written.
+    """
+    SearchEntry.objects.all().delete()
+    entries = []
+    for source in SOURCES.values():
+        for instance in source.model.objects.iterator(chunk_size=500):
+            if source.is_visible(instance):
+                title, body = source.document(instance)
+                entries.append(SearchEntry(kind=source.kind, object_id=instance.pk, title=title[:200], body=body))
+    SearchEntry.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
+
+
+# -------------------------------
+# Backend-specific Full-text Index
+# -------------------------------
+
+# SQLite databases known to have the FTS5 table, to skip the lookup next time
+_fts_databases = set()
+
+
+def _backend(connection):
+    """
+    Returns 'postgresql', 'sqlite' or None when no full-text index is available.
+    """
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        name = connection.settings_dict['NAME']
+        if name not in _fts_databases:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                if cursor.fetchone() is None:
+                    return None
+            _fts_databases.add(name)
+        return 'sqlite'
+    return None
+
+
+# -------------------------------
+# Querying
+# -------------------------------
+
+def parse_terms(query):
+    """
+    Splits a user query into lower-cased word terms safe to embed in a
+    tsquery or FTS5 MATCH expression.
+    """
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _fts_match(terms):
+    return ' AND '.join(f'"{term}"*' for term in terms)
+
+
+def search(query, kinds=None, limit=20, offset=0):
+    """
+    Returns ranked search entries matching every word of the query.
+
+    Each returned SearchEntry has an extra `rank` attribute; results are
+    ordered best match first. Titles weigh more than bodies.
+
+    Args:
+        query: Free-text user query.
+        kinds: Optional list of kinds to restrict the search to.
+        limit: Maximum number of results.
+        offset: Number of results to skip (for pagination).
+    """
+    terms = parse_terms(query)
+    kinds = [kind for kind in (kinds or SOURCES) if kind in SOURCES]
+    if not terms or not kinds:
+        return []
+
+    connection = connections[router.db_for_read(SearchEntry)]
+    backend = _backend(connection)
+    kind_placeholders = ', '.join(['%s'] * len(kinds))
+
+    if backend == 'postgresql':
+        return list(SearchEntry.objects.raw(
+            f"""SELECT e.*, ts_rank(e.document, q) AS rank
+                FROM {SEARCH_TABLE} e, to_tsquery('simple', %s) q
+                WHERE e.document @@ q AND e.kind IN ({kind_placeholders})
+                ORDER BY rank DESC, e.id DESC
+                LIMIT %s OFFSET %s""",
+            [_tsquery(terms), *kinds, limit, offset],
+        ))
+
+    if backend == 'sqlite':
+        # bm25() is lower for better matches, so it is negated into a score
+        return list(SearchEntry.objects.raw(
+            f"""SELECT e.*, -bm25({FTS_TABLE}, %s, 1.0) AS rank
+                FROM {FTS_TABLE} JOIN {SEARCH_TABLE} e ON e.id = {FTS_TABLE}.rowid
+                WHERE {FTS_TABLE} MATCH %s AND e.kind IN ({kind_placeholders})
+                ORDER BY rank DESC, e.id DESC
+                LIMIT %s OFFSET %s""",
+            [TITLE_WEIGHT, _fts_match(terms), *kinds, limit, offset],
+        ))
+
+    # No full-text index: plain substring matching, title hits first
+    entries = SearchEntry.objects.filter(kind__in=kinds)
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    results = list(entries.order_by('-id')[offset:offset + limit])
+    for entry in results:
+        entry.rank = sum(2 if term in entry.title.lower() else 1 for term in terms)
+    return sorted(results, key=lambda entry: -entry.rank)
+
+
+def filter_queryset(queryset, query):
+    """
+    Restricts a BikePost, Event or News queryset to the objects matching the query.
+
+    The match is done against the full-text index through a subquery, so the
+    queryset keeps its own ordering and pagination.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset.none()
+
+    source = SOURCES_BY_MODEL[queryset.model]
+    backend = _backend(connections[queryset.db])
+
+    if backend == 'postgresql':
+        matches = RawSQL(
+            f"SELECT object_id FROM {SEARCH_TABLE} "
+            f"WHERE kind = %s AND document @@ to_tsquery('simple', %s)",
+            [source.kind, _tsquery(terms)],
+        )
+    elif backend == 'sqlite':
+        matches = RawSQL(
+            f"SELECT e.object_id FROM {FTS_TABLE} JOIN {SEARCH_TABLE} e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND e.kind = %s",
+            [_fts_match(terms), source.kind],
+        )
+    else:
+        entries = SearchEntry.objects.filter(kind=source.kind)
+        for term in terms:
+            entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        matches = entries.values('object_id')
+
+    return queryset.filter(pk__in=matches)
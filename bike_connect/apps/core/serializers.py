@@ -1,7 +1,41 @@
 from rest_framework import serializers
 from .models import News
+from .search import SOURCES
+from .viewcounts import pending_views_many
+
+
+def _total_views(rows):
+    # Fast JSON path: stored views plus buffered hits, one query per page
+    pending = pending_views_many([row['id'] for row in rows])
+    return [row['views'] + pending[row['id']] for row in rows]
+
 
 class NewsSerializer(serializers.ModelSerializer):
+    # Include hits still buffered by the view counter
+    views = serializers.IntegerField(source='total_views', read_only=True)
+
+    # Fields the fast JSON path computes for a whole page of `.values()` rows
+    fast_batch_fields = {'views': (('id', 'views'), _total_views)}
+
     class Meta:
         model = News
         fields = ['id', 'title', 'content', 'image', 'tags', 'is_published', 'views', 'created_at', 'updated_at']
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """
+    Read-only representation of a ranked search hit across events, news and bike posts.
+    """
+    kind = serializers.CharField()
+    id = serializers.IntegerField(source='object_id')
+    title = serializers.CharField()
+    snippet = serializers.SerializerMethodField()
+    url = serializers.SerializerMethodField()
+    rank = serializers.FloatField()
+
+    def get_snippet(self, entry):
+        # Keep responses small; the full text is on the detail page
+        return entry.body[:200]
+
+    def get_url(self, entry):
+        return SOURCES[entry.kind].url(entry.object_id)
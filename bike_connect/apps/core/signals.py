@@ -0,0 +1,191 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.posts.models import BikePost, Comment
+from bike_connect.apps.users import activity
+from . import geo, images, search
+from .caching import bump_model_version
+from .models import News
+
+# Models whose changes invalidate cached fragments and row lists
+CACHED_MODELS = (BikePost, Event, News)
+
+# Image fields run through the image pipeline, per model
+IMAGE_FIELDS = {
+    BikePost: ('image',),
+    Event: ('image',),
+    News: ('image',),
+    get_user_model(): ('profile_picture',),
+}
+
+# Models geocoded from their `location` field
+GEO_MODELS = (BikePost, Event)
+
+# Models counted in the activity summaries of their users
+ACTIVITY_MODELS = (BikePost, Comment, Event, Participation)
+
+
+# -------------------------------
+# Search Index Maintenance
+# -------------------------------
+
+def update_search_entry(sender, instance, raw=False, **kwargs):
+    """
+    Refreshes the search entry of a BikePost, Event or News after it is saved.
+    """
+    if not raw:  # Skip fixture loading
+        search.index_instance(instance)
+
+
+def delete_search_entry(sender, instance, **kwargs):
+    """
+    Removes the search entry of a BikePost, Event or News after it is deleted.
+    """
+    search.remove_instance(instance)
+
+
+# -------------------------------
+# Cache Invalidation
+# -------------------------------
+
+def invalidate_cached_lists(sender, **kwargs):
+    """
+    Bumps the model version so that fragments and row lists built from it are rebuilt.
+    """
+    bump_model_version(sender)
+
+
+# -------------------------------
+# Image Pipeline
+# -------------------------------
+
+def sanitize_images(sender, instance, raw=False, **kwargs):
+    """
+    Strips the metadata of newly uploaded images and caps their size before
+    they are stored, and remembers them for `process_images`.
+    """
+    if raw:
+        return
+    instance._new_images = []
+    for name in IMAGE_FIELDS[sender]:
+        file = getattr(instance, name)
+        if not file or file._committed:
+            continue
+        cleaned = images.sanitize_upload(file.file)
+        if cleaned is not None:
+            file.file = cleaned
+        instance._new_images.append(name)
+
+
+def process_images(sender, instance, raw=False, **kwargs):
+    """
+    Renders the variants of newly stored images in the background, once the
+    transaction that stored them is committed.
+    """
+    for name in getattr(instance, '_new_images', ()):
+        file = getattr(instance, name)
+        images.forget_urls(file.storage, file.name)
+        transaction.on_commit(lambda file=file: images.schedule(file))
+    instance._new_images = []
+
+
+# -------------------------------
+# Geocoding
+# -------------------------------
+
+def locate_instance(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Geocodes the location of an Event or BikePost before it is saved.
+    """
+    if raw or (update_fields is not None and 'location' not in update_fields):
+        return
+    geo.locate(instance)
+
+
+# -------------------------------
+# Activity Summaries
+# -------------------------------
+# Joins and leaves through `events.participation` bypass these receivers and
+# update the summaries themselves.
+
+def remember_organizer(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Remembers the stored organizer of an Event about to be updated, so that
+    `record_activity` can tell a change of organizer.
+    """
+    if raw or instance._state.adding or (update_fields is not None and 'organizer' not in update_fields):
+        return
+    instance._previous_organizer_id = (
+        Event.objects.filter(pk=instance.pk).values_list('organizer_id', flat=True).first()
+    )
+
+
+def record_activity(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Adds a new event, bike post, comment or participation to the activity
+    summary of its user.
+    """
+    if raw:
+        return
+    if sender is Participation:
+        if created:
+            if instance.status == 'joined':
+                activity.record_join(instance.user_id, instance.event_id)
+        elif activity.ActivitySummary.objects.filter(user_id=instance.user_id).exists():
+            # A status changed outside the participation service
+            activity.rebuild(instance.user_id)
+    elif sender is Event and not created:
+        previous = instance.__dict__.pop('_previous_organizer_id', instance.organizer_id)
+        if previous != instance.organizer_id:
+            # The event moved to another organizer
+            for user_id in (previous, instance.organizer_id):
+                if user_id is not None:
+                    activity.rebuild(user_id)
+    elif created:
+        if sender is Event:
+            activity.record(instance.organizer_id, 'organized', instance.pk, instance.pk, instance.title)
+        elif sender is BikePost:
+            activity.record(instance.posted_by_id, 'post', instance.pk, instance.pk, instance.title)
+        else:
+            title = BikePost.objects.filter(pk=instance.bike_post_id).values_list('title', flat=True).first()
+            activity.record(instance.posted_by_id, 'comment', instance.pk, instance.bike_post_id, title)
+
+
+def forget_activity(sender, instance, **kwargs):
+    """
+    Removes a deleted event, bike post, comment or participation from the
+    activity summary of its user.
+    """
+    if sender is Participation:
+        if instance.status == 'joined':
+            activity.forget(instance.user_id, 'joined', instance.event_id)
+    elif sender is Event:
+        activity.forget(instance.organizer_id, 'organized', instance.pk)
+    elif sender is BikePost:
+        activity.forget(instance.posted_by_id, 'post', instance.pk)
+    else:
+        activity.forget(instance.posted_by_id, 'comment', instance.pk)
+
+
+def connect_signals():
+    """
+    Connects the search index, cache invalidation, image pipeline, geocoding
+    and activity summary receivers.
+    """
+    for model in GEO_MODELS:
+        pre_save.connect(locate_instance, sender=model, dispatch_uid=f'geo-locate-{model._meta.label}')
+    for model in IMAGE_FIELDS:
+        pre_save.connect(sanitize_images, sender=model, dispatch_uid=f'images-sanitize-{model._meta.label}')
+        post_save.connect(process_images, sender=model, dispatch_uid=f'images-process-{model._meta.label}')
+    for model in CACHED_MODELS:
+        post_save.connect(invalidate_cached_lists, sender=model, dispatch_uid=f'cache-save-{model._meta.label}')
+        post_delete.connect(invalidate_cached_lists, sender=model, dispatch_uid=f'cache-delete-{model._meta.label}')
+    for model in search.SOURCES_BY_MODEL:
+        post_save.connect(update_search_entry, sender=model, dispatch_uid=f'search-save-{model._meta.label}')
+        post_delete.connect(delete_search_entry, sender=model, dispatch_uid=f'search-delete-{model._meta.label}')
+    pre_save.connect(remember_organizer, sender=Event, dispatch_uid='activity-organizer')
+    for model in ACTIVITY_MODELS:
+        post_save.connect(record_activity, sender=model, dispatch_uid=f'activity-save-{model._meta.label}')
+        post_delete.connect(forget_activity, sender=model, dispatch_uid=f'activity-delete-{model._meta.label}')
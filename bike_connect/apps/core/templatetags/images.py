@@ -0,0 +1,62 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from .. import images
+
+# Register this module as a template library
+register = template.Library()
+
+# Default `sizes` of every variant: how wide the image is laid out
+DEFAULT_SIZES = {
+    'thumb': '160px',
+    'card': '(min-width: 768px) 33vw, 100vw',
+    'full': '100vw',
+}
+
+
+@register.simple_tag
+def srcset(image, fmt='webp'):
+    """
+    Returns the `srcset` attribute value of a processed image's variants, or ''.
+
+    Usage:
+        <img src="..." srcset="{% srcset event.image 'jpeg' %}" sizes="33vw">
+    """
+    if not image:
+        return ''
+    _, srcsets = images.responsive(image)
+    return srcsets[fmt] if srcsets else ''
+
+
+@register.simple_tag
+def picture(image, variant='card', sizes=None, **attrs):
+    """
+    Renders a responsive <picture> of an uploaded image.
+
+    Browsers pick the smallest WebP (or JPEG) variant matching the layout
+    width, so a 150px card never downloads the full-size original. Images that
+    have not been processed yet are rendered as a plain <img> of the original.
+
+    Args:
+        image: FieldFile or stored file name; renders nothing when empty.
+        variant: Variant used as the `src` fallback ('thumb', 'card', 'full').
+        sizes: `sizes` attribute, defaults to DEFAULT_SIZES[variant].
+        attrs: Attributes of the <img> tag (alt, class, style...).
+
+    Usage:
+        {% picture event.image 'card' alt=event.title class="card-img-top" %}
+    """
+    if not image:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs['src'], srcsets = images.responsive(image, variant)
+    if srcsets is None:
+        return format_html('<img{}>', flatatt(attrs))
+
+    sizes = sizes or DEFAULT_SIZES.get(variant, '100vw')
+    attrs.update(srcset=srcsets['jpeg'], sizes=sizes)
+    return format_html(
+        '<picture><source type="image/webp"{}><img{}></picture>',
+        flatatt({'srcset': srcsets['webp'], 'sizes': sizes}), flatatt(attrs),
+    )
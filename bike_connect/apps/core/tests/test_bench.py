@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from bike_connect.apps.core import bench
+from bike_connect.apps.events.models import Event
+
+
+class BenchHelpersTest(SimpleTestCase):
+    """
+    Tests for the benchmark statistics and baseline comparison.
+    """
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(bench.percentile(values, 50), 50)
+        self.assertEqual(bench.percentile(values, 99), 99)
+        self.assertEqual(bench.percentile([7], 95), 7)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'landing': {'p95_ms': 10.0}, 'gone': {'p95_ms': 1.0}}
+        results = {'landing': {'p95_ms': 13.0}, 'new': {'p95_ms': 2.0}}
+        self.assertEqual(bench.compare(results, baseline, threshold=20), [('landing', 10.0, 13.0, 30.0, True)])
+
+
+class BenchRunTest(TestCase):
+    """
+    Smoke test of seeding and measuring every default target.
+    """
+
+    def test_seed_and_run(self):
+        counts = bench.seed_dataset(users=3, events=12, participations=10, posts=5, comments=5, news=4)
+        self.assertEqual(Event.objects.count(), counts['events'])
+        results = bench.run_benchmarks(requests=2, warmup=1, username='bench0')
+        self.assertEqual(set(results), set(bench.DEFAULT_TARGETS))
+        for row in results.values():
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+            self.assertGreater(row['rps'], 0)
+
+    def test_json_suite_paths_have_equal_payloads(self):
+        bench.seed_dataset(users=3, events=12, participations=0, posts=0, comments=0, news=4)
+        results = bench.run_json_benchmarks(repeat=1)
+        self.assertEqual(results['events_serializer']['payload_bytes'], results['events_fast_json']['payload_bytes'])
+        self.assertEqual(results['news_serializer']['payload_bytes'], results['news_fast_json']['payload_bytes'])
+
+
+class BenchMediaTest(TestCase):
+    """
+    Smoke test of the memoized media URL benchmark.
+    """
+
+    def test_warm_pages_do_no_storage_work(self):
+        results = bench.run_media_benchmarks(cards=3, repeat=2)
+        self.assertEqual(results['cards_cold']['storage_calls_per_page'], 3 * 6)
+        self.assertEqual(results['cards_warm']['storage_calls_per_page'], 0)
+
+
+class BenchConcurrencyTest(TransactionTestCase):
+    """
+    Smoke test of the WSGI vs ASGI comparison (threads need committed data).
+    """
+
+    def test_concurrency_suite(self):
+        bench.seed_dataset(users=1, events=2, participations=0, posts=0, comments=0, news=0)
+        results = bench.run_concurrency_benchmarks('bench0', requests=4, workers=2, concurrency=2, upload_latency=0)
+        self.assertIn('upload_wsgi', results)
+        self.assertIn('upload_asgi', results)
+        for row in results.values():
+            self.assertEqual(row['requests'], 4)
+            self.assertEqual(row['errors'], 0)
@@ -0,0 +1,83 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from bike_connect.cache_urls import parse_cache_url
+
+User = get_user_model()
+
+
+class ParseCacheUrlTest(SimpleTestCase):
+    """
+    Tests for building CACHES entries from URLs.
+    """
+
+    def test_locmem_is_private_per_alias(self):
+        self.assertEqual(parse_cache_url('locmem://', 'sessions'), {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'KEY_PREFIX': 'sessions',
+            'LOCATION': 'sessions',
+        })
+
+    def test_file_with_options(self):
+        config = parse_cache_url('file:///var/tmp/bc?timeout=600&max_entries=5000', 'fragments')
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.filebased.FileBasedCache')
+        self.assertEqual(config['LOCATION'], '/var/tmp/bc')
+        self.assertEqual(config['TIMEOUT'], 600)
+        self.assertEqual(config['OPTIONS'], {'max_entries': 5000})
+
+    def test_redis_and_db(self):
+        self.assertEqual(parse_cache_url('redis://cache:6379/1?timeout=60')['LOCATION'], 'redis://cache:6379/1')
+        self.assertEqual(parse_cache_url('db://shared_cache')['LOCATION'], 'shared_cache')
+
+    def test_unknown_scheme(self):
+        with self.assertRaises(ValueError):
+            parse_cache_url('memcached://localhost')
+
+
+class LocalBackendsTest(TestCase):
+    """
+    Tests that the shared local backends work without any external service.
+    """
+
+    def test_file_and_database_backends(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = {
+                'default': parse_cache_url(f'file://{directory}'),
+                'fragments': parse_cache_url('db://test_cache_table', 'fragments'),
+            }
+            with override_settings(CACHES=config):
+                call_command('createcachetable', verbosity=0)
+                for alias in config:
+                    caches[alias].set('key', [1, 2, 3])
+                    self.assertEqual(caches[alias].get('key'), [1, 2, 3])
+
+
+class CacheStatsAdminTest(TestCase):
+    """
+    Tests for the cache statistics admin page.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='password123', email='a@b.c')
+
+    def test_requires_staff(self):
+        response = self.client.get(reverse('admin_cache_stats'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_lists_named_caches(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_cache_stats'))
+        self.assertEqual(response.status_code, 200)
+        aliases = [cache['alias'] for cache in response.context['caches']]
+        self.assertEqual(aliases, ['default', 'sessions', 'fragments'])
+
+    def test_clear_cache(self):
+        caches['fragments'].set('key', 'value')
+        self.client.force_login(self.admin)
+        self.client.post(reverse('admin_cache_stats'), {'alias': 'fragments'})
+        self.assertIsNone(caches['fragments'].get('key'))
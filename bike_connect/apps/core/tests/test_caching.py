@@ -0,0 +1,129 @@
+import threading
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from bike_connect.apps.core import caching
+from bike_connect.apps.core.caching import cache, cache_stats, cached_list, reset_cache_stats
+from bike_connect.apps.events.models import Event
+
+
+class CachedListTest(TestCase):
+    """
+    Tests for the read-through list cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+
+    def test_rows_are_plain_serialized_data(self):
+        Event.objects.create(title="Ride", description="Ride", location="Sofia", date=date(2025, 5, 1))
+        fetch = lambda: Event.objects.values('id', 'title')
+        rows = cached_list('events', fetch, models=[Event])
+        self.assertEqual(rows[0]['title'], "Ride")
+        self.assertEqual(rows[0].pk, rows[0]['id'])
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_list('events', fetch, models=[Event]), rows)
+
+    def test_empty_results_are_cached(self):
+        fetch = mock.Mock(return_value=[])
+        self.assertEqual(cached_list('nothing', fetch, empty_timeout=30), [])
+        self.assertEqual(cached_list('nothing', fetch, empty_timeout=30), [])
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_saving_a_model_invalidates(self):
+        fetch = lambda: Event.objects.values('id', 'title')
+        self.assertEqual(cached_list('events', fetch, models=[Event]), [])
+        Event.objects.create(title="Ride", description="Ride", location="Sofia", date=date(2025, 5, 1))
+        self.assertEqual(len(cached_list('events', fetch, models=[Event])), 1)
+
+    def test_expired_entry_is_served_while_locked(self):
+        """
+        Test that an expired entry is served stale while another process refreshes it.
+        """
+        fetch = mock.Mock(return_value=[{'id': 1}])
+        cached_list('rides', fetch, timeout=60)
+        key = caching.versioned_key('list', 'rides')
+        cache.add(f'{key}:lock', True)  # Another process is refreshing
+        later = caching.time.time() + 90  # No longer fresh, but still in the cache
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(cached_list('rides', fetch, timeout=60), [{'id': 1}])
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(cache_stats()['rides']['stale'], 1)
+
+
+class CachedListStampedeTest(TransactionTestCase):
+    """
+    Tests that concurrent misses compute a list only once.
+    """
+
+    def test_concurrent_misses_fetch_once(self):
+        cache.clear()
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            threading.Event().wait(0.2)  # A slow query
+            return [{'id': 1}]
+
+        def worker(results):
+            results.append(cached_list('slow', fetch))
+
+        results = []
+        first = threading.Thread(target=worker, args=(results,))
+        first.start()
+        started.wait()
+        others = [threading.Thread(target=worker, args=(results,)) for _ in range(4)]
+        for thread in others:
+            thread.start()
+        for thread in [first, *others]:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[{'id': 1}]] * 5)
+
+
+class CachedListViewsTest(TestCase):
+    """
+    Tests for the list views served from the list cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            Event.objects.create(title=f"Ride {i}", description="Ride", location="Sofia",
+                                 date=date(2025, 1, 1) + timedelta(days=i))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_event_list_is_cached_per_page(self):
+        response = self.client.get(reverse('events:event_list'))
+        next_cursor = response.context['page_obj'].next_cursor
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('events:event_list'))
+        self.assertContains(response, "Ride 11")
+        self.assertEqual(response.context['page_obj'].next_cursor, next_cursor)
+
+        response = self.client.get(reverse('events:event_list'), {'cursor': next_cursor})
+        self.assertEqual([event['title'] for event in response.context['events']], ["Ride 1", "Ride 0"])
+
+    def test_event_list_reflects_changes(self):
+        self.client.get(reverse('events:event_list'))
+        Event.objects.create(title="Brand new ride", description="Ride", location="Sofia", date=date(2026, 1, 1))
+        self.assertContains(self.client.get(reverse('events:event_list')), "Brand new ride")
+
+    def test_default_row_holds_the_loaded_fields(self):
+        class OnlyTitles(caching.CachedListMixin):
+            model = Event
+
+        event = Event.objects.only('title', 'date').get(title="Ride 3")
+        self.assertEqual(OnlyTitles().serialize_row(event), {'id': event.pk, 'title': "Ride 3", 'date': date(2025, 1, 4)})
+        row = OnlyTitles().serialize_row(Event.objects.get(pk=event.pk))
+        self.assertEqual((row['location'], row['image']), ("Sofia", ''))
+
@@ -0,0 +1,117 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.core.models import News, Page
+from bike_connect.apps.core.viewcounts import record_view
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.posts.models import BikePost, Comment
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    """
+    Tests for the ETag / Last-Modified support of detail views and API endpoints.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='rider', password='password123')
+        cls.news = News.objects.create(title="News", content="Text")
+        cls.page = Page.objects.create(title="Rules", slug='rules', content="Ride safe")
+        cls.event = Event.objects.create(title="Ride", description="Long ride", location="Sofia",
+                                         date=date(2030, 1, 1), organizer=cls.user, image="events/ride.jpg")
+        cls.post = BikePost.objects.create(title="Bike", description="Road bike", price=100, posted_by=cls.user)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def assertRevalidates(self, url, **headers):
+        """
+        Fetches the URL, then revalidates it with its ETag and expects a 304.
+        Returns the ETag.
+        """
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, **headers).status_code, 304)
+        return etag
+
+    def assertChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_event_api_list(self):
+        url = reverse('event-list')
+        etag = self.assertRevalidates(url)
+        # A 304 costs only the aggregate query
+        with self.assertNumQueries(1):
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        Event.objects.create(title="Another ride", description="Ride", location="Varna", date=date(2030, 2, 1))
+        self.assertChanged(url, etag)
+
+    def test_event_api_detail_and_update(self):
+        url = reverse('event-detail', args=[self.event.pk])
+        etag = self.assertRevalidates(url)
+        self.event.title = "Renamed ride"
+        self.event.save()
+        self.assertChanged(url, etag)
+
+    def test_news_api_tracks_views(self):
+        list_url = reverse('core:api_news_list')
+        detail_url = reverse('core:api_news_detail', args=[self.news.pk])
+        list_etag, detail_etag = self.assertRevalidates(list_url), self.assertRevalidates(detail_url)
+        record_view(self.news.pk)
+        self.assertChanged(list_url, list_etag)
+        self.assertChanged(detail_url, detail_etag)
+
+    def test_news_detail_records_revalidated_views(self):
+        url = reverse('core:news_detail', args=[self.news.pk])
+        self.assertRevalidates(url)
+        self.assertEqual(News.objects.get(pk=self.news.pk).total_views, 2)
+
+    def test_page_if_modified_since(self):
+        url = reverse('core:page_detail', args=['rules'])
+        response = self.client.get(url)
+        self.assertContains(response, "Ride safe")
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_event_detail_tracks_participation(self):
+        self.client.force_login(self.user)
+        url = reverse('events:event_detail', args=[self.event.pk])
+        etag = self.assertRevalidates(url)
+        Participation.objects.create(user=self.user, event=self.event)
+        self.assertChanged(url, etag)
+
+    def test_event_detail_varies_on_user(self):
+        url = reverse('events:event_detail', args=[self.event.pk])
+        etag = self.assertRevalidates(url)
+        self.client.force_login(self.user)
+        self.assertChanged(url, etag)
+
+    def test_post_detail_tracks_comments(self):
+        self.client.force_login(self.user)
+        url = reverse('posts:bikepost_detail', args=[self.post.pk])
+        etag = self.assertRevalidates(url)
+        Comment.objects.create(text="Still available?", bike_post=self.post, posted_by=self.user)
+        self.assertChanged(url, etag)
+
+    def test_pending_message_is_not_swallowed(self):
+        self.client.force_login(self.user)
+        url = reverse('posts:bikepost_detail', args=[self.post.pk])
+        etag = self.client.get(url)['ETag']
+        response = self.client.post(url, {'text': "Nice bike"}, follow=True)
+        self.assertContains(response, "Your comment has been added.")
+        # The comment changed the validators anyway; a stale ETag never matches
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_object_is_404(self):
+        response = self.client.get(reverse('event-detail', args=[0]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+import dj_database_url
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from bike_connect.db_pool import configure_database, pool_stats
+
+User = get_user_model()
+
+
+class ConfigureDatabaseTest(SimpleTestCase):
+    """
+    Tests for the pooled DATABASES entries.
+    """
+
+    def test_postgresql_is_pooled(self):
+        database = configure_database(
+            dj_database_url.parse('postgres://bike:secret@db:5432/bike', conn_max_age=600),
+            min_size=1, max_size=4, timeout=2.5,
+        )
+        pool = database['OPTIONS']['pool']
+        self.assertEqual((pool['min_size'], pool['max_size'], pool['timeout']), (1, 4, 2.5))
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        # Django refuses persistent connections together with a pool
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        # The pool is built lazily, without connecting
+        wrapper = ConnectionHandler({'default': {}, 'pooled': database})['pooled']
+        self.addCleanup(wrapper.close_pool)
+        self.assertEqual((wrapper.pool.min_size, wrapper.pool.max_size), (1, 4))
+        self.assertIsNotNone(wrapper.pool._check)
+
+    def test_health_checks_without_a_pool(self):
+        database = configure_database(
+            dj_database_url.parse('postgres://bike:secret@db:5432/bike', conn_max_age=600), pool=False,
+        )
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+        self.assertEqual(database['CONN_MAX_AGE'], 600)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+    def test_sqlite_fallback(self):
+        database = configure_database(dj_database_url.parse('sqlite:///:memory:'), health_checks=False)
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+
+
+class PoolStatsTest(TestCase):
+    """
+    Tests for the pool usage metrics.
+    """
+
+    def test_unpooled_databases(self):
+        self.assertEqual(pool_stats()['default'], {'pooled': False, 'vendor': connection.vendor})
+
+    def test_pool_counters(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {'pool_size': 3, 'pool_available': 2, 'requests_num': 40}
+        options = {**connection.settings_dict.get('OPTIONS', {}), 'pool': {'max_size': 4}}
+        with mock.patch.dict(connection.settings_dict, {'OPTIONS': options}), \
+                mock.patch.object(type(connections['default']), 'pool', new_callable=mock.PropertyMock, create=True) as prop:
+            prop.return_value = pool
+            stats = pool_stats()['default']
+        self.assertEqual((stats['pool_size'], stats['pool_available'], stats['requests_num']), (3, 2, 40))
+        self.assertEqual(stats['requests_waiting'], 0)
+
+    def test_admin_page_lists_connections(self):
+        admin = User.objects.create_superuser(username='admin', password='password123', email='a@example.com')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin_cache_stats'))
+        self.assertContains(response, 'Not pooled')
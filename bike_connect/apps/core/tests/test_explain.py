@@ -0,0 +1,46 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from bike_connect.apps.core import bench
+from bike_connect.apps.core.explain import explain_hot_queries, plan_problems
+
+
+class PlanProblemsTest(SimpleTestCase):
+    """
+    Tests for spotting sequential scans and sorts in query plans.
+    """
+
+    def test_sqlite(self):
+        plan = (
+            "2 0 0 SCAN events_event\n"
+            "5 0 0 SCAN posts_bikepost USING INDEX bikepost_created_idx\n"
+            "7 0 0 SCAN core_news USING COVERING INDEX news_created_idx\n"
+            "9 0 0 SEARCH users_customuser USING INTEGER PRIMARY KEY (rowid=?)\n"
+            "12 0 0 USE TEMP B-TREE FOR ORDER BY"
+        )
+        self.assertEqual(plan_problems(plan, 'sqlite'), [('seq scan', 'events_event'), ('sort', '')])
+
+    def test_postgresql(self):
+        plan = (
+            "Limit  (cost=0.28..1.02 rows=11 width=72)\n"
+            "  ->  Sort  (cost=10.1..10.2 rows=30 width=72)\n"
+            "        ->  Seq Scan on core_news  (cost=0.00..9.30 rows=30 width=72)\n"
+            "  ->  Index Scan using event_date_idx on events_event  (cost=0.28..8.30 rows=1 width=4)"
+        )
+        self.assertEqual(plan_problems(plan, 'postgresql'), [('seq scan', 'core_news'), ('sort', '')])
+
+
+@skipUnless(connection.vendor == 'sqlite', "Plans are checked on SQLite")
+class HotQueryIndexTest(TestCase):
+    """
+    The list pages read their rows in index order, without scanning or sorting.
+    """
+
+    def test_list_pages_use_indexes(self):
+        bench.seed_dataset(users=5, events=60, participations=80, posts=40, comments=60, news=40)
+        results = {name: problems for name, _, problems in explain_hot_queries()}
+        for name in ('event_list', 'event_api_next', 'landing_events', 'news_list', 'news_api_next',
+                     'bikepost_list', 'bikepost_list_category_next', 'bikepost_comments'):
+            self.assertEqual(results[name], [], name)
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from bike_connect.apps.core.models import News
+from bike_connect.apps.core.viewcounts import record_view
+from bike_connect.apps.events.models import Event
+
+User = get_user_model()
+
+
+class FastJSONTest(TestCase):
+    """
+    The fast JSON path must produce exactly the bytes of the serializer path.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create_user(username='organizer', password='password123')
+        for i in range(12):
+            Event.objects.create(
+                title=f"Ride {i} ü", description="Long ride   " * 30, location="Sofia",
+                date=date.today() + timedelta(days=i), organizer=organizer if i % 3 else None,
+                image='events/ride.jpg' if i % 2 else '',
+            )
+        for i in range(12):
+            News.objects.create(title=f"News {i}", content="Text «quoted»\u2028line", tags='a,b', views=i)
+        cls.news = News.objects.first()
+
+    def assertSameBytes(self, url, data=None):
+        fast = self.client.get(url, data)
+        with override_settings(FAST_JSON_API=False):
+            regular = self.client.get(url, data)
+        self.assertEqual(fast.status_code, regular.status_code)
+        self.assertEqual(fast.content, regular.content)
+        for use_orjson in (True, False):
+            with override_settings(FAST_JSON_USE_ORJSON=use_orjson):
+                self.assertEqual(self.client.get(url, data).content, regular.content)
+        return fast
+
+    def test_event_list(self):
+        response = self.assertSameBytes(reverse('event-list'))
+        # Follow the cursor to check the next page too
+        self.assertSameBytes(response.json()['next'])
+
+    def test_event_list_sparse_fieldset(self):
+        self.assertSameBytes(reverse('event-list'), {'fields': 'id,excerpt,organizer'})
+
+    def test_event_detail(self):
+        for event in Event.objects.all()[:3]:
+            self.assertSameBytes(reverse('event-detail', args=[event.pk]))
+        self.assertSameBytes(reverse('event-detail', args=[0]))
+
+    def test_news_list_includes_buffered_views(self):
+        record_view(self.news.pk)
+        self.assertSameBytes(reverse('core:api_news_list'), {'with_count': 1})
+
+    def test_news_detail(self):
+        self.assertSameBytes(reverse('core:api_news_detail', args=[self.news.pk]))
+
+    def test_one_query_per_list(self):
+        # Plus the ETag aggregate
+        with self.assertNumQueries(2):
+            self.client.get(reverse('event-list'))
+
+    def test_browsable_api_uses_serializers(self):
+        response = self.client.get(reverse('event-list'), HTTP_ACCEPT='text/html')
+        self.assertContains(response, 'Ride')
@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bike_connect.apps.core.caching import cache, cache_stats, reset_cache_stats
+from bike_connect.apps.core.models import News
+from bike_connect.apps.events.models import Event, Participation
+
+User = get_user_model()
+
+
+class LandingPageFragmentCacheTest(TestCase):
+    """
+    Tests for the cached fragments of the landing page.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.events = [
+            Event.objects.create(title=f"Ride {i}", description="Ride", location="Sofia",
+                                 date=date.today() + timedelta(days=i))
+            for i in range(3)
+        ]
+        News.objects.create(title="Fresh news", content="Content")
+
+    def test_warm_cache_runs_no_content_queries(self):
+        """
+        Test that a warm landing page does not query events or news for anonymous users.
+        """
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, "Fresh news")
+        self.assertContains(response, "Ride 2")
+        tables = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('events_event', tables)
+        self.assertNotIn('core_news', tables)
+
+    def test_hits_and_misses_are_counted(self):
+        self.client.get(reverse('home'))
+        self.client.get(reverse('home'))
+        self.assertEqual(cache_stats()['landing:news'], {'hits': 1, 'misses': 1, 'stale': 0})
+        self.assertEqual(cache_stats()['landing:events'], {'hits': 1, 'misses': 1, 'stale': 0})
+
+    def test_saving_invalidates_fragments(self):
+        """
+        Test that saving an Event or a News article re-renders the matching fragment.
+        """
+        self.client.get(reverse('home'))
+        self.events[0].title = "Renamed ride"
+        self.events[0].save()
+        News.objects.create(title="Breaking news", content="Content")
+
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, "Renamed ride")
+        self.assertContains(response, "Breaking news")
+        self.assertEqual(cache_stats()['landing:hero'], {'hits': 1, 'misses': 1, 'stale': 0})
+
+    def test_participation_badge_is_per_user(self):
+        """
+        Test that the cached events fragment only shows the badge to users who joined.
+        """
+        user = User.objects.create_user(username='rider', password='password123')
+        Participation.objects.create(user=user, event=self.events[1])
+
+        response = self.client.get(reverse('home'))
+        self.assertNotContains(response, ">Joined<")
+
+        self.client.login(username='rider', password='password123')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, ">Joined<", count=1)
+        self.assertEqual(cache_stats()['landing:events'], {'hits': 1, 'misses': 1, 'stale': 0})
@@ -0,0 +1,163 @@
+import random
+from datetime import date, timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from bike_connect.apps.core import bench, geo
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.posts.models import BikePost
+
+User = get_user_model()
+
+SOFIA = (42.6977, 23.3219)
+
+
+class GeohashTest(SimpleTestCase):
+    """
+    Tests for geohashes and the cells covering a radius.
+    """
+
+    def test_encode(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(geo.encode(*SOFIA, precision=4), geo.encode(*SOFIA)[:4])
+
+    def test_cells_cover_the_circle(self):
+        rng = random.Random(1)
+        for latitude, longitude, radius in [(*SOFIA, 25), (0.0, 179.9, 50), (-33.9, 151.2, 300), (89.5, 0.0, 100)]:
+            box = geo.bounding_box(latitude, longitude, radius)
+            cells = geo.covering_cells(*box)
+            self.assertLessEqual(len(cells), geo.MAX_CELLS)
+            for _ in range(200):
+                point = (rng.uniform(box[0], box[2]), rng.uniform(box[1], box[3]))
+                point = (point[0], (point[1] + 180) % 360 - 180)
+                if geo.haversine(latitude, longitude, *point) <= radius:
+                    self.assertTrue(any(geo.encode(*point).startswith(cell) for cell in cells), point)
+
+    def test_prefix_end(self):
+        self.assertEqual(geo._prefix_end('sx8'), 'sx9')
+        self.assertEqual(geo._prefix_end('szz'), 't')
+        self.assertIsNone(geo._prefix_end('zz'))
+
+
+class GeocodeTest(SimpleTestCase):
+    """
+    Tests for the offline gazetteer lookup and the distance query parameters.
+    """
+
+    def test_geocode(self):
+        self.assertEqual(geo.geocode('Sofia'), SOFIA)
+        self.assertEqual(geo.geocode('  софия '), SOFIA)
+        self.assertEqual(geo.geocode('Sofia city centre'), SOFIA)
+        self.assertEqual(geo.geocode('Vitosha, Sofia'), geo.geocode('Vitosha'))
+        self.assertEqual(geo.geocode('Veliko Turnovo'), geo.geocode('Велико Търново'))
+        self.assertIsNone(geo.geocode('Atlantis'))
+        self.assertIsNone(geo.geocode(None))
+
+    def test_parse_geo_query(self):
+        self.assertIsNone(geo.parse_geo_query({}))
+        self.assertEqual(
+            geo.parse_geo_query({'near': 'Sofia', 'nearest': '5'}),
+            {'latitude': SOFIA[0], 'longitude': SOFIA[1], 'radius': geo.DEFAULT_RADIUS_KM, 'nearest': 5},
+        )
+        self.assertEqual(geo.parse_geo_query({'lat': '42.1', 'lon': '24.7', 'radius': '10'})['radius'], 10)
+        for params in ({'near': 'Atlantis'}, {'lat': '42'}, {'lat': '91', 'lon': '0'},
+                       {'near': 'Sofia', 'radius': '0'}, {'near': 'Sofia', 'radius': 'nan'},
+                       {'near': 'Sofia', 'nearest': '500'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                geo.parse_geo_query(params)
+
+
+class DistanceQueryTest(TestCase):
+    """
+    Tests for geocoding on save and the radius / nearest queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='rider', password='password123')
+        cls.events = {
+            location: Event.objects.create(
+                title=f"Ride in {location}", description="Group ride", location=location,
+                date=date.today() + timedelta(days=i), organizer=cls.user,
+            )
+            for i, location in enumerate(['Sofia', 'Pernik', 'Plovdiv', 'Varna', 'Atlantis'])
+        }
+
+    def test_geocoded_on_save(self):
+        event = self.events['Plovdiv']
+        self.assertEqual((event.latitude, event.longitude), geo.geocode('Plovdiv'))
+        self.assertEqual(event.geohash, geo.encode(event.latitude, event.longitude))
+        self.assertEqual(self.events['Atlantis'].geohash, '')
+
+        event.location = 'Atlantis'
+        event.save()
+        event.refresh_from_db()
+        self.assertEqual((event.latitude, event.longitude, event.geohash), (None, None, ''))
+
+    def test_within(self):
+        events = geo.within(Event.objects.all(), *SOFIA, 40).order_by('distance')
+        self.assertEqual([event.location for event in events], ['Sofia', 'Pernik'])
+        self.assertAlmostEqual(events[1].distance, geo.haversine(*SOFIA, *geo.geocode('Pernik')), places=6)
+
+    def test_nearest(self):
+        events = geo.nearest(Event.objects.all(), *geo.geocode('Varna'), 3)
+        self.assertEqual([event.location for event in events], ['Varna', 'Plovdiv', 'Sofia'])
+        # Fewer rows than asked for: every located row, closest first
+        self.assertEqual(len(geo.nearest(Event.objects.all(), *SOFIA, 10)), 4)
+
+    @skipUnless(connection.vendor == 'sqlite', "Plans are checked on SQLite")
+    def test_radius_reads_the_geohash_index(self):
+        bench.seed_dataset(users=2, events=300, participations=0, posts=0, comments=0, news=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.assertIn('event_geohash_idx', geo.within(Event.objects.order_by(), *SOFIA, 25).explain())
+
+    def test_event_list(self):
+        response = self.client.get(reverse('events:event_list'), {'near': 'Sofia', 'radius': '40'})
+        self.assertEqual([event['location'] for event in response.context['events']], ['Pernik', 'Sofia'])
+        self.assertContains(response, 'km away')
+
+        response = self.client.get(reverse('events:event_list'), {'near': 'Varna', 'nearest': '2'})
+        self.assertEqual([event.location for event in response.context['events']], ['Varna', 'Plovdiv'])
+        self.assertFalse(response.context['is_paginated'])
+
+    def test_api(self):
+        url = reverse('event-list')
+        results = self.client.get(url, {'near': 'Varna', 'nearest': '2'}).json()
+        self.assertEqual([event['location'] for event in results], ['Varna', 'Plovdiv'])
+        self.assertEqual(results[0]['distance'], 0)
+
+        page = self.client.get(url, {'lat': SOFIA[0], 'lon': SOFIA[1], 'radius': '40'}).json()
+        self.assertEqual({event['location'] for event in page['results']}, {'Sofia', 'Pernik'})
+        self.assertIsNone(self.client.get(url).json()['results'][0]['distance'])
+
+        detail = self.client.get(reverse('event-detail', args=[self.events['Plovdiv'].pk]), {'near': 'Sofia'}).json()
+        self.assertAlmostEqual(detail['distance'], geo.haversine(*SOFIA, *geo.geocode('Plovdiv')), places=6)
+
+        self.assertEqual(self.client.get(url, {'near': 'Atlantis'}).status_code, 400)
+
+    def test_bike_post_location_filter(self):
+        self.client.force_login(self.user)
+        for location in ('Sofia', 'Pernik', 'Varna', 'Atlantis'):
+            BikePost.objects.create(
+                title=f"Bike in {location}", description="Steel frame", category='sell', location=location,
+                posted_by=self.user,
+            )
+        url = reverse('posts:bikepost_list')
+        response = self.client.get(url, {'location': 'Sofia', 'radius': '40'})
+        self.assertEqual({post['location'] for post in response.context['bike_posts']}, {'Sofia', 'Pernik'})
+        # Places the gazetteer does not know are matched as text
+        response = self.client.get(url, {'location': 'atlan'})
+        self.assertEqual([post['location'] for post in response.context['bike_posts']], ['Atlantis'])
+
+    def test_geocode_locations_command(self):
+        Event.objects.update(latitude=None, longitude=None, geohash='')
+        call_command('geocode_locations', stdout=StringIO())
+        self.assertEqual(Event.objects.filter(latitude__isnull=False).count(), 4)
+        self.assertEqual(Event.objects.get(location='Varna').geohash, geo.encode(*geo.geocode('Varna')))
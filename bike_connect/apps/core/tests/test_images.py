@@ -0,0 +1,199 @@
+import io
+import shutil
+import struct
+import tempfile
+import zlib
+from datetime import date
+from unittest import mock
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from bike_connect.apps.core import images
+from bike_connect.apps.core.models import ImageManifest
+from bike_connect.apps.events.models import Event
+
+
+def make_upload(size=(3200, 2400), fmt='JPEG', name='ride.jpg', exif=True):
+    """
+    Returns an uploaded image, tagged with a GPS position like a phone photo.
+    """
+    image = Image.new('RGB', size, 'red')
+    output = io.BytesIO()
+    options = {}
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = 'PhoneMaker'  # Make
+        metadata[0x8825] = {1: 'N', 2: (42.0, 41.0, 0.0)}  # GPSInfo
+        options['exif'] = metadata
+    image.save(output, fmt, **options)
+    return SimpleUploadedFile(name, output.getvalue(), content_type=f'image/{fmt.lower()}')
+
+
+def make_bomb(size=(20000, 20000)):
+    """
+    Returns a PNG upload of a few bytes whose header claims a huge image.
+    """
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', *size, 8, 2, 0, 0, 0)  # 8-bit RGB
+    data = b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(b'')) + chunk(b'IEND', b'')
+    return SimpleUploadedFile('bomb.png', data, content_type='image/png')
+
+
+class ImagePipelineTest(TestCase):
+    """
+    Tests for upload sanitizing, variant rendering and the responsive template tags.
+    """
+
+    def setUp(self):
+        images.manifest_cache().clear()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        storages = {**settings.STORAGES, 'media': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': self.media, 'base_url': '/media/'},
+        }}
+        self.enterContext(override_settings(STORAGES=storages, IMAGE_PROCESSING_EAGER=True))
+
+    def create_event(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Event.objects.create(
+                title="Ride", description="Ride", location="Sofia", date=date(2025, 5, 1), image=upload,
+            )
+
+    def test_upload_is_stripped_and_capped(self):
+        event = self.create_event(make_upload())
+        with event.image.storage.open(event.image.name) as file, Image.open(file) as stored:
+            self.assertEqual(max(stored.size), settings.IMAGE_MAX_DIMENSION)
+            self.assertEqual(len(stored.getexif()), 0)
+
+    def test_variants_are_rendered(self):
+        event = self.create_event(make_upload())
+        manifest = images.get_manifest(event.image)
+        self.assertEqual(set(manifest['variants']), set(images.VARIANTS))
+        card = manifest['variants']['card']
+        self.assertEqual((card['width'], card['height']), (480, 360))
+        for fmt in images.FORMATS:
+            self.assertTrue(event.image.storage.exists(card[fmt]))
+
+    def test_small_images_are_not_upscaled(self):
+        event = self.create_event(make_upload(size=(100, 80), fmt='PNG', name='logo.png', exif=False))
+        full = images.get_manifest(event.image)['variants']['full']
+        self.assertEqual((full['width'], full['height']), (100, 80))
+
+    def test_picture_tag(self):
+        event = self.create_event(make_upload())
+        html = Template("{% load images %}{% picture image 'card' alt='Ride' %}").render(Context({'image': event.image}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn('__card.jpg', html)
+        self.assertIn('480w', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_unprocessed_images_fall_back_to_the_original(self):
+        with self.settings(IMAGE_PROCESSING_EAGER=False):
+            images.media_storage().save('events/old.jpg', make_upload())
+        html = Template("{% load images %}{% picture 'events/old.jpg' %}").render(Context())
+        self.assertEqual(html, '<img loading="lazy" src="/media/events/old.jpg">')
+
+    def test_warm_page_does_no_storage_work(self):
+        event = self.create_event(make_upload())
+        template = Template("{% load images %}{% picture image 'card' %}")
+        template.render(Context({'image': event.image}))
+        with mock.patch.object(type(event.image.storage), 'url') as url:
+            template.render(Context({'image': event.image}))
+        url.assert_not_called()
+
+    def test_delete_image_removes_variants(self):
+        event = self.create_event(make_upload())
+        card = images.get_manifest(event.image)['variants']['card']['webp']
+        images.delete_image(event.image)
+        self.assertFalse(images.media_storage().exists(card))
+        self.assertIsNone(images.get_manifest(event.image))
+
+    def test_manifest_outlives_the_cache(self):
+        event = self.create_event(make_upload())
+        card = images.get_manifest(event.image)['variants']['card']['webp']
+        images.manifest_cache().clear()
+        self.assertEqual(images.get_manifest(event.image)['variants']['card']['webp'], card)
+        images.manifest_cache().clear()
+        images.delete_image(event.image)
+        self.assertFalse(images.media_storage().exists(card))
+        self.assertFalse(ImageManifest.objects.exists())
+
+    def test_process_images_command_backfills(self):
+        name = images.media_storage().save('events/legacy.jpg', make_upload(exif=False))
+        Event.objects.filter(pk=self.create_event(None).pk).update(image=name)
+        call_command('process_images', stdout=io.StringIO())
+        self.assertIsNotNone(images.get_manifest(name))
+
+
+class ValidateImageTest(TestCase):
+    """
+    Tests for the upload limits.
+    """
+
+    @override_settings(IMAGE_MAX_UPLOAD_BYTES=1024)
+    def test_rejects_large_files(self):
+        with self.assertRaises(ValidationError):
+            images.validate_image(make_upload(size=(400, 400)))
+
+    @override_settings(IMAGE_MAX_PIXELS=10_000)
+    def test_rejects_large_dimensions(self):
+        with self.assertRaises(ValidationError):
+            images.validate_image(make_upload(size=(200, 200), exif=False))
+
+    def test_rejects_decompression_bombs(self):
+        bomb = make_bomb()
+        for check in (images.validate_image, images.sanitize_upload):
+            with self.subTest(check=check.__name__):
+                with self.assertRaisesMessage(ValidationError, "megapixels"):
+                    check(bomb)
+
+    def test_rejects_non_images(self):
+        with self.assertRaises(ValidationError):
+            images.validate_image(SimpleUploadedFile('ride.jpg', b'not an image'))
+
+
+class StorageURLTest(TestCase):
+    """
+    Tests for the memoized storage URLs.
+    """
+
+    def setUp(self):
+        images.clear_url_cache()
+        self.addCleanup(images.clear_url_cache)
+        self.storage = mock.Mock()
+        self.storage.url.side_effect = lambda name: f'/media/{name}'
+
+    def test_urls_are_memoized(self):
+        self.assertEqual(images.storage_url(self.storage, 'a.jpg'), '/media/a.jpg')
+        self.assertEqual(images.storage_url(self.storage, 'a.jpg'), '/media/a.jpg')
+        self.assertEqual(self.storage.url.call_count, 1)
+
+    def test_forget_urls(self):
+        images.storage_url(self.storage, 'a.jpg')
+        images.forget_urls(self.storage, 'a.jpg')
+        images.storage_url(self.storage, 'a.jpg')
+        self.assertEqual(self.storage.url.call_count, 2)
+
+    @override_settings(IMAGE_URL_CACHE_SIZE=2)
+    def test_least_recently_used_are_evicted(self):
+        for name in ('a.jpg', 'b.jpg', 'a.jpg', 'c.jpg'):
+            images.storage_url(self.storage, name)
+        self.storage.url.reset_mock()
+        images.storage_url(self.storage, 'a.jpg')
+        images.storage_url(self.storage, 'b.jpg')
+        self.assertEqual([c.args[0] for c in self.storage.url.call_args_list], ['b.jpg'])
+
+    @override_settings(IMAGE_URL_CACHE_TIMEOUT=0)
+    def test_expired_urls_are_rebuilt(self):
+        images.storage_url(self.storage, 'a.jpg')
+        images.storage_url(self.storage, 'a.jpg')
+        self.assertEqual(self.storage.url.call_count, 2)
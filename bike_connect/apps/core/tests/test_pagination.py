@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bike_connect.apps.core.models import News
+from bike_connect.apps.core.pagination import (
+    InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor,
+)
+from bike_connect.apps.events.models import Event
+
+
+class KeysetPaginatorTest(TestCase):
+    """
+    Tests for the keyset paginator.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Several events share a date so that ties are broken by id
+        for i in range(23):
+            Event.objects.create(
+                title=f"Ride {i}", description="Ride", location="Sofia",
+                date=date(2025, 1, 1) + timedelta(days=i // 3),
+            )
+        cls.expected = list(Event.objects.order_by('-date', '-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.paginator = KeysetPaginator(Event.objects.all(), 5, ('-date', '-id'))
+
+    def test_cursor_round_trip(self):
+        token = encode_cursor([date(2025, 1, 1), 7], backwards=True)
+        self.assertEqual(decode_cursor(token), (['2025-01-01', 7], True))
+
+    def test_walk_forward_and_back(self):
+        """
+        Test that following the cursors visits every row once, in both directions.
+        """
+        pages, page = [], self.paginator.page()
+        while True:
+            pages.append([event.id for event in page])
+            if not page.has_next():
+                break
+            page = self.paginator.page(page.next_cursor)
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertFalse(self.paginator.page().has_previous())
+
+        # Walk back from the last page
+        for expected_ids in reversed(pages[:-1]):
+            page = self.paginator.page(page.previous_cursor)
+            self.assertEqual([event.id for event in page], expected_ids)
+        self.assertFalse(page.has_previous())
+
+    def test_deep_page_costs_the_same_as_first(self):
+        """
+        Test that no page runs a COUNT and every page is a single query.
+        """
+        page = self.paginator.page()
+        with self.assertNumQueries(1):
+            self.paginator.page()
+        for _ in range(3):
+            page = self.paginator.page(page.next_cursor)
+        with CaptureQueriesContext(connection) as context:
+            self.paginator.page(page.next_cursor)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('COUNT(', context.captured_queries[0]['sql'].upper())
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.paginator.page('not-a-cursor')
+        with self.assertRaises(InvalidCursor):
+            self.paginator.page(encode_cursor(['not-a-date', 1]))
+        # get_page is lenient and falls back to the first page
+        self.assertEqual(self.paginator.get_page('not-a-cursor')[0].id, self.expected[0])
+
+    def test_approximate_count_is_cached(self):
+        cache.clear()
+        self.assertEqual(self.paginator.count, 23)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.paginator.count, 23)
+
+
+class KeysetPaginationViewsTest(TestCase):
+    """
+    Tests for the keyset pagination of the HTML views and the API endpoints.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            Event.objects.create(title=f"Ride {i}", description="Ride", location="Sofia",
+                                 date=date(2025, 1, 1) + timedelta(days=i))
+            News.objects.create(title=f"News {i}", content="Content")
+
+    def test_event_list_next_page(self):
+        response = self.client.get(reverse('events:event_list'))
+        page = response.context['page_obj']
+        self.assertTrue(page.has_next())
+        response = self.client.get(reverse('events:event_list'), {'cursor': page.next_cursor})
+        self.assertEqual(len(response.context['events']), 2)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('core:news_list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_news_api_is_cursor_paginated(self):
+        response = self.client.get(reverse('core:api_news_list'), {'with_count': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+
+    def test_events_api_is_cursor_paginated(self):
+        response = self.client.get(reverse('event-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
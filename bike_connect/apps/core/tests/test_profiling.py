@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from bike_connect.apps.core.profiling import (
+    QueryBudget, QueryBudgetExceeded, QueryBudgetTestMixin, QueryRecorder,
+)
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.events.views import EventListView
+
+User = get_user_model()
+
+
+class QueryRecorderTest(TestCase):
+    """
+    Tests for recording queries and spotting duplicates.
+    """
+
+    def test_duplicates_ignore_parameters(self):
+        with QueryRecorder() as recorder:
+            for pk in (1, 2, 3):
+                Event.objects.filter(pk=pk).first()
+            User.objects.count()
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(list(recorder.duplicates.values()), [3])
+        self.assertEqual(QueryBudget(max_duplicates=0).violations(recorder), ["2 duplicated queries (budget 0)"])
+
+
+@override_settings(QUERY_PROFILING=True)
+class QueryProfilingMiddlewareTest(QueryBudgetTestMixin, TestCase):
+    """
+    Tests for the query profiling middleware and the declared view budgets.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='rider', password='password123')
+        for i in range(12):
+            event = Event.objects.create(title=f"Ride {i}", description="Ride", location="Sofia",
+                                         date=date.today() + timedelta(days=i))
+            if i % 2:
+                Participation.objects.create(user=cls.user, event=event)
+
+    def setUp(self):
+        self.clear_caches()
+
+    def clear_caches(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def test_server_timing_header_and_log_line(self):
+        with self.assertLogs('bike_connect.queries', level='INFO') as logs:
+            response = self.client.get(reverse('events:event_list'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('"view": "events:event_list"', logs.output[0])
+
+    def test_views_stay_within_budget(self):
+        """
+        Test that cold renders, anonymous and authenticated, stay within budget.
+        """
+        for login in (False, True):
+            if login:
+                self.client.force_login(self.user)
+            for url in (reverse('home'), reverse('events:event_list')):
+                self.clear_caches()
+                self.assertWithinQueryBudget(url)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_exceeding_the_budget_raises(self):
+        with mock.patch.object(EventListView, 'query_budget', QueryBudget(max_queries=0)):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('events:event_list'))
+
+    def test_exceeding_the_budget_logs_by_default(self):
+        with mock.patch.object(EventListView, 'query_budget', QueryBudget(max_queries=0)):
+            with self.assertLogs('bike_connect.queries', level='WARNING'):
+                self.client.get(reverse('events:event_list'))
@@ -0,0 +1,102 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connections, router
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bike_connect.apps.core.caching import cache, read_through
+from bike_connect.apps.core.replicas import PIN_COOKIE, reading_from_primary, reading_from_replica
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.posts.models import BikePost
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaRouterTest(SimpleTestCase):
+    """
+    Tests for routing reads to the replica.
+    """
+
+    def test_reads_follow_the_block(self):
+        self.assertEqual(Event.objects.all().db, 'default')
+        with reading_from_replica():
+            self.assertEqual(Event.objects.all().db, 'replica')
+            with reading_from_primary():
+                self.assertEqual(Event.objects.all().db, 'default')
+            # Sessions authenticate the request and are always read from the primary
+            self.assertEqual(Session.objects.all().db, 'default')
+            self.assertEqual(router.db_for_write(Event), 'default')
+        self.assertEqual(Event.objects.all().db, 'default')
+
+    def test_replica_is_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica', 'events'))
+        self.assertTrue(router.allow_migrate('default', 'events'))
+
+    @override_settings(DATABASE_REPLICA_ALIAS='')
+    def test_without_a_replica(self):
+        with reading_from_replica():
+            self.assertEqual(Event.objects.all().db, 'default')
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaViewsTest(TransactionTestCase):
+    """
+    Tests for answering safe requests from the replica, and pinning clients
+    to the primary after they write.
+
+    The replica mirrors the test database; a transaction test case commits,
+    so both connections see the same rows.
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.event = Event.objects.create(title="Ride", description="Ride", date=date.today(), location="Sofia")
+        self.post = BikePost.objects.create(
+            title="Frame", description="Steel frame", category='sell', posted_by=self.user,
+        )
+
+    def get_queries(self, url, **cookies):
+        self.client.cookies.load(cookies)
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_api_reads_from_replica(self):
+        primary, replica = self.get_queries(reverse('event-list'))
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_cache_misses_read_from_primary(self):
+        with reading_from_replica():
+            database = read_through('replica-test', 'replica-test', lambda: Event.objects.all().db, 60)
+        self.assertEqual(database, 'default')
+
+    def test_writes_pin_to_primary(self):
+        self.client.force_login(self.user)
+        writes = [
+            (reverse('events:join_event', args=[self.event.pk]), {}),
+            (reverse('events:event_create'), {'title': "New ride"}),
+            (reverse('posts:bikepost_detail', args=[self.post.pk]), {'text': "Still for sale?"}),
+        ]
+        for url, data in writes:
+            with self.subTest(url=url):
+                self.client.cookies.pop(PIN_COOKIE, None)
+                response = self.client.post(url, data)
+                self.assertIn(PIN_COOKIE, response.cookies)
+
+        primary, replica = self.get_queries(reverse('event-list'))
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_expired_pin(self):
+        primary, replica = self.get_queries(reverse('event-list'), **{PIN_COOKIE: str(int(time.time()) - 1)})
+        self.assertGreater(replica, 0)
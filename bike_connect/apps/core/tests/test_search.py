@@ -0,0 +1,79 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.core.models import News, SearchEntry
+from bike_connect.apps.core.search import filter_queryset, search
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.posts.models import BikePost
+
+User = get_user_model()
+
+
+class SearchIndexTest(TestCase):
+    """
+    Tests for the full-text search index and the unified search API.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.gravel_event = Event.objects.create(
+            title="Gravel Sunday", description="Easy loop", date=date.today(), location="Vitosha")
+        self.road_event = Event.objects.create(
+            title="Road climb", description="Bring gravel tyres", date=date.today(), location="Rila")
+        self.news = News.objects.create(title="Gravel season opens", content="Trails are dry")
+        self.post = BikePost.objects.create(
+            title="Selling gravel bike", description="Barely used", posted_by=self.user)
+
+    def test_entries_follow_saves_and_deletes(self):
+        self.assertEqual(SearchEntry.objects.count(), 4)
+        self.road_event.title = "Road sprint"
+        self.road_event.save()
+        self.assertTrue(SearchEntry.objects.filter(kind='event', title="Road sprint").exists())
+        self.road_event.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind='event', title="Road sprint").exists())
+
+    def test_unpublished_news_is_not_indexed(self):
+        self.news.is_published = False
+        self.news.save()
+        self.assertEqual([entry.kind for entry in search("season")], [])
+
+    def test_search_is_ranked_across_models(self):
+        """
+        Test that title matches rank above body matches and all models are searched.
+        """
+        results = search("gravel")
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[-1].object_id, self.road_event.pk)  # Only matched in the body
+        self.assertEqual({entry.kind for entry in results}, {'event', 'news', 'bikepost'})
+
+    def test_search_matches_prefixes_and_all_terms(self):
+        self.assertEqual(len(search("grav")), 4)
+        self.assertEqual([entry.object_id for entry in search("gravel sunday")], [self.gravel_event.pk])
+        self.assertEqual(search("!!!"), [])
+
+    def test_filter_queryset(self):
+        events = filter_queryset(Event.objects.all(), "gravel")
+        self.assertEqual(set(events), {self.gravel_event, self.road_event})
+
+    def test_event_list_uses_index(self):
+        response = self.client.get(reverse('events:event_list'), {'search': 'sunday'})
+        self.assertEqual([event.pk for event in response.context['events']], [self.gravel_event.pk])
+
+    def test_search_api(self):
+        response = self.client.get(reverse('api_search'), {'q': 'gravel', 'kind': 'news,bikepost'})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual({result['kind'] for result in results}, {'news', 'bikepost'})
+        news_result = next(result for result in results if result['kind'] == 'news')
+        self.assertEqual(news_result['url'], self.news.get_absolute_url())
+        self.assertIsNone(response.data['next'])
+
+    def test_rebuild_command(self):
+        SearchEntry.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(search("gravel")), 4)
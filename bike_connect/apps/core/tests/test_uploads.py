@@ -0,0 +1,162 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from bike_connect.apps.core import images
+from bike_connect.apps.core.models import ImageManifest
+from bike_connect.apps.core.uploads import ChunkedUpload, UploadError, purge_expired
+from bike_connect.apps.posts.models import BikePost
+
+User = get_user_model()
+
+
+def jpeg_bytes(size=(800, 600)):
+    output = io.BytesIO()
+    Image.new('RGB', size, 'blue').save(output, 'JPEG')
+    return output.getvalue()
+
+
+class ChunkedUploadTest(TestCase):
+    """
+    Tests for the init / chunk / complete upload endpoints, against FileSystemStorage.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='rider', password='password123')
+        cls.other = User.objects.create_user(username='other', password='password123')
+        cls.post = BikePost.objects.create(
+            title="Gravel bike", description="Barely used", price=500, location="Sofia",
+            category='sell', condition='used', posted_by=cls.user,
+        )
+
+    def setUp(self):
+        images.manifest_cache().clear()
+        self.media = tempfile.mkdtemp()
+        self.chunks = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.chunks, ignore_errors=True)
+        storages = {**settings.STORAGES, 'media': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': self.media, 'base_url': '/media/'},
+        }}
+        self.enterContext(override_settings(
+            STORAGES=storages, UPLOAD_CHUNK_DIR=self.chunks, UPLOAD_CHUNK_SIZE=4096, IMAGE_PROCESSING_EAGER=True,
+        ))
+        self.client.force_login(self.user)
+        self.data = jpeg_bytes()
+
+    def start(self, **data):
+        data = {'filename': 'ride.jpg', 'size': len(self.data), **data}
+        response = self.client.post(reverse('core:upload_init'), data)
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def send(self, upload, offset, chunk):
+        return self.client.patch(
+            upload['chunk_url'], chunk, content_type='application/octet-stream', headers={'Upload-Offset': str(offset)},
+        )
+
+    def send_all(self, upload, start=0):
+        for offset in range(start, len(self.data), 4096):
+            response = self.send(upload, offset, self.data[offset:offset + 4096])
+            self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_upload_in_chunks(self):
+        upload = self.start()
+        self.assertEqual(self.send_all(upload).json()['offset'], len(self.data))
+        response = self.client.post(upload['complete_url'])
+        self.assertEqual(response.status_code, 202)
+        status = self.client.get(upload['chunk_url']).json()
+        self.assertEqual(status['state'], 'done')
+        self.assertTrue(status['name'].startswith('uploads/ride'))
+        self.assertTrue(os.path.exists(os.path.join(self.media, status['name'])))
+        self.assertIsNotNone(images.get_manifest(status['name']))
+
+    def test_resume_after_a_dropped_connection(self):
+        upload = self.start()
+        # Only part of the first chunk arrives before the connection drops
+        chunk = ChunkedUpload.load(upload['upload_id'], self.user)
+        chunk.write_chunk(io.BytesIO(self.data[:1000]), 0, 4096)
+        offset = self.client.get(upload['chunk_url']).json()['offset']
+        self.assertEqual(offset, 1000)
+        self.assertEqual(self.send(upload, offset, self.data[offset:4096]).status_code, 200)
+        self.send_all(upload, start=4096)
+        self.assertEqual(self.client.post(upload['complete_url']).status_code, 202)
+        with open(os.path.join(self.media, self.client.get(upload['chunk_url']).json()['name']), 'rb') as f:
+            self.assertEqual(Image.open(f).size, (800, 600))
+
+    def test_concurrent_completes_store_once(self):
+        upload = self.start()
+        self.send_all(upload)
+        # Both requests load the upload before either completes it
+        first, retry = (ChunkedUpload.load(upload['upload_id'], self.user) for _ in range(2))
+        with self.settings(IMAGE_PROCESSING_EAGER=False), \
+                mock.patch.object(images, 'executor') as executor:
+            first.complete()
+            with self.assertRaises(UploadError) as raised:
+                retry.complete()
+        self.assertEqual(raised.exception.status, 409)
+        self.assertEqual(executor.return_value.submit.call_count, 1)
+
+    def test_wrong_offset_is_rejected_with_the_current_one(self):
+        upload = self.start()
+        self.send(upload, 0, self.data[:4096])
+        response = self.send(upload, 0, self.data[:4096])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 4096)
+
+    def test_limits(self):
+        response = self.client.post(reverse('core:upload_init'), {'filename': 'big.jpg', 'size': 10 ** 10})
+        self.assertEqual(response.status_code, 413)
+        upload = self.start()
+        self.assertEqual(self.send(upload, 0, self.data[:5000]).status_code, 413)
+        self.assertEqual(self.client.post(upload['complete_url']).status_code, 409)
+
+    def test_non_images_fail(self):
+        self.data = b'x' * 100
+        upload = self.start()
+        self.send_all(upload)
+        self.assertEqual(self.client.post(upload['complete_url']).status_code, 400)
+        self.assertEqual(self.client.get(upload['chunk_url']).json()['state'], 'failed')
+
+    def test_attach_to_a_bike_post(self):
+        upload = self.start(target='bike_post', object_id=self.post.pk)
+        self.send_all(upload)
+        self.client.post(upload['complete_url'])
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.image.name.startswith('bike_posts/ride'))
+
+    def test_failed_store_leaves_no_files(self):
+        upload = self.start(target='bike_post', object_id=self.post.pk)
+        self.send_all(upload)
+        # The post is deleted while the upload is being stored
+        BikePost.objects.filter(pk=self.post.pk).delete()
+        self.client.post(upload['complete_url'])
+        self.assertEqual(self.client.get(upload['chunk_url']).json()['state'], 'failed')
+        self.assertEqual([files for _, _, files in os.walk(self.media) if files], [])
+        self.assertFalse(ImageManifest.objects.exists())
+
+    def test_uploads_are_private(self):
+        upload = self.start()
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(upload['chunk_url']).status_code, 404)
+        response = self.client.post(
+            reverse('core:upload_init'),
+            {'filename': 'ride.jpg', 'size': 10, 'target': 'bike_post', 'object_id': self.post.pk},
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_purge_expired(self):
+        self.start()
+        self.assertEqual(purge_expired(), 0)
+        self.assertEqual(purge_expired(now=10 ** 12), 1)
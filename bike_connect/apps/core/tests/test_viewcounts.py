@@ -0,0 +1,128 @@
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from bike_connect.apps.core.models import News
+from bike_connect.apps.core.serializers import NewsSerializer
+from bike_connect.apps.core import viewcounts
+from bike_connect.apps.core.viewcounts import flush_views, pending_views, record_view
+
+
+@override_settings(NEWS_VIEWS_FLUSH_INTERVAL=3600)
+class ViewCounterTest(TestCase):
+    """
+    Tests for the buffered news view counter.
+    """
+
+    def setUp(self):
+        cache.clear()
+        # Start with the flush marker set so that only explicit flushes write
+        cache.set('news:views:flush-marker', True, 3600)
+        self.news = News.objects.create(title="Hot News", content="Content")
+
+    def test_detail_view_buffers_hits(self):
+        """
+        Test that visiting the detail view buffers the hit instead of saving it.
+        """
+        self.client.get(reverse('core:news_detail', kwargs={'pk': self.news.pk}))
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views, 0)
+        self.assertEqual(pending_views(self.news.pk), 1)
+        self.assertEqual(self.news.total_views, 1)
+
+    def test_flush_applies_buffered_hits(self):
+        """
+        Test that a flush writes the buffered hits and empties the buffer.
+        """
+        other = News.objects.create(title="Other News", content="Content")
+        for _ in range(3):
+            record_view(self.news.pk)
+        record_view(other.pk)
+
+        self.assertEqual(flush_views(), 4)
+        self.news.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.news.views, 3)
+        self.assertEqual(other.views, 1)
+        self.assertEqual(pending_views(self.news.pk), 0)
+
+    def test_serializer_reports_pending_views(self):
+        """
+        Test that the API serializer includes hits that are not flushed yet.
+        """
+        News.objects.filter(pk=self.news.pk).update(views=5)
+        self.news.refresh_from_db()
+        record_view(self.news.pk)
+        self.assertEqual(NewsSerializer(self.news).data['views'], 6)
+
+    def test_flush_command(self):
+        """
+        Test that the management command flushes the buffer.
+        """
+        record_view(self.news.pk)
+        call_command('flush_news_views', stdout=StringIO())
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views, 1)
+
+    def test_flush_from_another_process(self):
+        """
+        Test that a process with its own cache flushes the hits another one recorded.
+        """
+        for _ in range(3):
+            record_view(self.news.pk)
+        # A fresh local-memory cache, as in a cron job or another worker
+        with mock.patch.object(viewcounts, 'cache', LocMemCache('other-process', {})):
+            self.assertEqual(pending_views(self.news.pk), 3)
+            self.assertEqual(flush_views(), 3)
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views, 3)
+
+
+@override_settings(NEWS_VIEWS_FLUSH_INTERVAL=3600)
+class ConcurrentViewCounterTest(TransactionTestCase):
+    """
+    Stress test: hits recorded from many threads while other threads flush.
+    """
+
+    def setUp(self):
+        cache.clear()
+        cache.set('news:views:flush-marker', True, 3600)
+        self.news = News.objects.create(title="Hot News", content="Content")
+
+    def test_concurrent_hits_are_not_lost(self):
+        """
+        Test that hits recorded from many threads while flushing are all counted.
+        """
+        threads_count, hits_per_thread = 8, 50
+        errors = []
+
+        def hammer():
+            try:
+                for _ in range(hits_per_thread):
+                    record_view(self.news.pk)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=hammer) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        # Flush repeatedly while the other threads keep recording hits
+        while any(thread.is_alive() for thread in threads):
+            flush_views([self.news.pk])
+        for thread in threads:
+            thread.join()
+        flush_views([self.news.pk])
+
+        self.assertEqual(errors, [])
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views, threads_count * hits_per_thread)
+        self.assertEqual(pending_views(self.news.pk), 0)
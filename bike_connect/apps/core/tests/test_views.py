@@ -2,6 +2,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.utils.timezone import now
 from cyclingnets.bike_connect.apps.core.models import News, Page
+from cyclingnets.bike_connect.apps.core.viewcounts import flush_views
 from cyclingnets.bike_connect.apps.events.models import Event
 from django.contrib.auth.models import User
 
@@ -26,8 +27,9 @@ class NewsViewsTest(TestCase):
         self.assertNotIn(self.news_2, response.context['news_list'])  # Unpublished news should not appear
 
     def test_news_detail_view(self):
-        # Test that the news detail view increments the view count
+        # Test that the news detail view increments the view count once flushed
         self.client.get(reverse('core:news_detail', kwargs={'pk': self.news_1.pk}))
+        flush_views()
         self.news_1.refresh_from_db()
         self.assertEqual(self.news_1.views, 1)
 
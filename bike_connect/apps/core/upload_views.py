@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods, require_POST
+
+from .uploads import ChunkedUpload, UploadError
+
+# -------------------------------
+# Chunked Uploads
+# -------------------------------
+# 1. POST   /core/uploads/                      filename, size[, target, object_id]
+# 2. PATCH  /core/uploads/<id>/                 one chunk as the raw body, with an
+#                                               `Upload-Offset` header; repeat
+# 3. POST   /core/uploads/<id>/complete/        queue the file for storing
+#    GET    /core/uploads/<id>/                 offset to resume from, state, URL when done
+
+
+def _error(e):
+    return JsonResponse({'error': str(e), **e.extra}, status=e.status)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _status(upload, status=200):
+    data = upload.status()
+    data['chunk_url'] = reverse('core:upload_detail', args=[upload.id])
+    data['complete_url'] = reverse('core:upload_complete', args=[upload.id])
+    return JsonResponse(data, status=status)
+
+
+@login_required
+@require_POST
+def upload_init(request):
+    """
+    Starts a chunked upload and returns its id and the largest chunk accepted.
+    """
+    try:
+        upload = ChunkedUpload.create(
+            request.user, request.POST.get('filename', ''), _int(request.POST.get('size')),
+            target=request.POST.get('target') or None, object_id=_int(request.POST.get('object_id')),
+        )
+    except UploadError as e:
+        return _error(e)
+    response = _status(upload, status=201)
+    response['Upload-Chunk-Size'] = getattr(settings, 'UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+    return response
+
+
+@login_required
+@require_http_methods(['GET', 'PATCH'])
+def upload_detail(request, upload_id):
+    """
+    GET returns the state of an upload; PATCH appends the chunk in the request body.
+
+    The body is copied to disk as it is read, so a chunk never sits in memory.
+    """
+    try:
+        upload = ChunkedUpload.load(upload_id, request.user)
+        if request.method == 'PATCH':
+            offset = _int(request.headers.get('Upload-Offset'))
+            length = _int(request.headers.get('Content-Length'))
+            if offset is None or length is None:
+                raise UploadError("Chunks need Upload-Offset and Content-Length headers.")
+            upload.write_chunk(request, offset, length)
+    except UploadError as e:
+        return _error(e)
+    return _status(upload)
+
+
+@login_required
+@require_POST
+def upload_complete(request, upload_id):
+    """
+    Queues a fully received upload for storing; poll the upload for its URL.
+    """
+    try:
+        upload = ChunkedUpload.load(upload_id, request.user)
+        upload.complete()
+    except UploadError as e:
+        return _error(e)
+    return _status(upload, status=202)
@@ -0,0 +1,315 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File, locks
+from django.db import close_old_connections
+from django.utils.text import get_valid_filename
+
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.posts.models import BikePost
+from . import images
+
+logger = logging.getLogger(__name__)
+
+# Objects a finished upload can become the image of:
+# name -> (model, image field, storage folder, owner field)
+TARGETS = {
+    'event': (Event, 'image', 'events', 'organizer_id'),
+    'bike_post': (BikePost, 'image', 'bike_posts', 'posted_by_id'),
+}
+
+# Upload states, as reported by `ChunkedUpload.status()`
+UPLOADING, PROCESSING, DONE, FAILED = 'uploading', 'processing', 'done', 'failed'
+
+# Bytes read from the request per write
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    Raised when a request does not fit the upload; `status` is the HTTP status to answer with.
+    """
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def upload_root():
+    """
+    Returns the directory partial uploads are assembled in. It must be shared
+    by every process serving the upload endpoints.
+    """
+    return getattr(settings, 'UPLOAD_CHUNK_DIR', None) or os.path.join(tempfile.gettempdir(), 'bike_connect_uploads')
+
+
+def purge_expired(now=None):
+    """
+    Deletes uploads that were started more than UPLOAD_EXPIRY seconds ago.
+
+    Returns:
+        int: The number of uploads deleted.
+    """
+    root = upload_root()
+    if not os.path.isdir(root):
+        return 0
+    cutoff = (now or time.time()) - getattr(settings, 'UPLOAD_EXPIRY', 24 * 3600)
+    deleted = 0
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            deleted += 1
+    return deleted
+
+
+class ChunkedUpload:
+    """
+    A resumable upload, assembled on local disk one chunk at a time.
+
+    Chunks are appended in order: every chunk states the offset it starts at,
+    which must be the number of bytes received so far. A client whose
+    connection dropped asks for the current offset (`status()`) and resends
+    from there; whatever arrived before the drop is kept. Once all bytes are
+    in, `complete()` hands the file to the image workers, which sanitize it,
+    store it in the media storage and, for a target object, make it its image.
+
+    The state lives in `<root>/<id>/meta.json`, next to the data, so any
+    process can serve any chunk.
+    """
+
+    def __init__(self, upload_id, meta):
+        self.id = upload_id
+        self.meta = meta
+
+    # -------------------------------
+    # Creating and Loading
+    # -------------------------------
+
+    @classmethod
+    def create(cls, user, filename, size, target=None, object_id=None):
+        """
+        Starts an upload of `size` bytes for `user`.
+
+        Args:
+            filename: Client file name, kept (sanitized) as the stored name.
+            size: Total size in bytes, announced up front.
+            target: Optional TARGETS key; the image becomes that object's image.
+            object_id: Primary key of the target object, owned by `user`.
+        """
+        max_bytes = getattr(settings, 'IMAGE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024)
+        if not isinstance(size, int) or size <= 0:
+            raise UploadError("The upload size must be a positive number of bytes.")
+        if size > max_bytes:
+            raise UploadError(f"Images may be at most {max_bytes // (1024 * 1024)} MB.", status=413)
+        if target is not None:
+            if target not in TARGETS:
+                raise UploadError(f"Unknown upload target '{target}'.")
+            model, _, _, owner_field = TARGETS[target]
+            owned = model._default_manager.filter(pk=object_id, **{owner_field: user.pk})
+            if object_id is None or not (user.is_staff or owned.exists()):
+                raise UploadError("You cannot change this object's image.", status=403)
+
+        purge_expired()
+        upload = cls(uuid.uuid4().hex, {
+            'user_id': user.pk,
+            'filename': get_valid_filename(os.path.basename(filename or '')) or 'image',
+            'size': size,
+            'target': target,
+            'object_id': object_id,
+            'state': UPLOADING,
+            'created': time.time(),
+        })
+        os.makedirs(upload.path(), exist_ok=True)
+        open(upload.path('data'), 'wb').close()
+        upload.save()
+        return upload
+
+    @classmethod
+    def load(cls, upload_id, user):
+        """
+        Returns the upload `user` started, or raises UploadError (404).
+        """
+        try:
+            uuid.UUID(hex=upload_id)
+            with open(os.path.join(upload_root(), upload_id, 'meta.json')) as f:
+                meta = json.load(f)
+        except (ValueError, OSError):
+            raise UploadError("Unknown upload.", status=404)
+        if meta['user_id'] != user.pk:
+            raise UploadError("Unknown upload.", status=404)
+        return cls(upload_id, meta)
+
+    def path(self, *parts):
+        return os.path.join(upload_root(), self.id, *parts)
+
+    def reload(self):
+        """
+        Reads the metadata again, as another process may have changed it.
+        """
+        with open(self.path('meta.json')) as f:
+            self.meta = json.load(f)
+
+    def save(self):
+        """
+        Writes the metadata atomically, so readers never see a partial file.
+        """
+        temporary = self.path('meta.json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(temporary, self.path('meta.json'))
+
+    # -------------------------------
+    # Receiving
+    # -------------------------------
+
+    @property
+    def offset(self):
+        """
+        Number of bytes received so far.
+        """
+        try:
+            return os.path.getsize(self.path('data'))
+        except OSError:
+            return self.meta['size'] if self.meta['state'] != UPLOADING else 0
+
+    def status(self):
+        status = {
+            'upload_id': self.id, 'state': self.meta['state'], 'offset': self.offset, 'size': self.meta['size'],
+        }
+        for key in ('name', 'url', 'error'):
+            if key in self.meta:
+                status[key] = self.meta[key]
+        return status
+
+    def write_chunk(self, stream, offset, length):
+        """
+        Appends a chunk read from `stream` (e.g. the request) without buffering it.
+
+        Args:
+            offset: Where the chunk starts; must be the current offset.
+            length: Bytes in the chunk (the request's Content-Length).
+
+        Returns:
+            int: The new offset.
+        """
+        chunk_size = getattr(settings, 'UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+        if self.meta['state'] != UPLOADING:
+            raise UploadError("The upload is already complete.", status=409, offset=self.offset)
+        if length > chunk_size:
+            raise UploadError(f"Chunks may be at most {chunk_size} bytes.", status=413)
+        if offset + length > self.meta['size']:
+            raise UploadError("The chunk runs past the announced size.", status=413)
+
+        with open(self.path('data'), 'ab') as f:
+            # One writer at a time: a retry racing the original request must wait its turn
+            if not locks.lock(f, locks.LOCK_EX | locks.LOCK_NB):
+                raise UploadError("Another chunk is being written.", status=409, offset=self.offset)
+            try:
+                current = f.seek(0, os.SEEK_END)
+                if offset != current:
+                    raise UploadError("The chunk does not start at the current offset.", status=409, offset=current)
+                remaining = length
+                while remaining:
+                    data = stream.read(min(COPY_BUFFER_SIZE, remaining))
+                    if not data:
+                        break  # The connection dropped; keep what arrived
+                    f.write(data)
+                    remaining -= len(data)
+                f.flush()
+                return f.tell()
+            finally:
+                locks.unlock(f)
+
+    # -------------------------------
+    # Completing
+    # -------------------------------
+
+    def complete(self):
+        """
+        Checks the assembled file and queues it for storing.
+
+        Returns:
+            Future or None: The background job, or None when processed eagerly.
+        """
+        # A retried request may race the original one: the check and the
+        # transition happen under one lock, on the state other processes saved
+        with open(self.path('complete.lock'), 'a') as lock:
+            locks.lock(lock, locks.LOCK_EX)
+            try:
+                self.reload()
+                if self.meta['state'] != UPLOADING:
+                    raise UploadError("The upload is already complete.", status=409)
+                if self.offset != self.meta['size']:
+                    raise UploadError("The upload is incomplete.", status=409, offset=self.offset)
+                with open(self.path('data'), 'rb') as f:
+                    try:
+                        images.validate_image(File(f))
+                    except ValidationError as e:
+                        self.fail(' '.join(e.messages))
+                        raise UploadError(' '.join(e.messages))
+
+                self.meta['state'] = PROCESSING
+                self.save()
+            finally:
+                locks.unlock(lock)
+        if getattr(settings, 'IMAGE_PROCESSING_EAGER', False):
+            self.store()
+            return None
+        return images.executor().submit(self._store_in_background)
+
+    def _store_in_background(self):
+        try:
+            self.store()
+        finally:
+            close_old_connections()
+
+    def store(self):
+        """
+        Stores the assembled file in the media storage and renders its variants.
+        """
+        storage = images.media_storage()
+        target = TARGETS.get(self.meta['target'])
+        folder = target[2] if target else 'uploads'
+        name = None
+        try:
+            with open(self.path('data'), 'rb') as f:
+                cleaned = images.sanitize_upload(f)
+                name = storage.save(f"{folder}/{self.meta['filename']}", cleaned or File(f))
+            images.process_image(storage, name)
+            # Attached last, so that nothing refers to the file if a step fails
+            if target:
+                self._attach(target, name)
+        except Exception as e:
+            logger.exception("Storing upload %s failed", self.id)
+            if name is not None:
+                images.delete_image(name)
+            self.fail(str(e))
+            return
+        self.meta.update(state=DONE, name=name, url=images.storage_url(storage, name))
+        self.save()
+        os.remove(self.path('data'))
+
+    def _attach(self, target, name):
+        """
+        Makes the stored image the target object's image, replacing the old one.
+        """
+        model, field, _, _ = target
+        instance = model._default_manager.get(pk=self.meta['object_id'])
+        old = getattr(instance, field)
+        old_name = old.name if old else None
+        setattr(instance, field, name)
+        instance.save(update_fields=[field])
+        if old_name:
+            images.delete_image(old_name)
+
+    def fail(self, error):
+        self.meta.update(state=FAILED, error=error)
+        self.save()
@@ -1,9 +1,10 @@
 from django.urls import path
 from .views import (
-    NewsListView, NewsDetailView, NewsCreateView, NewsUpdateView, NewsDeleteView,
+    NewsListView, NewsDetailView, NewsCreateView, NewsUpdateView, NewsDeleteView, PageDetailView,
     custom_404_view  # Import the custom 404 view
 )
 from .api_views import NewsListAPI, NewsDetailAPI
+from .upload_views import upload_complete, upload_detail, upload_init
 
 app_name = 'core'
 
@@ -14,6 +15,12 @@ urlpatterns = [
     path('news/create/', NewsCreateView.as_view(), name='news_create'),
     path('news/<int:pk>/edit/', NewsUpdateView.as_view(), name='news_edit'),
     path('news/<int:pk>/delete/', NewsDeleteView.as_view(), name='news_delete'),
+    path('pages/<slug:slug>/', PageDetailView.as_view(), name='page_detail'),
+
+    # Chunked, resumable image uploads
+    path('uploads/', upload_init, name='upload_init'),
+    path('uploads/<str:upload_id>/', upload_detail, name='upload_detail'),
+    path('uploads/<str:upload_id>/complete/', upload_complete, name='upload_complete'),
 
     # API views
     path('api/news/', NewsListAPI.as_view(), name='api_news_list'),
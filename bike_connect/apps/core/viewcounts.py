@@ -0,0 +1,130 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, Sum
+
+from .models import News, NewsViewCounter
+
+# -------------------------------
+# Counter Rows
+# -------------------------------
+# Hits are buffered in the database, in NewsViewCounter rows: every process
+# and every cache backend sees the same counts, and an increment is one
+# statement the database applies atomically.
+
+# Counter rows per article; concurrent hits spread over them
+VIEW_COUNTER_SHARDS = 8
+
+# Marker key whose expiry drives the periodic flush from inside requests.
+# Each process flushes at most once per interval; the marker only paces the
+# flushes, the counts never depend on it.
+FLUSH_MARKER_KEY = 'news:views:flush-marker'
+
+
+def _flush_interval():
+    """
+    Returns the number of seconds between two automatic flushes.
+    """
+    return getattr(settings, 'NEWS_VIEWS_FLUSH_INTERVAL', 60)
+
+
+# -------------------------------
+# Buffering
+# -------------------------------
+
+def record_view(pk):
+    """
+    Adds one hit for the given article to the buffer.
+
+    The hit is one INSERT ... ON CONFLICT statement on a random counter row of
+    the article, so concurrent workers never overwrite each other's hits.
+    Once per flush interval the request that notices the expired marker also
+    writes the buffer to `News.views`.
+    """
+    table = connection.ops.quote_name(NewsViewCounter._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (news_id, shard, hits) VALUES (%s, %s, 1) "
+            f"ON CONFLICT (news_id, shard) DO UPDATE SET hits = {table}.hits + 1",
+            [pk, random.randrange(VIEW_COUNTER_SHARDS)],
+        )
+
+    if cache.add(FLUSH_MARKER_KEY, True, timeout=_flush_interval()):
+        flush_views()
+
+
+def pending_views(pk):
+    """
+    Returns the number of hits buffered for the article and not yet flushed.
+    """
+    return NewsViewCounter.objects.filter(news_id=pk).aggregate(total=Sum('hits'))['total'] or 0
+
+
+def pending_views_many(pks):
+    """
+    Returns {pk: buffered hits} for several articles with a single query.
+    """
+    pending = dict.fromkeys(pks, 0)
+    pending.update(
+        NewsViewCounter.objects.filter(news_id__in=pending.keys()).order_by()
+        .values('news_id').annotate(total=Sum('hits')).values_list('news_id', 'total')
+    )
+    return pending
+
+
+def pending_total():
+    """
+    Returns the number of buffered hits of all articles.
+
+    Stored plus buffered views only ever grow, so list responses are
+    revalidated against this without reading every article's counters.
+    """
+    return NewsViewCounter.objects.aggregate(total=Sum('hits'))['total'] or 0
+
+
+# -------------------------------
+# Flushing
+# -------------------------------
+
+def flush_views(pks=None):
+    """
+    Applies every buffered hit to `News.views` as batched `F()` updates.
+
+    The counter rows read are locked until the transaction ends, and the hits
+    are subtracted from them rather than reset: hits recorded meanwhile stay
+    for the next flush, and two processes flushing at once cannot count the
+    same hits twice.
+
+    Args:
+        pks: Optional iterable of article ids to flush. Defaults to all articles.
+
+    Returns:
+        int: The number of hits written to the database.
+    """
+    with transaction.atomic():
+        counters = NewsViewCounter.objects.select_for_update().filter(hits__gt=0)
+        if pks is not None:
+            counters = counters.filter(news_id__in=list(pks))
+        rows = list(counters.order_by('pk').values_list('pk', 'news_id', 'hits'))
+        if not rows:
+            return 0
+
+        # Group counter rows and articles by their increment so that a whole
+        # group is written with a single UPDATE statement.
+        taken = defaultdict(list)
+        totals = defaultdict(int)
+        for counter_pk, news_pk, hits in rows:
+            taken[hits].append(counter_pk)
+            totals[news_pk] += hits
+        batches = defaultdict(list)
+        for news_pk, hits in totals.items():
+            batches[hits].append(news_pk)
+
+        for hits, batch in taken.items():
+            NewsViewCounter.objects.filter(pk__in=batch).update(hits=F('hits') - hits)
+        for hits, batch in batches.items():
+            News.objects.filter(pk__in=batch).update(views=F('views') + hits)
+        return sum(totals.values())
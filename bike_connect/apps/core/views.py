@@ -5,11 +5,22 @@ from django.views.generic import ListView, DetailView, TemplateView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import render
-from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from itertools import zip_longest
+import re
 from .models import News, Page
 from .forms import NewsForm
-from bike_connect.apps.events.models import Event, Participation
+from .caching import CachedListMixin
+from .conditional import ConditionalDetailMixin
+from .fragments import cached_fragment
+from .pagination import KeysetPaginationMixin, KeysetPaginator
+from .profiling import query_budget
+from .replicas import ReplicaReadMixin, read_from_replica
+from .search import filter_queryset
+from .viewcounts import record_view
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.events.participation import participation_index
 
 # -------------------------------
 # Admin Mixin
@@ -37,15 +48,17 @@ class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
 # News Views
 # -------------------------------
 
-class NewsListView(ListView):
+class NewsListView(ReplicaReadMixin, CachedListMixin, KeysetPaginationMixin, ListView):
     """
-    Displays a paginated list of news articles with optional filtering.
+    Displays a keyset-paginated list of news articles with optional filtering.
     - Filters by year, month, or a search query if provided.
+    - Pages are served from the list cache until a news article changes.
     """
     model = News
     template_name = 'core/news_list.html'
     context_object_name = 'news_list'
     paginate_by = 6  # Number of news articles per page
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         """
@@ -61,10 +74,20 @@ class NewsListView(ListView):
         if month:
             queryset = queryset.filter(created_at__month=month)
         if search_query:
-            queryset = queryset.filter(title__icontains=search_query)
+            queryset = filter_queryset(queryset, search_query)
 
         return queryset
 
+    def serialize_row(self, news):
+        return {
+            'id': news.id,
+            'title': news.title,
+            'content': news.content,
+            'created_at': news.created_at,
+            'image': news.image.name,
+            'url': news.get_absolute_url(),
+        }
+
     def get_context_data(self, **kwargs):
         """
         Adds additional context for year and month filtering options.
@@ -76,9 +99,11 @@ class NewsListView(ListView):
         return context
 
 
-class NewsDetailView(DetailView):
+class NewsDetailView(ConditionalDetailMixin, DetailView):
     """
-    Displays the details of a news article and increments its view count.
+    Displays the details of a news article and records a view for it.
+
+    Answers conditional requests with 304 while the article is unchanged.
     """
     model = News
     template_name = 'core/news_detail.html'
@@ -86,12 +111,12 @@ class NewsDetailView(DetailView):
 
     def get(self, request, *args, **kwargs):
         """
-        Overrides the default GET method to increment the view count.
+        Overrides the default GET method to buffer the view instead of saving it.
         """
-        news = self.get_object()
-        news.views += 1
-        news.save(update_fields=['views'])
-        return super().get(request, *args, **kwargs)
+        response = super().get(request, *args, **kwargs)
+        # Revalidated (304) visits count too, and they never load the object
+        record_view(self.kwargs[self.pk_url_kwarg])
+        return response
 
 
 class NewsCreateView(AdminRequiredMixin, CreateView):
@@ -127,9 +152,9 @@ class NewsDeleteView(AdminRequiredMixin, DeleteView):
 # Static Page Views
 # -------------------------------
 
-class PageDetailView(DetailView):
+class PageDetailView(ConditionalDetailMixin, DetailView):
     """
-    Displays the details of a static page.
+    Displays the details of a static page, answering conditional requests.
     """
     model = Page
     template_name = 'core/page_detail.html'
@@ -164,36 +189,65 @@ def group_events(events, group_size):
 # Landing Page View
 # -------------------------------
 
-def landing_page(request):
+# Placeholder left in the cached event cards where the per-user badge goes
+PARTICIPATION_SLOT = re.compile(r'<!--participation:(\d+)-->')
+
+
+def render_landing_events(cursor):
     """
-    Renders the landing page with:
-    - Paginated events (9 per page).
-    - Participations for the logged-in user.
-    - Latest 3 published news articles.
+    Renders one page of landing page events without any per-user content.
+
+    Returns:
+        dict: The rendered HTML and the ids of the events on the page.
     """
-    # Fetch all events ordered by date
-    all_events = Event.objects.order_by('date')
+    # Paginate events by (date, id) - 9 events per page
+    paginator = KeysetPaginator(Event.objects.order_by('date'), 9, ordering=('date', 'id'))
+    paginated_events = paginator.get_page(cursor)
+    return {
+        'html': render_to_string('core/partials/landing_events.html', {'paginated_events': paginated_events}),
+        'event_ids': [event.id for event in paginated_events],
+    }
 
-    # Fetch user participations if the user is logged in
-    participations = (
-        Participation.objects.filter(user=request.user)
-        if request.user.is_authenticated
-        else []
-    )
 
-    # Fetch the latest 3 news articles
+def render_landing_news():
+    """
+    Renders the strip with the latest 3 published news articles.
+    """
     news_list = News.objects.filter(is_published=True).order_by('-created_at')[:3]
+    return render_to_string('core/partials/landing_news.html', {'news_list': news_list})
+
 
-    # Paginate events - 9 events per page
-    paginator = Paginator(all_events, 9)
-    page_number = request.GET.get('page', 1)  # Current page number
-    paginated_events = paginator.get_page(page_number)  # Paginated events for the page
+@read_from_replica
+@query_budget(max_queries=5, max_duplicates=0)
+def landing_page(request):
+    """
+    Renders the landing page from cached fragments:
+    - The hero carousel (static).
+    - The latest 3 published news articles (invalidated when News changes).
+    - Keyset-paginated events, 9 per page (invalidated when an Event changes).
+    Only the participation badges of the logged-in user are rendered per request.
+    """
+    cursor = request.GET.get('cursor')  # Opaque cursor of the current events page
+
+    hero_html = cached_fragment('landing:hero', lambda: render_to_string('core/partials/landing_hero.html'))
+    news_html = cached_fragment('landing:news', render_landing_news, models=[News])
+    events = cached_fragment(
+        'landing:events', lambda: render_landing_events(cursor), models=[Event], vary=[cursor or ''],
+    )
+
+    # Index the user's participations for the events on this page only
+    participations = participation_index(request.user).load(events['event_ids'])
+    badge = render_to_string('core/partials/participation_badge.html')
+    events_html = PARTICIPATION_SLOT.sub(
+        lambda match: badge if int(match[1]) in participations else '', events['html'],
+    )
 
     # Render the landing page with the context
     return render(request, 'core/landing_page.html', {
-        'paginated_events': paginated_events,
+        'hero_html': mark_safe(hero_html),
+        'news_html': mark_safe(news_html),
+        'events_html': mark_safe(events_html),
         'participations': participations,
-        'news_list': news_list,
     })
 
 
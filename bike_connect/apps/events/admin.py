@@ -1,5 +1,17 @@
-from django.contrib import admin
+import io
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import render
+from django.urls import path
+
+from .forms import EventImportForm
 from .models import Participation, Event
+from .participation import refresh_participant_counts
+from .transfer import ImportFormatError, detect_format, import_file, streaming_export
+
+# Rejected rows listed on the import page; the rest are only counted
+MAX_REPORTED_ERRORS = 200
 
 
 # Admin customization for the Participation model
@@ -21,6 +33,20 @@ class ParticipationAdmin(admin.ModelAdmin):
     # Enables searching by username of the user and title of the event
     search_fields = ['user__username', 'event__title']
 
+    # Edits bypass participation.join() / leave(), so recount the affected events
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        refresh_participant_counts(Event.objects.filter(pk=obj.event_id))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        refresh_participant_counts(Event.objects.filter(pk=obj.event_id))
+
+    def delete_queryset(self, request, queryset):
+        event_ids = list(queryset.values_list('event_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        refresh_participant_counts(Event.objects.filter(pk__in=event_ids))
+
 
 # Admin customization for the Event model
 @admin.register(Event)
@@ -32,7 +58,7 @@ class EventAdmin(admin.ModelAdmin):
     list display, filters, and search functionality.
     """
     # Fields to display in the admin list view
-    list_display = ['title', 'date', 'location', 'organizer']
+    list_display = ['title', 'date', 'location', 'organizer', 'participant_count', 'capacity']
 
     # Fields to filter by in the admin interface (filter panel on the right)
     list_filter = ['date', 'location']
@@ -40,3 +66,65 @@ class EventAdmin(admin.ModelAdmin):
     # Fields that are searchable in the admin interface
     # Enables searching by title, location, and username of the organizer
     search_fields = ['title', 'location', 'organizer__username']
+
+    # Adds the "Import events" button next to "Add event"
+    change_list_template = 'admin/events/event/change_list.html'
+
+    # Streaming downloads of the selected events
+    actions = ['export_csv', 'export_json', 'export_ics']
+
+    @admin.action(description="Export selected events as CSV")
+    def export_csv(self, request, queryset):
+        return streaming_export(queryset, 'csv')
+
+    @admin.action(description="Export selected events as JSON")
+    def export_json(self, request, queryset):
+        return streaming_export(queryset, 'json')
+
+    @admin.action(description="Export selected events as iCalendar")
+    def export_ics(self, request, queryset):
+        return streaming_export(queryset, 'ics')
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='events_event_import'),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request):
+        """
+        Bulk imports an uploaded file; the requesting admin organizes rows
+        that name no organizer.
+        """
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        report = None
+        form = EventImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                fmt = form.cleaned_data['format'] or detect_format(upload.name)
+                stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+                report = import_file(
+                    stream, fmt, organizer=request.user,
+                    batch_size=form.cleaned_data['batch_size'], dry_run=form.cleaned_data['dry_run'],
+                )
+            except (ImportFormatError, UnicodeDecodeError) as e:
+                form.add_error('file', str(e))
+            else:
+                if form.cleaned_data['dry_run']:
+                    messages.info(request, f"{report.valid} valid rows, {len(report.errors)} rejected. Nothing was saved.")
+                else:
+                    level = messages.SUCCESS if not report.errors else messages.WARNING
+                    messages.add_message(
+                        request, level, f"Imported {report.created} events, {len(report.errors)} rows rejected.",
+                    )
+
+        return render(request, 'admin/events/event/import_events.html', {
+            **self.admin_site.each_context(request),
+            'title': "Import events",
+            'opts': self.model._meta,
+            'form': form,
+            'report': report,
+            'errors': list(report.error_lines())[:MAX_REPORTED_ERRORS] if report else [],
+        })
@@ -14,3 +14,11 @@ class EventsConfig(AppConfig):
 
     # The name of the application as it appears in the project structure.
     name = 'bike_connect.apps.events'
+
+    def ready(self):
+        """
+        Connects the signal receivers of the application once all models are loaded.
+        """
+        from . import signals
+
+        signals.connect_signals()
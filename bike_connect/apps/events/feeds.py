@@ -0,0 +1,175 @@
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.utils.timezone import now
+
+from bike_connect.apps.users.backends import CachedModelBackend
+from . import ical
+from .models import Event, Participation
+from .transfer import event_uid
+
+# Feed kinds: the events a user joined, and the events they organize
+FEED_KINDS = {
+    'joined': 'Bike Connect - my rides',
+    'organized': 'Bike Connect - rides I organize',
+}
+
+# Salt of the signed feed tokens, so they cannot be reused as other signatures
+FEED_TOKEN_SALT = 'bike_connect.events.feed'
+
+FEED_STAMP_PREFIX = 'events:feed:stamp:'
+FEED_BODY_PREFIX = 'events:feed:body:'
+
+
+def feed_cache():
+    """
+    Returns the cache holding the feed stamps and bodies (`FEED_CACHE_ALIAS`).
+    """
+    return caches[getattr(settings, 'FEED_CACHE_ALIAS', 'default')]
+
+
+# -------------------------------
+# Tokens
+# -------------------------------
+
+def feed_token(user, kind='joined'):
+    """
+    Returns the secret token of a user's feed. Calendar apps cannot log in,
+    so the signed token in the URL is what grants access.
+
+    The token carries the user's feed secret: `CustomUser.rotate_feed_secret`
+    revokes every token handed out before. It has no timestamp, so a user's
+    feed URLs stay the same until then.
+    """
+    return signing.Signer(salt=FEED_TOKEN_SALT).sign_object([user.pk, kind, user.feed_secret])
+
+
+def read_feed_token(token):
+    """
+    Returns (user id, kind) for a valid token, or None.
+
+    The user must be active and still have the secret the token was made
+    with. Users are read through `CachedModelBackend`, so polling clients
+    are answered without a query.
+    """
+    try:
+        user_id, kind, secret = signing.Signer(salt=FEED_TOKEN_SALT).unsign_object(token)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    if kind not in FEED_KINDS:
+        return None
+    user = CachedModelBackend().get_user(user_id)
+    if user is None or not constant_time_compare(user.feed_secret, secret):
+        return None
+    return user_id, kind
+
+
+def feed_url(request, user, kind='joined'):
+    return request.build_absolute_uri(reverse('events:event_feed', args=[feed_token(user, kind)]))
+
+
+# -------------------------------
+# Version Stamps
+# -------------------------------
+
+def _stamp_key(user_id):
+    return f'{FEED_STAMP_PREFIX}{user_id}'
+
+
+def feed_stamp(user_id):
+    """
+    Returns the current version stamp of a user's feeds, creating it if needed.
+    """
+    key = _stamp_key(user_id)
+    stamp = feed_cache().get(key)
+    if stamp is None:
+        # A fresh timestamp never repeats one used before an eviction
+        feed_cache().add(key, time.time_ns(), timeout=None)
+        stamp = feed_cache().get(key)
+    return stamp
+
+
+def bump_feed_stamps(user_ids):
+    """
+    Invalidates the cached feeds of the given users.
+    """
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        key = _stamp_key(user_id)
+        try:
+            feed_cache().incr(key)
+        except ValueError:
+            feed_cache().add(key, time.time_ns(), timeout=None)
+
+
+# -------------------------------
+# Rendering
+# -------------------------------
+
+def feed_queryset(user_id, kind):
+    """
+    Returns the rows of a feed, in date order.
+    """
+    if kind == 'joined':
+        queryset = Event.objects.filter(
+            pk__in=Participation.objects.filter(user_id=user_id, status='joined').values('event_id'),
+        )
+    else:
+        queryset = Event.objects.filter(organizer_id=user_id)
+    return (
+        queryset.order_by('date', 'pk')
+        .values_list('id', 'title', 'description', 'date', 'location', 'updated_at')
+    )
+
+
+def feed_rows(user_id, kind):
+    """
+    Returns an iterator over the events of a feed, read in chunks.
+    """
+    return feed_queryset(user_id, kind).iterator(chunk_size=500)
+
+
+def render_feed(rows, kind, event_url):
+    """
+    Yields the iCalendar feed one component at a time.
+
+    Args:
+        rows: Iterable of feed_rows() tuples.
+        kind: Feed kind, for the calendar name.
+        event_url: Callable returning the absolute URL of an event id.
+    """
+    stamp = now()
+    yield ical.calendar_start(FEED_KINDS[kind])
+    for pk, title, description, day, location, updated_at in rows:
+        yield ical.vevent(
+            event_uid(pk), day, title, stamp, description=description, location=location,
+            url=event_url(pk), last_modified=updated_at,
+        )
+    yield ical.calendar_end()
+
+
+def body_key(user_id, kind, stamp):
+    return f'{FEED_BODY_PREFIX}{user_id}:{kind}:{stamp}'
+
+
+def caching_stream(chunks, key):
+    """
+    Passes the chunks through and stores the complete body under `key` once
+    the stream is exhausted. Feeds larger than FEED_CACHE_MAX_BYTES are
+    streamed without being cached.
+    """
+    limit = getattr(settings, 'FEED_CACHE_MAX_BYTES', 1024 * 1024)
+    parts, size = [], 0
+    for chunk in chunks:
+        data = chunk.encode()
+        size += len(data)
+        if parts is not None:
+            parts.append(data)
+            if size > limit:
+                parts = None
+        yield data
+    if parts is not None:
+        feed_cache().set(key, b''.join(parts), getattr(settings, 'FEED_CACHE_TIMEOUT', 24 * 3600))
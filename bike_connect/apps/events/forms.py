@@ -17,7 +17,7 @@ class EventForm(forms.ModelForm):
         model = Event
 
         # Fields from the Event model to include in the form
-        fields = ['title', 'description', 'date', 'location', 'image']
+        fields = ['title', 'description', 'date', 'location', 'capacity', 'image']
 
         # Custom widgets for each field to add CSS classes and placeholders
         widgets = {
@@ -46,9 +46,29 @@ class EventForm(forms.ModelForm):
                     'placeholder': 'Enter location'  # Placeholder text for the input
                 }
             ),
+            'capacity': forms.NumberInput(
+                attrs={
+                    'class': 'form-control',  # Bootstrap styling class
+                    'min': 1,  # At least one rider
+                    'placeholder': 'No limit'  # Placeholder text for the input
+                }
+            ),
             'image': forms.ClearableFileInput(
                 attrs={
                     'class': 'form-control'  # Bootstrap styling class for file input
                 }
             ),
         }
+
+
+class EventImportForm(forms.Form):
+    """
+    Upload form of the admin's bulk event import.
+    """
+    file = forms.FileField(help_text="CSV, JSON (array or JSON Lines) or iCalendar file.")
+    format = forms.ChoiceField(
+        choices=[('', 'Detect from the file name'), ('csv', 'CSV'), ('json', 'JSON'), ('ics', 'iCalendar')],
+        required=False,
+    )
+    batch_size = forms.IntegerField(min_value=1, initial=500, help_text="Rows inserted per transaction.")
+    dry_run = forms.BooleanField(required=False, help_text="Only validate the file.")
@@ -0,0 +1,170 @@
+from datetime import timedelta, timezone
+
+# Product identifier written into every calendar (RFC 5545, section 3.7.3)
+PRODID = '-//Bike Connect//Events//EN'
+
+# Lines longer than this many octets are folded (RFC 5545, section 3.1)
+FOLD_LENGTH = 75
+
+CRLF = '\r\n'
+
+
+# -------------------------------
+# Writing
+# -------------------------------
+
+def escape_text(value):
+    """
+    Escapes a TEXT property value.
+    """
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """
+    Folds a content line into chunks of at most 75 octets, without splitting
+    multi-byte characters, and terminates it with CRLF.
+    """
+    if len(line.encode()) <= FOLD_LENGTH:
+        return line + CRLF
+    chunks, current, size = [], '', 0
+    for char in line:
+        width = len(char.encode())
+        # Continuation lines start with a space, which counts towards the limit
+        limit = FOLD_LENGTH if not chunks else FOLD_LENGTH - 1
+        if size + width > limit:
+            chunks.append(current)
+            current, size = '', 0
+        current += char
+        size += width
+    chunks.append(current)
+    return (CRLF + ' ').join(chunks) + CRLF
+
+
+def format_date(value):
+    return value.strftime('%Y%m%d')
+
+
+def format_datetime(value):
+    """
+    Formats an aware datetime as a UTC date-time (e.g. 20300101T120000Z).
+    """
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_start(name=None):
+    """
+    Returns the opening lines of a VCALENDAR, with an optional display name.
+    """
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{PRODID}', 'CALSCALE:GREGORIAN', 'METHOD:PUBLISH']
+    if name:
+        lines.append(f'X-WR-CALNAME:{escape_text(name)}')
+    return ''.join(fold(line) for line in lines)
+
+
+def calendar_end():
+    return fold('END:VCALENDAR')
+
+
+def vevent(uid, day, summary, dtstamp, description='', location='', url=None, last_modified=None, extra=()):
+    """
+    Returns an all-day VEVENT component.
+
+    Args:
+        uid: Globally unique, stable identifier of the event.
+        day: The date of the event.
+        summary: Title of the event.
+        dtstamp: Aware datetime the component was generated at.
+        description: Optional description.
+        location: Optional location.
+        url: Optional absolute URL of the event page.
+        last_modified: Optional aware datetime of the last change.
+        extra: Additional (name, value) pairs, written unescaped.
+    """
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{format_datetime(dtstamp)}',
+        f'DTSTART;VALUE=DATE:{format_date(day)}',
+        f'DTEND;VALUE=DATE:{format_date(day + timedelta(days=1))}',
+        f'SUMMARY:{escape_text(summary)}',
+    ]
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    if location:
+        lines.append(f'LOCATION:{escape_text(location)}')
+    if url:
+        lines.append(f'URL:{url}')
+    if last_modified:
+        lines.append(f'LAST-MODIFIED:{format_datetime(last_modified)}')
+    lines.extend(f'{name}:{value}' for name, value in extra)
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+
+def unescape_text(value):
+    """
+    Reverses `escape_text`.
+    """
+    output, chars = [], iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            output.append('\n' if escaped in ('n', 'N') else escaped)
+        else:
+            output.append(char)
+    return ''.join(output)
+
+
+def unfold_lines(stream):
+    """
+    Yields (line number, content line) pairs from a text stream, joining
+    folded continuation lines. The number is that of the first physical line.
+    """
+    current, start = None, 0
+    for number, raw in enumerate(stream, start=1):
+        raw = raw.rstrip('\r\n')
+        if raw[:1] in (' ', '\t') and current is not None:
+            current += raw[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = raw, number
+    if current:
+        yield start, current
+
+
+def split_property(line):
+    """
+    Splits a content line into (NAME, {PARAM: value}, value).
+    """
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ':' and not in_quotes:
+            head, value = line[:index], line[index + 1:]
+            break
+    else:
+        return line.upper(), {}, ''
+    name, *params = head.split(';')
+    parameters = {}
+    for param in params:
+        key, _, param_value = param.partition('=')
+        parameters[key.upper()] = param_value.strip('"')
+    return name.upper(), parameters, value
+
+
+def parse_date(value):
+    """
+    Returns the ISO date (YYYY-MM-DD) of a DATE or DATE-TIME value.
+    """
+    digits = value[:8]
+    return f'{digits[:4]}-{digits[4:6]}-{digits[6:8]}' if len(digits) == 8 and digits.isdigit() else value
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from bike_connect.apps.events import transfer
+
+
+class Command(BaseCommand):
+    """
+    Imports events from a CSV, JSON (array or JSON Lines) or iCalendar file.
+
+    Rows are validated with the EventForm rules and inserted in batches with
+    `bulk_create()`, one transaction per batch. Rejected rows are reported
+    with their line number and do not stop the import.
+
+    Examples:
+        python manage.py import_events season.csv --organizer alice
+        python manage.py import_events rides.ics --batch-size 200 --dry-run
+    """
+    help = "Bulk import events from a CSV, JSON or ICS file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import.")
+        parser.add_argument('--format', choices=sorted(transfer.PARSERS), help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=transfer.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--organizer', help="Username of the organizer of rows without one.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate the file without saving anything.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        organizer = None
+        if options['organizer']:
+            try:
+                organizer = get_user_model().objects.get(username=options['organizer'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Unknown user '{options['organizer']}'.")
+
+        try:
+            fmt = options['format'] or transfer.detect_format(options['path'])
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                report = transfer.import_file(
+                    stream, fmt, organizer=organizer, batch_size=options['batch_size'], dry_run=options['dry_run'],
+                )
+        except (OSError, transfer.ImportFormatError) as e:
+            raise CommandError(str(e))
+
+        for line in report.error_lines():
+            self.stderr.write(line)
+        if options['dry_run']:
+            self.stdout.write(f"{report.valid} valid rows, {len(report.errors)} rejected (dry run, nothing saved).")
+        else:
+            style = self.style.SUCCESS if not report.errors else self.style.WARNING
+            self.stdout.write(style(
+                f"Imported {report.created} events in {report.batches} batches, {len(report.errors)} rows rejected."
+            ))
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:37
+
+import cloudinary_storage.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(help_text='Enter the title of the event (max 200 characters).', max_length=200, verbose_name='Event Title')),
+                ('description', models.TextField(help_text='Provide a detailed description of the event.', verbose_name='Event Description')),
+                ('date', models.DateField(help_text='Specify the date when the event will take place.', verbose_name='Event Date')),
+                ('location', models.CharField(help_text='Enter the location of the event (max 200 characters).', max_length=200, verbose_name='Event Location')),
+                ('image', models.ImageField(blank=True, help_text='Optional image for the event.', max_length=255, null=True, storage=cloudinary_storage.storage.MediaCloudinaryStorage(), upload_to='events/', verbose_name='Event Image')),
+                ('organizer', models.ForeignKey(blank=True, help_text='The user organizing the event. The event will be deleted if the organizer is removed.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='organized_events', to=settings.AUTH_USER_MODEL, verbose_name='Event Organizer')),
+            ],
+            options={
+                'verbose_name': 'Event',
+                'verbose_name_plural': 'Events',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Participation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('joined', 'Joined'), ('cancelled', 'Cancelled')], default='joined', help_text="The user's participation status ('joined' or 'cancelled').", max_length=20, verbose_name='Participation Status')),
+                ('comment', models.TextField(blank=True, help_text="Optional comment about the user's participation.", null=True, verbose_name='Comment')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the participation was created.', verbose_name='Participation Created At')),
+                ('event', models.ForeignKey(help_text='The event the user is participating in.', on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='events.event', verbose_name='Event')),
+                ('user', models.ForeignKey(help_text='The user participating in the event.', on_delete=django.db.models.deletion.CASCADE, related_name='participations', to=settings.AUTH_USER_MODEL, verbose_name='Participant')),
+            ],
+            options={
+                'verbose_name': 'Participation',
+                'verbose_name_plural': 'Participations',
+                'unique_together': {('user', 'event')},
+            },
+        ),
+    ]
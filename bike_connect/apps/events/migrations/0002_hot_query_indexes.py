@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'id'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'date'], name='event_organizer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['user', 'status'], name='participation_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(condition=models.Q(('status', 'joined')), fields=['event'], name='participation_joined_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Geohash of the coordinates, used to find events near a point.', max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, help_text='Geocoded from the location (see core.geo).', null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, help_text='Geocoded from the location (see core.geo).', null=True, verbose_name='Longitude'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['geohash'], name='event_geohash_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:30
+
+import bike_connect.apps.core.images
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_participants(apps, schema_editor):
+    # Joins made before the counter existed
+    Event = apps.get_model('events', 'Event')
+    Participation = apps.get_model('events', 'Participation')
+    joined = (
+        Participation.objects.filter(event=OuterRef('pk'), status='joined')
+        .order_by().values('event').annotate(total=Count('pk')).values('total')
+    )
+    Event.objects.update(participant_count=Coalesce(Subquery(joined), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_geo_coordinates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Optional image for the event.', max_length=255, null=True, storage=bike_connect.apps.core.images.media_storage, upload_to='events/', validators=[bike_connect.apps.core.images.validate_image], verbose_name='Event Image'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum number of participants. Leave empty for no limit.', null=True, verbose_name='Capacity'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of joined participants, maintained by the participation service.', verbose_name='Participant Count'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp of the last change, used to answer conditional requests.', verbose_name='Updated At'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from cloudinary_storage.storage import MediaCloudinaryStorage
+from bike_connect.apps.core.images import media_storage, storage_url, validate_image
 
 
 # Get the custom User model for use in ForeignKey relationships
@@ -29,9 +29,32 @@ class Event(models.Model):
         verbose_name="Event Location",
         help_text="Enter the location of the event (max 200 characters)."
     )
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Latitude",
+        help_text="Geocoded from the location (see core.geo)."
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Longitude",
+        help_text="Geocoded from the location (see core.geo)."
+    )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Geohash",
+        help_text="Geohash of the coordinates, used to find events near a point."
+    )
     image = models.ImageField(
         upload_to='events/',
-        storage=MediaCloudinaryStorage(),
+        storage=media_storage,
+        validators=[validate_image],
         blank=True,
         null=True,
         max_length=255,
@@ -59,16 +82,60 @@ class Event(models.Model):
         verbose_name="Event Organizer",
         help_text="The user organizing the event. The event will be deleted if the organizer is removed."
     )
+    capacity = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        verbose_name="Capacity",
+        help_text="Maximum number of participants. Leave empty for no limit."
+    )
+    participant_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Participant Count",
+        help_text="Number of joined participants, maintained by the participation service."
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Updated At",
+        help_text="Timestamp of the last change, used to answer conditional requests."
+    )
 
     class Meta:
         verbose_name = "Event"
         verbose_name_plural = "Events"
         ordering = ['-date']  # Default ordering by event date (descending)
+        indexes = [
+            # Event list / API keyset pages (-date, -id) and landing page (date, id)
+            models.Index(fields=['date', 'id'], name='event_date_idx'),
+            # "Rides I organize" feeds, in date order
+            models.Index(fields=['organizer', 'date'], name='event_organizer_date_idx'),
+            # Distance queries read the geohash cells around a point
+            models.Index(fields=['geohash'], name='event_geohash_idx'),
+        ]
 
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the event without writing `participant_count` back.
+
+        The count is only changed by atomic UPDATEs (see `events.participation`),
+        so an instance loaded before a join must not overwrite it with its stale value.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'participant_count' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def is_full(self):
+        return self.capacity is not None and self.participant_count >= self.capacity
+
     def get_image_url(self):
-        if self.image and hasattr(self.image, 'url'):
-            return self.image.url
+        if self.image:
+            return storage_url(self.image.storage, self.image.name)
         return None
 
 
@@ -121,6 +188,12 @@ class Participation(models.Model):
         verbose_name = "Participation"
         verbose_name_plural = "Participations"
         unique_together = ('user', 'event')  # Prevent duplicate participations for the same user and event
+        indexes = [
+            # A user's joined events (feeds, profile)
+            models.Index(fields=['user', 'status'], name='participation_user_status_idx'),
+            # Joined participants of an event (detail page, participant counts)
+            models.Index(fields=['event'], condition=models.Q(status='joined'), name='participation_joined_idx'),
+        ]
 
     def __str__(self):
         """
@@ -0,0 +1,187 @@
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from bike_connect.apps.core.caching import bump_model_version
+from bike_connect.apps.users import activity
+from .feeds import bump_feed_stamps
+from .models import Event, Participation
+
+# Outcomes of join() and leave()
+JOINED = 'joined'
+ALREADY_JOINED = 'already_joined'
+FULL = 'full'
+LEFT = 'left'
+NOT_JOINED = 'not_joined'
+
+
+# -------------------------------
+# Per-request Participation Index
+# -------------------------------
+class ParticipationIndex:
+    """
+    Maps event ids to the current user's participation status.
+
+    The index is built with one query over all the events rendered on a page,
+    so templates can look up the status of every card without querying the
+    database again. Events that were not preloaded are fetched on demand.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._statuses = {}
+
+    def load(self, events):
+        """
+        Fetches the participation status for every event not indexed yet.
+
+        Args:
+            events: Iterable of Event instances or event ids.
+
+        Returns:
+            ParticipationIndex: The index itself, to allow chaining.
+        """
+        event_ids = {getattr(event, 'pk', event) for event in events if event is not None}
+        missing = event_ids - self._statuses.keys()
+        if not missing:
+            return self
+
+        # Events without a participation record are remembered as None so that
+        # they are not looked up again.
+        self._statuses.update(dict.fromkeys(missing))
+        if self.user.is_authenticated:
+            self._statuses.update(
+                Participation.objects.filter(user=self.user, event_id__in=missing)
+                .values_list('event_id', 'status')
+            )
+        return self
+
+    def status(self, event):
+        """
+        Returns the participation status ('joined', 'cancelled') or None.
+        """
+        event_id = getattr(event, 'pk', event)
+        if event_id not in self._statuses:
+            self.load([event_id])
+        return self._statuses[event_id]
+
+    def __contains__(self, event):
+        """
+        Checks whether the user has currently joined the given event.
+        """
+        return self.status(event) == 'joined'
+
+
+def participation_index(user):
+    """
+    Returns the participation index attached to the given user.
+
+    The index is stored on the user instance, which Django loads once per
+    request, so it lives exactly as long as the request does and is shared by
+    the view and by the `participation_status` template filter.
+    """
+    index = getattr(user, '_participation_index', None)
+    if index is None:
+        index = ParticipationIndex(user)
+        user._participation_index = index
+    return index
+
+
+# -------------------------------
+# Joining and Leaving
+# -------------------------------
+# A participation is never deleted: leaving marks it 'cancelled' and joining
+# again reactivates it. Every transition is a single atomic statement, and
+# the event's `participant_count` moves with it through an F() expression, in
+# the same transaction. Both functions touch the participation row first and
+# the event row second, so concurrent calls always lock in the same order.
+
+def _activate(user_id, event_id):
+    """
+    Inserts a 'joined' participation, or reactivates a cancelled one.
+
+    One INSERT ... ON CONFLICT statement: the unique (user, event) conflict is
+    resolved by the database instead of a racy get_or_create().
+
+    Returns:
+        bool: False if the user had already joined.
+    """
+    table = connection.ops.quote_name(Participation._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, event_id, status, created_at) VALUES (%s, %s, 'joined', %s) "
+            f"ON CONFLICT (user_id, event_id) DO UPDATE SET status = 'joined' "
+            f"WHERE {table}.status <> 'joined'",
+            [user_id, event_id, now()],
+        )
+        return cursor.rowcount == 1
+
+
+def _changed(user_id):
+    # update() bypasses the post_save receivers, including the activity
+    # summaries, which join() and leave() update themselves
+    bump_feed_stamps([user_id])
+    bump_model_version(Event)
+
+
+def join(user, event_id):
+    """
+    Makes the user a participant of the event, within its capacity.
+
+    The seat is taken with a conditional UPDATE (`participant_count < capacity`),
+    which the database re-checks under the row lock, so concurrent joins can
+    never overbook the event or lose an increment.
+
+    Returns:
+        str: JOINED, ALREADY_JOINED or FULL.
+    """
+    with transaction.atomic():
+        if not _activate(user.pk, event_id):
+            return ALREADY_JOINED
+        seated = Event.objects.filter(
+            Q(capacity__isnull=True) | Q(participant_count__lt=F('capacity')), pk=event_id,
+        ).update(participant_count=F('participant_count') + 1, updated_at=now())
+        if not seated:
+            # Undo the participation, keep the transaction usable for the caller
+            transaction.set_rollback(True)
+            return FULL
+    _changed(user.pk)
+    activity.record_join(user.pk, event_id)
+    return JOINED
+
+
+def leave(user, event_id):
+    """
+    Cancels the user's participation and frees the seat.
+
+    Returns:
+        str: LEFT or NOT_JOINED.
+    """
+    with transaction.atomic():
+        cancelled = Participation.objects.filter(user=user, event_id=event_id, status='joined').update(status='cancelled')
+        if not cancelled:
+            return NOT_JOINED
+        Event.objects.filter(pk=event_id).update(participant_count=F('participant_count') - 1, updated_at=now())
+    _changed(user.pk)
+    activity.forget(user.pk, 'joined', event_id)
+    return LEFT
+
+
+def refresh_participant_counts(events=None):
+    """
+    Recomputes `participant_count` from the participation rows, for events
+    whose participations were written around join() / leave() (admin, bulk
+    loads).
+
+    Args:
+        events: Optional queryset of events, defaults to all of them.
+    """
+    events = Event.objects.all() if events is None else events
+    joined = (
+        Participation.objects.filter(event=OuterRef('pk'), status='joined')
+        .order_by().values('event').annotate(total=Count('pk')).values('total')
+    )
+    updated = events.update(participant_count=Coalesce(Subquery(joined), 0), updated_at=now())
+    bump_model_version(Event)
+    return updated
@@ -1,19 +1,73 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+
+from bike_connect.apps.core.fieldsets import SparseFieldsetSerializerMixin
 from .models import Event
 
+# Length of the description excerpt shipped in list responses
+EXCERPT_LENGTH = 160
+
+
+def _distances(rows):
+    # Fast JSON path: the annotation is passed through as is
+    return [row['distance'] for row in rows]
+
+
+class OrganizerSerializer(serializers.ModelSerializer):
+    """
+    Minimal, read-only representation of an event organizer.
+    """
+
+    class Meta:
+        model = get_user_model()
+        fields = ['id', 'username']
+
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
-    A serializer for the Event model, used to convert Event instances to JSON format
-    and validate incoming data for creating or updating Event objects.
+    A serializer for the Event model, used for the detail, create and update
+    endpoints. The organizer is embedded and set from the requesting user.
 
-    This serializer uses Django REST Framework's ModelSerializer, which automatically generates
-    fields based on the Event model and includes built-in validation.
+    Supports sparse fieldsets: `?fields=id,title` renders only those fields.
     """
+    organizer = OrganizerSerializer(read_only=True)
+    # Kilometres from the point of a distance query (see `geo.parse_geo_query`), else null
+    distance = serializers.FloatField(read_only=True)
+
+    # The nested organizer reads these fields through select_related; the
+    # distance is annotated by the view
+    field_sources = {'organizer': ('organizer__id', 'organizer__username'), 'distance': ()}
+    fast_batch_fields = {'distance': (('distance',), _distances)}
 
     class Meta:
         # Specifies the model associated with this serializer
         model = Event
 
-        # Includes all fields from the Event model in the serialized output
-        fields = '__all__'
+        # Fields rendered in detail responses
+        fields = [
+            'id', 'title', 'description', 'date', 'location', 'latitude', 'longitude', 'distance', 'capacity',
+            'participant_count', 'image', 'organizer',
+        ]
+
+
+class EventListSerializer(EventSerializer):
+    """
+    Compact Event representation for list responses: the full description is
+    replaced by a short excerpt.
+    """
+    excerpt = serializers.SerializerMethodField()
+
+    field_sources = {**EventSerializer.field_sources, 'excerpt': ('description',)}
+
+    class Meta(EventSerializer.Meta):
+        fields = [
+            'id', 'title', 'excerpt', 'date', 'location', 'latitude', 'longitude', 'distance', 'capacity',
+            'participant_count', 'image', 'organizer',
+        ]
+
+    def get_excerpt(self, event):
+        # Plain slicing; Truncator is an order of magnitude slower on long lists
+        description = event.description
+        if len(description) <= EXCERPT_LENGTH:
+            return description
+        return description[:EXCERPT_LENGTH - 1].rstrip() + '…'
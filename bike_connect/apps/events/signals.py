@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+
+from .feeds import bump_feed_stamps
+from .models import Event, Participation
+
+
+# -------------------------------
+# Calendar Feed Invalidation
+# -------------------------------
+
+def participation_changed(sender, instance, raw=False, **kwargs):
+    """
+    Joining, leaving or cancelling changes the participant's feed.
+    """
+    if not raw:
+        bump_feed_stamps([instance.user_id])
+
+
+def event_changed(sender, instance, raw=False, **kwargs):
+    """
+    An edited event changes the feeds of its organizer and of its participants.
+    """
+    if raw:
+        return
+    participants = Participation.objects.filter(event_id=instance.pk, status='joined').values_list('user_id', flat=True)
+    bump_feed_stamps([instance.organizer_id, *participants])
+
+
+def connect_signals():
+    """
+    Connects the receivers keeping the calendar feed version stamps current.
+    """
+    post_save.connect(participation_changed, sender=Participation, dispatch_uid='feed-participation-save')
+    post_delete.connect(participation_changed, sender=Participation, dispatch_uid='feed-participation-delete')
+    post_save.connect(event_changed, sender=Event, dispatch_uid='feed-event-save')
+    post_delete.connect(event_changed, sender=Event, dispatch_uid='feed-event-delete')
@@ -1,5 +1,5 @@
 from django import template
-from ..models import Participation
+from ..participation import participation_index
 
 # Register the custom template tag or filter library
 register = template.Library()
@@ -10,9 +10,9 @@ def participation_status(user, event):
     """
     Custom template filter to check a user's participation status for a specific event.
 
-    This filter queries the `Participation` model to determine if a user has joined or cancelled
-    participation in a given event. It is useful for templates that need to display the status of a
-    user's participation (e.g., joined, cancelled, or not participating).
+    This filter looks the event up in the user's per-request participation index. Views
+    that render many events preload the index with a single query, so the filter does not
+    hit the database per card; events that were not preloaded are fetched on demand.
 
     Usage in templates:
         {{ user|participation_status:event }}
@@ -25,12 +25,7 @@ def participation_status(user, event):
         str: The participation status ('joined', 'cancelled') if the user has a record.
         None: If the user does not have a participation record for the event.
     """
-    try:
-        # Query the Participation model to find the user's participation record for the event.
-        participation = Participation.objects.get(user=user, event=event)
-
-        # Return the status of the participation (e.g., 'joined', 'cancelled').
-        return participation.status
-    except Participation.DoesNotExist:
-        # If no participation record exists for the user and event, return None.
+    if not getattr(user, 'is_authenticated', False):
+        # Anonymous visitors never have participation records.
         return None
+    return participation_index(user).status(event)
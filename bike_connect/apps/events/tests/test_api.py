@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.events.serializers import EXCERPT_LENGTH
+
+User = get_user_model()
+
+
+class EventAPITest(TestCase):
+    """
+    Tests for the list/detail serializers and sparse fieldsets of the events API.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(username='organizer', password='password123')
+        for i in range(8):
+            Event.objects.create(title=f"Ride {i}", description="Long ride " * 50, location="Sofia",
+                                 date=date.today() + timedelta(days=i), organizer=cls.organizer)
+        cls.event = Event.objects.first()
+
+    def test_list_is_compact_and_runs_one_page_query(self):
+        # One aggregate for the ETag, one query for the page
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('event-list'))
+        row = response.data['results'][0]
+        self.assertNotIn('description', row)
+        self.assertEqual(len(row['excerpt']), EXCERPT_LENGTH)
+        self.assertEqual(row['organizer'], {'id': self.organizer.id, 'username': 'organizer'})
+
+    def test_sparse_fieldset(self):
+        with self.assertNumQueries(2) as context:
+            response = self.client.get(reverse('event-list'), {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        # Only the rendered fields (and the keyset ordering) are loaded
+        sql = context.captured_queries[-1]['sql']
+        self.assertNotIn('description', sql)
+        self.assertNotIn('users_customuser', sql)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('event-list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_has_full_description(self):
+        response = self.client.get(reverse('event-detail', args=[self.event.pk]))
+        self.assertEqual(response.data['description'], self.event.description)
+        self.assertEqual(response.data['organizer']['username'], 'organizer')
+
+    def test_create_sets_organizer(self):
+        self.client.force_login(self.organizer)
+        response = self.client.post(reverse('event-list'), {
+            'title': "New ride", 'description': "Ride", 'date': '2030-01-01', 'location': "Varna",
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Event.objects.get(pk=response.data['id']).organizer, self.organizer)
@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from bike_connect.apps.events.models import Event, Participation
+
+User = get_user_model()
+
+GIF = b'GIF87a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x08\x04\x00\x01\x04\x04\x00;'
+
+
+class AsyncEventViewsTest(TestCase):
+    """
+    Tests for the async join / leave / upload endpoints, through the ASGI handler.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='rider', password='password123')
+        cls.event = Event.objects.create(title="Ride", description="Ride", date=date.today(), location="Sofia")
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        storages = {**settings.STORAGES, 'media': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': self.media, 'base_url': '/media/'},
+        }}
+        self.enterContext(override_settings(STORAGES=storages))
+
+    async def test_join_and_leave(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(reverse('events:join_event', args=[self.event.pk]))
+        self.assertEqual(response.json(), {'status': 'joined'})
+        self.assertTrue(await Participation.objects.filter(user=self.user, status='joined').aexists())
+        response = await self.async_client.post(reverse('events:leave_event', args=[self.event.pk]))
+        self.assertEqual(response.json(), {'status': 'left'})
+
+    async def test_join_requires_post_and_login(self):
+        response = await self.async_client.post(reverse('events:join_event', args=[self.event.pk]))
+        self.assertEqual(response.status_code, 302)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('events:join_event', args=[self.event.pk]))
+        self.assertEqual(response.status_code, 405)
+
+    async def test_upload(self):
+        await self.async_client.aforce_login(self.user)
+        image = SimpleUploadedFile('ride.gif', GIF, content_type='image/gif')
+        response = await self.async_client.post(reverse('events:upload_event_image'), {'image': image})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'url': '/media/events/ride.gif'})
+
+        response = await self.async_client.post(reverse('events:upload_event_image'))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,101 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.events.feeds import feed_token
+from bike_connect.apps.events.models import Event, Participation
+
+User = get_user_model()
+
+
+class EventFeedTest(TestCase):
+    """
+    Tests for the per-user iCalendar feeds and their version stamps.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rider = User.objects.create_user(username='rider', password='password123')
+        cls.organizer = User.objects.create_user(username='organizer', password='password123')
+        cls.ride = Event.objects.create(title="Sunday ride", description="Coffee, then hills", location="Sofia",
+                                        date=date(2030, 6, 1), organizer=cls.organizer)
+        cls.other = Event.objects.create(title="Other ride", description="Flat", location="Varna",
+                                         date=date(2030, 6, 2), organizer=cls.organizer)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.url = reverse('events:event_feed', args=[feed_token(self.rider)])
+
+    def fetch(self, url=None, **headers):
+        response = self.client.get(url or self.url, **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, content.decode()
+
+    def test_joined_feed_lists_joined_events_only(self):
+        Participation.objects.create(user=self.rider, event=self.ride)
+        Participation.objects.create(user=self.rider, event=self.other, status='cancelled')
+        response, body = self.fetch()
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('SUMMARY:Sunday ride', body)
+        self.assertIn('DESCRIPTION:Coffee\\, then hills', body)
+        self.assertNotIn('Other ride', body)
+
+    def test_organizer_feed(self):
+        url = reverse('events:event_feed', args=[feed_token(self.organizer, 'organized')])
+        _, body = self.fetch(url)
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+
+    def test_polling_is_served_without_queries(self):
+        Participation.objects.create(user=self.rider, event=self.ride)
+        response, first = self.fetch()
+        with self.assertNumQueries(0):
+            cached, second = self.fetch()
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(first, second)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_participation_and_event_changes_bump_the_stamp(self):
+        etag = self.fetch()[0]['ETag']
+        Participation.objects.create(user=self.rider, event=self.ride)
+        response, body = self.fetch(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Sunday ride', body)
+
+        self.ride.title = "Saturday ride"
+        self.ride.save()
+        response, body = self.fetch(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertIn('Saturday ride', body)
+
+        Participation.objects.filter(user=self.rider).delete()
+        self.assertNotIn('Saturday ride', self.fetch()[1])
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get(reverse('events:event_feed', args=['forged'])).status_code, 404)
+        other = reverse('events:event_feed', args=[feed_token(self.rider, 'everything')])
+        self.assertEqual(self.client.get(other).status_code, 404)
+
+    def test_profile_links_the_feeds(self):
+        self.client.force_login(self.rider)
+        self.assertContains(self.client.get(reverse('users:profile')), self.url)
+
+    def test_replaced_feed_links_stop_working(self):
+        self.client.force_login(self.rider)
+        self.client.post(reverse('users:reset_feed_links'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.rider.refresh_from_db()
+        url = reverse('events:event_feed', args=[feed_token(self.rider)])
+        self.assertNotEqual(url, self.url)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertContains(self.client.get(reverse('users:profile')), url)
+
+    def test_inactive_users_feeds_are_gone(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.rider.is_active = False
+        self.rider.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,220 @@
+import threading
+from datetime import date, timedelta
+from unittest import SkipTest
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.events import participation
+from bike_connect.apps.events.participation import participation_index
+from bike_connect.apps.events.templatetags.participation_tags import participation_status
+
+User = get_user_model()
+
+
+class ParticipationIndexTest(TestCase):
+    """
+    Tests for the per-request participation index and the participation_status filter.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.joined = Event.objects.create(title="Joined", description="Ride", date=date.today(), location="Sofia")
+        self.other = Event.objects.create(title="Other", description="Ride", date=date.today(), location="Plovdiv")
+        Participation.objects.create(user=self.user, event=self.joined)
+
+    def test_index_loads_all_events_with_one_query(self):
+        """
+        Test that loading the index runs a single query and lookups run none.
+        """
+        index = participation_index(self.user)
+        with self.assertNumQueries(1):
+            index.load([self.joined, self.other])
+        with self.assertNumQueries(0):
+            self.assertEqual(index.status(self.joined), 'joined')
+            self.assertIsNone(index.status(self.other))
+            self.assertIn(self.joined, index)
+
+    def test_filter_is_backward_compatible(self):
+        """
+        Test that the filter still answers for events that were not preloaded.
+        """
+        self.assertEqual(participation_status(self.user, self.joined), 'joined')
+        self.assertIsNone(participation_status(self.user, self.other))
+
+    def test_filter_for_anonymous_user(self):
+        """
+        Test that anonymous users never have a participation status.
+        """
+        with self.assertNumQueries(0):
+            self.assertIsNone(participation_status(AnonymousUser(), self.joined))
+
+
+class ParticipationQueryCountTest(TestCase):
+    """
+    Tests that event pages run a constant number of queries regardless of how many events they show.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.client.force_login(self.user)
+
+    def create_events(self, count):
+        """
+        Creates `count` events and joins every other one.
+        """
+        for i in range(count):
+            event = Event.objects.create(
+                title=f"Ride {i}",
+                description="Group ride",
+                date=date.today() + timedelta(days=i),
+                location="Sofia",
+            )
+            if i % 2 == 0:
+                Participation.objects.create(user=self.user, event=event)
+
+    def count_queries(self, url):
+        """
+        Returns the number of queries run while rendering the given URL.
+        """
+        # Compare cold renders, not cached fragments, sessions or users
+        for cache in caches.all():
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_event_list_query_count_is_constant(self):
+        self.create_events(2)
+        few = self.count_queries(reverse('events:event_list'))
+        self.create_events(6)
+        many = self.count_queries(reverse('events:event_list'))
+        self.assertEqual(few, many)
+
+    def test_landing_page_query_count_is_constant(self):
+        self.create_events(2)
+        few = self.count_queries(reverse('home'))
+        self.create_events(6)
+        many = self.count_queries(reverse('home'))
+        self.assertEqual(few, many)
+
+
+class ParticipationServiceTest(TestCase):
+    """
+    Tests for the atomic join / leave service and the denormalized participant count.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.event = Event.objects.create(title="Ride", description="Ride", date=date.today(), location="Sofia")
+
+    def count(self):
+        return Event.objects.values_list('participant_count', flat=True).get(pk=self.event.pk)
+
+    def test_join_and_leave_keep_the_count(self):
+        self.assertEqual(participation.join(self.user, self.event.pk), participation.JOINED)
+        self.assertEqual(participation.join(self.user, self.event.pk), participation.ALREADY_JOINED)
+        self.assertEqual(participation.join(self.other, self.event.pk), participation.JOINED)
+        self.assertEqual(self.count(), 2)
+
+        self.assertEqual(participation.leave(self.user, self.event.pk), participation.LEFT)
+        self.assertEqual(participation.leave(self.user, self.event.pk), participation.NOT_JOINED)
+        self.assertEqual(self.count(), 1)
+
+    def test_leaving_cancels_and_joining_again_reactivates(self):
+        participation.join(self.user, self.event.pk)
+        participation.leave(self.user, self.event.pk)
+        record = Participation.objects.get(user=self.user, event=self.event)
+        self.assertEqual(record.status, 'cancelled')
+
+        self.assertEqual(participation.join(self.user, self.event.pk), participation.JOINED)
+        self.assertEqual(Participation.objects.get(pk=record.pk).status, 'joined')
+        self.assertEqual(self.count(), 1)
+
+    def test_capacity_is_enforced(self):
+        Event.objects.filter(pk=self.event.pk).update(capacity=1)
+        participation.join(self.user, self.event.pk)
+        self.assertEqual(participation.join(self.other, self.event.pk), participation.FULL)
+        # The rejected join left no participation behind
+        self.assertFalse(Participation.objects.filter(user=self.other).exists())
+        self.assertEqual(self.count(), 1)
+
+    def test_saving_a_stale_event_keeps_the_count(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        participation.join(self.user, self.event.pk)
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.count(), 1)
+
+    def test_refresh_participant_counts(self):
+        Participation.objects.create(user=self.user, event=self.event)
+        Participation.objects.create(user=self.other, event=self.event, status='cancelled')
+        participation.refresh_participant_counts()
+        self.assertEqual(self.count(), 1)
+
+    def test_views(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('events:join_event', args=[self.event.pk]))
+        self.assertEqual(response.json(), {'status': 'joined'})
+        response = self.client.post(reverse('events:join_event', args=[self.event.pk]))
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('events:leave_event', args=[self.event.pk]))
+        self.assertEqual(response.json(), {'status': 'left'})
+        response = self.client.post(reverse('events:leave_event', args=[self.event.pk + 1]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ConcurrentJoinTest(TransactionTestCase):
+    """
+    Stress test: many riders joining a small event at the same time.
+
+    Runs against the file-backed test database of the CI settings.
+    """
+    THREADS = 12
+    CAPACITY = 5
+
+    @classmethod
+    def setUpClass(cls):
+        # Checked once the test database exists: its name is not known at import time
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise SkipTest("shared-cache in-memory SQLite raises 'table is locked' instead of waiting")
+        super().setUpClass()
+
+    def test_concurrent_joins_respect_the_capacity(self):
+        users = [User.objects.create_user(username=f'rider{i}', password='x') for i in range(self.THREADS)]
+        event = Event.objects.create(
+            title="Ride", description="Ride", date=date.today(), location="Sofia", capacity=self.CAPACITY,
+        )
+        barrier = threading.Barrier(self.THREADS)
+        outcomes, errors = [], []
+
+        def worker(user):
+            try:
+                barrier.wait()
+                # Every rider also retries once, which must be a no-op
+                for _ in range(2):
+                    outcomes.append(participation.join(user, event.pk))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(outcomes.count(participation.JOINED), self.CAPACITY)
+        event.refresh_from_db()
+        self.assertEqual(event.participant_count, self.CAPACITY)
+        self.assertEqual(Participation.objects.filter(event=event, status='joined').count(), self.CAPACITY)
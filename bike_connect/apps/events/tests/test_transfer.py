@@ -0,0 +1,162 @@
+import io
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.core.models import SearchEntry
+from bike_connect.apps.events import ical
+from bike_connect.apps.events.feeds import feed_token
+from bike_connect.apps.events.models import Event
+from bike_connect.apps.events.transfer import (
+    export_ics, export_json, export_rows, import_events, parse_csv, parse_ics, parse_json,
+)
+
+User = get_user_model()
+
+CSV = """title,description,date,location,organizer
+Morning ride,Easy loop,2030-05-01,Sofia,alice
+,Missing title,2030-05-02,Sofia,
+Gravel day,"Dusty, long",not-a-date,Plovdiv,
+Night ride,With lights,2030-05-03,Varna,nobody
+Hill repeats,Five times,2030-05-04,Sofia,
+"""
+
+
+class ImportTest(TestCase):
+    """
+    Tests for parsing and bulk importing event files.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(username='alice', password='password123')
+        cls.admin = User.objects.create_superuser(username='admin', password='password123', email='a@example.com')
+
+    def test_csv_import_reports_bad_rows(self):
+        report = import_events(parse_csv(io.StringIO(CSV)), organizer=self.admin, batch_size=2)
+        self.assertEqual(report.created, 2)
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5])
+        self.assertIn('title', report.errors[0][1])
+        self.assertIn('date', report.errors[1][1])
+        self.assertIn('organizer', report.errors[2][1])
+        self.assertEqual(Event.objects.get(title="Morning ride").organizer, self.alice)
+        self.assertEqual(Event.objects.get(title="Hill repeats").organizer, self.admin)
+        # bulk_create() bypasses signals, the importer indexes the rows itself
+        self.assertEqual(SearchEntry.objects.filter(kind='event').count(), 2)
+
+    def test_imported_events_are_geocoded(self):
+        import_events(parse_csv(io.StringIO(CSV)), organizer=self.admin)
+        response = self.client.get(reverse('events:event_list'), {'near': 'Sofia', 'radius': '10'})
+        self.assertEqual(
+            {event['title'] for event in response.context['events']}, {"Morning ride", "Hill repeats"},
+        )
+
+    def test_import_refreshes_organizer_feeds(self):
+        url = reverse('events:event_feed', args=[feed_token(self.admin, 'organized')])
+
+        def fetch():
+            response = self.client.get(url)
+            return (b''.join(response.streaming_content) if response.streaming else response.content).decode()
+
+        self.assertNotIn('BEGIN:VEVENT', fetch())
+        with self.captureOnCommitCallbacks(execute=True):
+            import_events(parse_csv(io.StringIO(CSV)), organizer=self.admin)
+        self.assertIn('SUMMARY:Hill repeats', fetch())
+
+    def test_batches_use_few_queries(self):
+        rows = ((i, {'title': f"Ride {i}", 'description': "Ride", 'date': '2030-01-01', 'location': "Sofia"})
+                for i in range(1, 51))
+        with self.assertNumQueries(5 * 4):  # Per batch: savepoint, insert, index insert, release
+            report = import_events(rows, batch_size=10)
+        self.assertEqual((report.created, report.batches), (50, 5))
+
+    def test_dry_run_saves_nothing(self):
+        report = import_events(parse_csv(io.StringIO(CSV)), dry_run=True)
+        self.assertEqual((report.valid, report.created), (2, 0))
+        self.assertFalse(Event.objects.exists())
+
+    def test_json_array_and_lines_are_streamed(self):
+        items = [{'title': f"Ride {i}", 'description': "Ride ü", 'date': '2030-01-01', 'location': "Sofia"}
+                 for i in range(20)]
+        array = json.dumps(items)
+        # A tiny chunk size forces objects to span several reads
+        self.assertEqual([item for _, item in parse_json(io.StringIO(array), chunk_size=7)], items)
+        lines = '\n'.join(json.dumps(item) for item in items)
+        self.assertEqual([item for _, item in parse_json(io.StringIO(lines), chunk_size=7)], items)
+
+    def test_ics_parsing(self):
+        calendar = (
+            "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nSUMMARY:Coffee\\, then ride\r\n"
+            "DESCRIPTION:Line one\\nline \r\n two\r\nDTSTART;TZID=Europe/Sofia:20300601T080000\r\n"
+            "LOCATION:Sofia\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+        )
+        [(line, row)] = list(parse_ics(io.StringIO(calendar)))
+        self.assertEqual(line, 2)
+        self.assertEqual(row, {'title': "Coffee, then ride", 'description': "Line one\nline two",
+                               'date': '2030-06-01', 'location': "Sofia"})
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(CSV)
+        self.addCleanup(os.remove, f.name)
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_events', f.name, organizer='admin', stdout=out, stderr=err)
+        self.assertIn("Imported 2 events", out.getvalue())
+        self.assertIn("line 4: date:", err.getvalue())
+
+    def test_admin_import(self):
+        self.client.force_login(self.admin)
+        upload = SimpleUploadedFile('season.csv', CSV.encode())
+        response = self.client.post(reverse('admin:events_event_import'), {'file': upload, 'batch_size': 100})
+        self.assertContains(response, "line 5: organizer: Unknown user")
+        self.assertEqual(Event.objects.count(), 2)
+
+
+class ExportTest(TestCase):
+    """
+    Tests for the streaming exports.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username='admin', password='password123', email='a@example.com')
+        for i in range(5):
+            Event.objects.create(title=f"Ride, {i}", description="Long; ride " * 20, location="Sofia",
+                                 date=date(2030, 1, 1 + i), organizer=cls.admin)
+
+    def test_streaming_view_is_staff_only(self):
+        url = reverse('events:event_export', args=['csv'])
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.admin)
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,title,description,date,location,organizer')
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(self.client.get(reverse('events:event_export', args=['xml'])).status_code, 404)
+
+    def test_json_export_round_trips(self):
+        payload = ''.join(export_json(export_rows(chunk_size=2)))
+        Event.objects.all().delete()
+        report = import_events(parse_json(io.StringIO(payload)))
+        self.assertEqual(report.created, 5)
+        self.assertEqual(Event.objects.filter(organizer=self.admin).count(), 5)
+
+    def test_ics_export_round_trips(self):
+        payload = ''.join(export_ics(export_rows()))
+        self.assertTrue(all(len(line.encode()) <= ical.FOLD_LENGTH for line in payload.split('\r\n')))
+        rows = [row for _, row in parse_ics(io.StringIO(payload, newline=''))]
+        self.assertEqual(rows[0], {'title': "Ride, 0", 'description': "Long; ride " * 20,
+                                   'date': '2030-01-01', 'location': "Sofia"})
+
+    def test_changelist_links_import(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:events_event_changelist'))
+        self.assertContains(response, reverse('admin:events_event_import'))
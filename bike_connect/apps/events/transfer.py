@@ -0,0 +1,331 @@
+import csv
+import json
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.timezone import now
+
+from bike_connect.apps.core import geo
+from bike_connect.apps.core.caching import bump_model_version
+from bike_connect.apps.core.search import index_new_instances
+from bike_connect.apps.users import activity
+from . import feeds, ical
+from .forms import EventForm
+from .models import Event
+
+User = get_user_model()
+
+# Rows inserted per bulk_create() call and transaction
+DEFAULT_BATCH_SIZE = 500
+
+# Rows fetched per database round trip when exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Columns of CSV/JSON files; `organizer` holds a username
+COLUMNS = ('title', 'description', 'date', 'location', 'organizer')
+
+# iCalendar properties read on import -> event field
+ICS_PROPERTIES = {'SUMMARY': 'title', 'DESCRIPTION': 'description', 'DTSTART': 'date', 'LOCATION': 'location'}
+
+
+class ImportFormatError(ValueError):
+    """
+    Raised when a file cannot be parsed at all (as opposed to invalid rows).
+    """
+
+
+# -------------------------------
+# Parsing
+# -------------------------------
+
+def parse_csv(stream):
+    """
+    Yields (line number, row dict) pairs from a CSV text stream with a header row.
+    """
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    missing = {'title', 'date'} - {name.strip().lower() for name in reader.fieldnames}
+    if missing:
+        raise ImportFormatError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+    for row in reader:
+        yield reader.line_num, {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def parse_json(stream, chunk_size=64 * 1024):
+    """
+    Yields (item number, object) pairs from a JSON array or JSON Lines stream.
+
+    The stream is decoded incrementally, one object at a time, so memory use
+    does not depend on the size of the file.
+    """
+    decoder = json.JSONDecoder()
+    buffer, eof, number = '', False, 0
+    in_array = None  # Unknown until the first character is read
+
+    while True:
+        buffer = buffer.lstrip()
+        if in_array and buffer[:1] == ',':
+            buffer = buffer[1:]
+            continue
+        if not buffer:
+            if eof:
+                break
+            chunk = stream.read(chunk_size)
+            eof, buffer = not chunk, buffer + chunk
+            continue
+        if in_array is None:
+            in_array = buffer[0] == '['
+            buffer = buffer[1:] if in_array else buffer
+            continue
+        if in_array and buffer[0] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ImportFormatError(f"Invalid JSON after item {number}: {e.msg}")
+            # The item continues in the next chunk
+            chunk = stream.read(chunk_size)
+            eof, buffer = not chunk, buffer + chunk
+            continue
+        buffer = buffer[end:]
+        number += 1
+        yield number, item
+
+    if in_array:
+        raise ImportFormatError("Unterminated JSON array")
+
+
+def parse_ics(stream):
+    """
+    Yields (line number, row dict) pairs for every VEVENT of an iCalendar stream.
+    """
+    event, start = None, 0
+    for number, line in ical.unfold_lines(stream):
+        name, params, value = ical.split_property(line)
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            event, start = {}, number
+        elif name == 'END' and value.upper() == 'VEVENT' and event is not None:
+            yield start, event
+            event = None
+        elif event is not None and name in ICS_PROPERTIES:
+            field = ICS_PROPERTIES[name]
+            event[field] = ical.parse_date(value) if field == 'date' else ical.unescape_text(value)
+
+
+PARSERS = {'csv': parse_csv, 'json': parse_json, 'ics': parse_ics}
+
+
+def detect_format(filename):
+    """
+    Returns the import format matching a file name's extension.
+    """
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    fmt = {'jsonl': 'json', 'ical': 'ics'}.get(extension, extension)
+    if fmt not in PARSERS:
+        raise ImportFormatError(f"Unsupported file type: {filename}")
+    return fmt
+
+
+# -------------------------------
+# Importing
+# -------------------------------
+class ImportReport:
+    """
+    Outcome of an import: the number of events created and the rejected rows.
+    """
+
+    def __init__(self):
+        self.valid = 0  # Rows that passed validation (created unless dry run)
+        self.created = 0
+        self.batches = 0
+        self.errors = []  # (line number, {field: [messages]})
+
+    def add_error(self, line, errors):
+        self.errors.append((line, errors))
+
+    def error_lines(self):
+        """
+        Yields one human-readable line per rejected row.
+        """
+        for line, errors in self.errors:
+            details = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in errors.items())
+            yield f"line {line}: {details}"
+
+
+def _flush(pending, report, dry_run):
+    """
+    Resolves the organizers of a batch with one query and inserts it.
+    """
+    usernames = {username for _, _, username in pending if username}
+    organizers = {user.username: user for user in User.objects.filter(username__in=usernames)} if usernames else {}
+
+    batch = []
+    for line, event, username in pending:
+        if username:
+            if username not in organizers:
+                report.add_error(line, {'organizer': [f"Unknown user '{username}'."]})
+                continue
+            event.organizer = organizers[username]
+        # bulk_create() skips the pre_save receiver that geocodes the location
+        geo.locate(event)
+        batch.append((line, event))
+    report.valid += len(batch)
+    if dry_run or not batch:
+        return
+
+    try:
+        with transaction.atomic():
+            created = Event.objects.bulk_create([event for _, event in batch])
+            index_new_instances(created)
+            # bulk_create() skips the post_save receiver that invalidates the organizers' feeds
+            organizer_ids = {event.organizer_id for event in created}
+            transaction.on_commit(lambda: feeds.bump_feed_stamps(organizer_ids))
+    except DatabaseError as e:
+        for line, _ in batch:
+            report.add_error(line, {'__all__': [f"Batch rejected by the database: {e}"]})
+        return
+    report.created += len(created)
+    report.batches += 1
+    # ... and the one that counts the events in the organizers' activity summaries
+    for organizer_id in organizer_ids - {None}:
+        activity.rebuild(organizer_id)
+
+
+def import_events(rows, organizer=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Validates rows with the EventForm rules and inserts them in batches.
+
+    Every batch is inserted with one `bulk_create()` in its own transaction, so
+    a file with a few bad rows still imports all the good ones; rejected rows
+    are listed in the report.
+
+    Args:
+        rows: Iterable of (line number, row dict) pairs, e.g. from PARSERS.
+        organizer: Default organizer for rows without an `organizer` username.
+        batch_size: Rows per INSERT / transaction.
+        dry_run: Validate only.
+
+    Returns:
+        ImportReport
+    """
+    report = ImportReport()
+    pending = []
+    for line, row in rows:
+        if not isinstance(row, dict):
+            report.add_error(line, {'__all__': ["Expected an object."]})
+            continue
+        form = EventForm(data={field: row.get(field) or '' for field in EventForm.Meta.fields})
+        if not form.is_valid():
+            report.add_error(line, {field: list(messages) for field, messages in form.errors.items()})
+            continue
+        event = form.instance
+        event.organizer = organizer
+        pending.append((line, event, str(row.get('organizer') or '').strip()))
+        if len(pending) >= batch_size:
+            _flush(pending, report, dry_run)
+            pending = []
+    if pending:
+        _flush(pending, report, dry_run)
+
+    if report.created:
+        # bulk_create() skips the post_save receivers that invalidate cached lists
+        bump_model_version(Event)
+    return report
+
+
+def import_file(stream, fmt, **kwargs):
+    """
+    Parses a text stream in the given format and imports its events.
+    """
+    return import_events(PARSERS[fmt](stream), **kwargs)
+
+
+# -------------------------------
+# Exporting
+# -------------------------------
+
+def export_rows(queryset=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Returns an iterator of (id, title, description, date, location, organizer
+    username, updated_at) tuples, fetched `chunk_size` rows at a time.
+    """
+    queryset = Event.objects.all() if queryset is None else queryset
+    return (
+        queryset.order_by('pk')
+        .values_list('id', 'title', 'description', 'date', 'location', 'organizer__username', 'updated_at')
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, for streaming csv.writer output.
+    """
+
+    def write(self, value):
+        return value
+
+
+def export_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(('id', *COLUMNS))
+    for pk, title, description, day, location, organizer, _ in rows:
+        yield writer.writerow((pk, title, description, day.isoformat(), location, organizer or ''))
+
+
+def export_json(rows):
+    """
+    Yields a JSON array, one event per line. The output can be imported again.
+    """
+    yield '['
+    separator = '\n'
+    for pk, title, description, day, location, organizer, _ in rows:
+        item = {
+            'id': pk, 'title': title, 'description': description, 'date': day.isoformat(),
+            'location': location, 'organizer': organizer,
+        }
+        yield separator + json.dumps(item, ensure_ascii=False)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+def export_ics(rows):
+    stamp = now()
+    yield ical.calendar_start('Bike Connect events')
+    for pk, title, description, day, location, _, updated_at in rows:
+        yield ical.vevent(
+            event_uid(pk), day, title, stamp, description=description, location=location, last_modified=updated_at,
+        )
+    yield ical.calendar_end()
+
+
+def event_uid(pk):
+    """
+    Returns the stable iCalendar UID of an event.
+    """
+    return f'event-{pk}@bike-connect'
+
+
+# format -> (content type, generator of text chunks)
+EXPORTERS = {
+    'csv': ('text/csv; charset=utf-8', export_csv),
+    'json': ('application/json', export_json),
+    'ics': ('text/calendar; charset=utf-8', export_ics),
+}
+
+
+def streaming_export(queryset, fmt, filename='events'):
+    """
+    Returns a StreamingHttpResponse downloading the queryset in the given format.
+
+    Rows are read with a chunked iterator and written as they arrive, so the
+    whole table can be exported in constant memory.
+    """
+    content_type, exporter = EXPORTERS[fmt]
+    response = StreamingHttpResponse(exporter(export_rows(queryset)), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     EventListView, EventCreateView, EventUpdateView, EventDeleteView,
-    EventDetailView, join_event, leave_event
+    EventDetailView, join_event, leave_event, export_events, event_feed, upload_event_image
 )
 
 # Namespace for the events app URLs
@@ -43,4 +43,19 @@ urlpatterns = [
     path('<int:event_id>/leave/', leave_event, name='leave_event'),
     # URL: /events/<event_id>/leave/
     # Allows a user to leave a specific event.
+
+    # Image upload for the event forms (JSON)
+    path('upload-image/', upload_event_image, name='upload_event_image'),
+    # URL: /events/upload-image/
+    # Stores an uploaded image and returns its URL.
+
+    # Personal iCalendar feed
+    path('feed/<str:token>.ics', event_feed, name='event_feed'),
+    # URL: /events/feed/<token>.ics
+    # Subscribable calendar of the events a user joined or organizes.
+
+    # Streaming export of all events (staff only)
+    path('export.<str:fmt>', export_events, name='event_export'),
+    # URL: /events/export.csv, /events/export.json, /events/export.ics
+    # Downloads the whole event table in the given format.
 ]
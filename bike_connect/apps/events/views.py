@@ -1,87 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.core.files.storage import default_storage
-from django.http import JsonResponse
-from django.shortcuts import render, get_object_or_404
-from django.urls import reverse_lazy
-from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError as APIValidationError
+from rest_framework.permissions import SAFE_METHODS
 
+from bike_connect.apps.core import geo, images
+from bike_connect.apps.core.caching import CachedListMixin
+from bike_connect.apps.core.conditional import ConditionalAPIMixin, ConditionalDetailMixin, make_etag
+from bike_connect.apps.core.fastjson import FastJSONMixin
+from bike_connect.apps.core.fieldsets import SparseFieldsetViewMixin
+from bike_connect.apps.core.pagination import KeysetPagination, KeysetPaginationMixin
+from bike_connect.apps.core.profiling import QueryBudget
+from bike_connect.apps.core.replicas import ReplicaReadMixin
+from bike_connect.apps.core.search import filter_queryset
+from .feeds import body_key, caching_stream, feed_cache, feed_rows, feed_stamp, read_feed_token, render_feed
 from .forms import EventForm
-from bike_connect.apps.events.models import Event, Participation
-from .serializers import EventSerializer
+from bike_connect.apps.events.models import Event
+from . import participation
+from .participation import participation_index
+from .serializers import EventListSerializer, EventSerializer
+from .transfer import EXPORTERS, streaming_export
 
 
 # -------------------------------
 # API ViewSet for Event Management
 # -------------------------------
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ReplicaReadMixin, ConditionalAPIMixin, FastJSONMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing Event instances via the API.
+
+    Lists use the compact EventListSerializer, everything else EventSerializer.
+    Reads load only the fields being rendered (see `?fields=`), with the
+    organizer joined in the same query. JSON reads take the `.values()` fast
+    path of FastJSONMixin and are answered with 304 while nothing changed.
+
+    Distance queries (see `geo.parse_geo_query`): `?near=Sofia&radius=50` or
+    `?lat=42.7&lon=23.3` limit the list to a radius, `&nearest=10` returns the
+    10 nearest events, closest first and unpaginated. Every event then carries
+    its `distance` in km.
     """
-    queryset = Event.objects.select_related('organizer').only('id', 'title', 'description', 'date', 'image')
+    queryset = Event.objects.all()
     serializer_class = EventSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-date', '-id')
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EventListSerializer
+        return super().get_serializer_class()
 
-# -------------------------------
-# Public Views
-# -------------------------------
-def homepage(request):
-    """
-    Displays the landing page with events and participations.
-    """
-    events = cache.get('homepage_events')
-    if not events:
-        events = Event.objects.select_related('organizer').only('id', 'title', 'date')[:5]
-        cache.set('homepage_events', events, 60 * 15)
+    def get_geo_query(self):
+        if not hasattr(self, '_geo_query'):
+            try:
+                self._geo_query = geo.parse_geo_query(self.request.query_params)
+            except ValueError as e:
+                raise APIValidationError({'detail': str(e)})
+        return self._geo_query
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        query = self.get_geo_query()
+        if query is None:
+            return geo.annotate_distance(queryset)
+        if self.action == 'list':
+            return geo.filter_by_distance(queryset, query)
+        # A single event is not filtered, only given its distance
+        return geo.annotate_distance(queryset, query['latitude'], query['longitude'])
 
-    participations = (
-        Participation.objects.select_related('event')
-        .filter(user=request.user)
-        .only('event', 'status') if request.user.is_authenticated else []
-    )
-    return render(request, 'core/landing_page.html', {
-        'events': events,
-        'participations': participations,
-    })
+    def paginate_queryset(self, queryset):
+        query = self.get_geo_query()
+        if query and query['nearest']:
+            return None  # Already limited to the N nearest
+        return super().paginate_queryset(queryset)
 
+    def perform_create(self, serializer):
+        organizer = self.request.user if self.request.user.is_authenticated else None
+        serializer.save(organizer=organizer)
 
-class EventDetailView(DetailView):
+
+# -------------------------------
+# Public Views
+# -------------------------------
+class EventDetailView(ConditionalDetailMixin, DetailView):
     """
     Displays detailed information about a specific event.
+
+    Conditional requests are answered with 304 until the event, its
+    participant list or the user's own participation changes.
     """
     model = Event
     template_name = 'events/event_detail.html'
     context_object_name = 'event'
 
+    def get_validator_annotations(self):
+        # Joining and leaving bump `updated_at` along with `participant_count`
+        annotations = {}
+        if self.request.user.is_authenticated:
+            annotations['my_status'] = Max('participants__status', filter=Q(participants__user=self.request.user))
+        return annotations
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
-            context['participation_status'] = Participation.objects.filter(
-                user=self.request.user, event=self.object
-            ).exists()
+            context['participation_status'] = participation_index(self.request.user).status(self.object)
+        context['participants'] = [
+            item.user for item in self.object.participants.filter(status='joined').select_related('user')
+        ]
         return context
 
 
 # -------------------------------
 # Event Management Views
 # -------------------------------
-class EventListView(ListView):
+class EventListView(ReplicaReadMixin, geo.NearbyListMixin, CachedListMixin, KeysetPaginationMixin, ListView):
     """
-    Displays a paginated list of events with optional search functionality.
+    Displays a keyset-paginated list of events with optional search functionality.
+    Events can be limited to a radius around a place, or the nearest ones listed
+    (see `geo.parse_geo_query`).
+    Pages are served from the list cache until an event changes.
     """
     model = Event
     template_name = 'events/event_list.html'
     context_object_name = 'events'
     paginate_by = 10
+    keyset_ordering = ('-date', '-id')
+    query_budget = QueryBudget(max_queries=4, max_duplicates=0)
 
     def get_queryset(self):
         query = self.request.GET.get('search', '')
-        queryset = Event.objects.select_related('organizer').only('id', 'title', 'date', 'organizer__username', 'image')
+        queryset = Event.objects.select_related('organizer').only(
+            'id', 'title', 'description', 'date', 'location', 'organizer__username', 'image',
+            'participant_count', 'capacity',
+        )
         if query:
-            queryset = queryset.filter(title__icontains=query)
-        return queryset.order_by('-date')
+            queryset = filter_queryset(queryset, query)
+        return self.filter_by_distance(queryset.order_by('-date'))
+
+    def serialize_row(self, event):
+        return {
+            'id': event.id,
+            'title': event.title,
+            'description': event.description,
+            'location': event.location,
+            'date': event.date,
+            'participant_count': event.participant_count,
+            'capacity': event.capacity,
+            'image': event.image.name,
+            'distance': getattr(event, 'distance', None),
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Index the user's participations for the whole page with one query
+        context['participations'] = participation_index(self.request.user).load(context['events'])
+        return context
 
 
 class EventCreateView(LoginRequiredMixin, CreateView):
@@ -125,40 +212,138 @@ class EventDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return context
 
 
+# Participation outcome -> (JSON body, HTTP status)
+PARTICIPATION_RESPONSES = {
+    participation.JOINED: ({"status": "joined"}, 200),
+    participation.ALREADY_JOINED: ({"error": "Already joined"}, 400),
+    participation.FULL: ({"error": "Event is full"}, 400),
+    participation.LEFT: ({"status": "left"}, 200),
+    participation.NOT_JOINED: ({"error": "Not a participant"}, 400),
+}
+
+
+def _participation_response(outcome):
+    body, status = PARTICIPATION_RESPONSES[outcome]
+    return JsonResponse(body, status=status)
+
+
+# Join / leave / upload are async views: under ASGI (see asgi.py) a request
+# waiting on the database or on the storage backend does not hold a worker.
+
 @login_required
-def join_event(request, event_id):
-    if request.method == "POST":
-        event = get_object_or_404(Event, id=event_id)
-        participation, created = Participation.objects.get_or_create(user=request.user, event=event)
-        if created:
-            return JsonResponse({"status": "joined"}, status=200)
-        return JsonResponse({"error": "Already joined"}, status=400)
+@require_POST
+async def join_event(request, event_id):
+    event = await aget_object_or_404(Event.objects.only('id'), id=event_id)
+    user = await request.auser()
+    # The service runs its statements in one transaction, which needs sync code
+    return _participation_response(await sync_to_async(participation.join)(user, event.id))
+
 
 @login_required
-def leave_event(request, event_id):
-    if request.method == "POST":
-        event = get_object_or_404(Event, id=event_id)
-        participation = Participation.objects.filter(user=request.user, event=event).first()
-        if participation:
-            participation.delete()
-            return JsonResponse({"status": "left"}, status=200)
-        return JsonResponse({"error": "Not a participant"}, status=400)
+@require_POST
+async def leave_event(request, event_id):
+    event = await aget_object_or_404(Event.objects.only('id'), id=event_id)
+    user = await request.auser()
+    return _participation_response(await sync_to_async(participation.leave)(user, event.id))
+
+# -------------------------------
+# Calendar Feeds
+# -------------------------------
+
+def event_feed(request, token):
+    """
+    Serves a user's iCalendar feed (joined or organized events).
+
+    Polling calendar clients are answered from the feed's version stamp alone:
+    a matching ETag gets a 304 and a cached body is served as-is, both without
+    touching the database. Otherwise the feed is streamed as it is generated,
+    and cached once complete.
+    """
+    claims = read_feed_token(token)
+    if claims is None:
+        raise Http404("Unknown feed")
+    user_id, kind = claims
+
+    stamp = feed_stamp(user_id)
+    etag = make_etag('feed', user_id, kind, stamp)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    key = body_key(user_id, kind, stamp)
+    body = feed_cache().get(key)
+    if body is not None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    else:
+        chunks = render_feed(
+            feed_rows(user_id, kind), kind,
+            lambda pk: request.build_absolute_uri(reverse('events:event_detail', args=[pk])),
+        )
+        response = StreamingHttpResponse(caching_stream(chunks, key), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Content-Disposition'] = f'inline; filename="{kind}.ics"'
+    return response
+
+
+# -------------------------------
+# Bulk Export
+# -------------------------------
+
+@staff_member_required
+def export_events(request, fmt):
+    """
+    Streams every event as a CSV, JSON or iCalendar download (staff only).
+    """
+    if fmt not in EXPORTERS:
+        raise Http404(f"Unknown export format '{fmt}'")
+    return streaming_export(Event.objects.all(), fmt)
+
 
 # -------------------------------
 # File Upload to S3 Functionality
 # -------------------------------
 
+_upload_executor = None
+
+
+def upload_executor():
+    """
+    Returns the thread pool uploads run in, created on first use.
+    """
+    global _upload_executor
+    if _upload_executor is None:
+        _upload_executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'UPLOAD_THREADS', 32), thread_name_prefix='upload',
+        )
+    return _upload_executor
+
+
+def _store_image(uploaded_file):
+    images.validate_image(uploaded_file)
+    # Strip the metadata (EXIF, GPS...) before the file leaves the server
+    cleaned = images.sanitize_upload(uploaded_file)
+    storage = images.media_storage()
+    path = storage.save(f'events/{uploaded_file.name}', cleaned or uploaded_file)
+    return storage.url(path)
+
+
 @login_required
-def upload_event_image(request):
+async def upload_event_image(request):
     """
-    Handles image uploads for events. Saves the image to the S3 bucket and returns the URL.
+    Handles image uploads for events. Saves the image to the configured storage and returns the URL.
+
+    The upload to the storage backend runs in the thread pool, so the event
+    loop keeps serving other requests while it is in flight.
     """
     if request.method == 'POST' and request.FILES.get('image'):
         uploaded_file = request.FILES['image']
         try:
-            path = default_storage.save(f'events/{uploaded_file.name}', uploaded_file)
-            file_url = default_storage.url(path)
+            file_url = await sync_to_async(_store_image, thread_sensitive=False, executor=upload_executor())(
+                uploaded_file
+            )
             return JsonResponse({'url': file_url}, status=200)
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=400)
         except Exception as e:
             return JsonResponse({'error': f"Failed to upload: {str(e)}"}, status=500)
-    return JsonResponse({'error': 'Invalid request or no image provided'}, status=400)
\ No newline at end of file
+    return JsonResponse({'error': 'Invalid request or no image provided'}, status=400)
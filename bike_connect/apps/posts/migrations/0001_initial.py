@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:37
+
+import cloudinary_storage.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BikePost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('buy', 'Buy'), ('sell', 'Sell'), ('repair', 'Repair'), ('accessories', 'Accessories')], default='buy', max_length=20)),
+                ('condition', models.CharField(blank=True, choices=[('new', 'New'), ('used', 'Used'), ('refurbished', 'Refurbished')], max_length=15, null=True)),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+                ('image', models.ImageField(blank=True, help_text='Optional image for the post.', max_length=255, null=True, storage=cloudinary_storage.storage.MediaCloudinaryStorage(), upload_to='bike_posts/', verbose_name='Post Image')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('posted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bike_post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.bikepost')),
+                ('posted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['created_at']},
+        ),
+        migrations.AddIndex(
+            model_name='bikepost',
+            index=models.Index(fields=['-created_at', '-id'], name='bikepost_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bikepost',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='bikepost_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['bike_post', 'created_at'], name='comment_post_created_idx'),
+        ),
+    ]
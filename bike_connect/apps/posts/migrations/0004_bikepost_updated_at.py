@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:30
+
+import bike_connect.apps.core.images
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_geo_coordinates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bikepost',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Optional image for the post.', max_length=255, null=True, storage=bike_connect.apps.core.images.media_storage, upload_to='bike_posts/', validators=[bike_connect.apps.core.images.validate_image], verbose_name='Post Image'),
+        ),
+        migrations.AddField(
+            model_name='bikepost',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
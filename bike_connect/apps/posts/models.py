@@ -1,4 +1,3 @@
-from cloudinary_storage.storage import MediaCloudinaryStorage
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -6,6 +5,8 @@ from django.contrib.auth import get_user_model
 
 from cloudinary.models import CloudinaryField
 
+from bike_connect.apps.core.images import media_storage, validate_image
+
 
 # Fetch the custom user model (if defined) or the default User model
 User = get_user_model()
@@ -78,11 +79,17 @@ class BikePost(models.Model):
         null=True                     # Allows NULL values in the database
     )
 
+    # Coordinates geocoded from the location, and their geohash (see core.geo)
+    latitude = models.FloatField(blank=True, null=True, editable=False)
+    longitude = models.FloatField(blank=True, null=True, editable=False)
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False)
+
     # Optional image upload for the bike
 
     image = models.ImageField(
         upload_to='bike_posts/',
-        storage=MediaCloudinaryStorage(),
+        storage=media_storage,
+        validators=[validate_image],
         blank=True,
         null=True,
         max_length=255,
@@ -101,6 +108,20 @@ class BikePost(models.Model):
         auto_now_add=True             # Automatically sets the field to the current timestamp on creation
     )
 
+    # Timestamp of the last change, used to answer conditional requests
+    updated_at = models.DateTimeField(
+        auto_now=True                 # Automatically updated on every save
+    )
+
+    class Meta:
+        indexes = [
+            # Bike post list pages (-created_at, -id), all posts or one category
+            models.Index(fields=['-created_at', '-id'], name='bikepost_created_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='bikepost_category_created_idx'),
+            # Distance queries read the geohash cells around a point
+            models.Index(fields=['geohash'], name='bikepost_geohash_idx'),
+        ]
+
     def clean(self):
         """
         Custom validation logic for the BikePost model.
@@ -154,6 +175,13 @@ class Comment(models.Model):
         auto_now_add=True            # Automatically set the timestamp when the comment is created
     )
 
+    class Meta:
+        ordering = ['created_at']  # Oldest first, as a conversation reads
+        indexes = [
+            # The comments of a post, in order
+            models.Index(fields=['bike_post', 'created_at'], name='comment_post_created_idx'),
+        ]
+
     def __str__(self):
         """
         String representation of the Comment object.
@@ -162,3 +190,4 @@ class Comment(models.Model):
         """
         return f"{self.text[:50]}... by {self.posted_by.username}"
 
+
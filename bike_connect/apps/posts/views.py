@@ -2,10 +2,15 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.core.files.storage import default_storage
-from django.db.models import Q
 from django.contrib import messages
+from django.db.models import Count, Max
 from django.urls import reverse_lazy, reverse
+from bike_connect.apps.core import geo, images
+from bike_connect.apps.core.caching import CachedListMixin
+from bike_connect.apps.core.conditional import ConditionalDetailMixin
+from bike_connect.apps.core.pagination import KeysetPaginationMixin
+from bike_connect.apps.core.replicas import ReplicaReadMixin
+from bike_connect.apps.core.search import filter_queryset
 from .models import BikePost
 from .forms import BikePostForm, CommentForm
 
@@ -35,20 +40,13 @@ class BikePostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     success_url = reverse_lazy('posts:bikepost_list')
 
     def form_valid(self, form):
-        # Upload new image to S3 if provided
-        if self.request.FILES.get('image'):
-            uploaded_file = self.request.FILES['image']
-            try:
-                # Delete old image if exists
-                if self.object.image:
-                    default_storage.delete(self.object.image.name)
-                # Upload new image
-                path = default_storage.save(f'bike_posts/{uploaded_file.name}', uploaded_file)
-                form.instance.image = path
-            except Exception as e:
-                form.add_error('image', f"Failed to upload image: {str(e)}")
-                return self.form_invalid(form)
-        return super().form_valid(form)
+        # The model field stores the new image (and the image pipeline processes it)
+        old_image = form.initial.get('image')
+        response = super().form_valid(form)
+        if 'image' in form.changed_data and old_image:
+            # Delete the replaced image together with its variants
+            images.delete_image(old_image)
+        return response
 
     def test_func(self):
         bike_post = self.get_object()
@@ -68,9 +66,9 @@ def delete_post(request, pk):
         return redirect('posts:bikepost_list')
 
     if request.method == 'POST':
-        # Delete image from S3
+        # Delete the image and its variants
         if bike_post.image:
-            default_storage.delete(bike_post.image.name)
+            images.delete_image(bike_post.image)
 
         # Delete the post
         bike_post.delete()
@@ -84,15 +82,21 @@ def delete_post(request, pk):
     })
 
 
-class BikePostListView(LoginRequiredMixin, ListView):
+class BikePostListView(ReplicaReadMixin, LoginRequiredMixin, geo.NearbyListMixin, CachedListMixin,
+                       KeysetPaginationMixin, ListView):
     """
-    Displays a paginated list of BikePosts.
+    Displays a keyset-paginated list of BikePosts, newest first.
+    A `location` the gazetteer knows selects the posts within `radius` km of
+    it; other locations are matched as text. `near` / `lat` / `lon` with
+    `nearest` list the nearest posts (see `geo.parse_geo_query`).
+    Pages are served from the list cache until a post changes.
     """
     model = BikePost
     template_name = 'posts/bikepost_list.html'
     context_object_name = 'bike_posts'
     login_url = 'users:login'
     paginate_by = 6  # Number of posts per page
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         query = self.request.GET.get('q')
@@ -100,26 +104,53 @@ class BikePostListView(LoginRequiredMixin, ListView):
         location = self.request.GET.get('location')
         queryset = BikePost.objects.all()
         if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query)
-                | Q(description__icontains=query)
-            )
+            queryset = filter_queryset(queryset, query)
         if category:
             queryset = queryset.filter(category=category)
-        if location:
+        if location and not self.get_geo_query():
             queryset = queryset.filter(location__icontains=location)
-        return queryset
-
-
-class BikePostDetailView(LoginRequiredMixin, DetailView):
+        return self.filter_by_distance(queryset)
+
+    def get_geo_params(self):
+        # A known place typed in the location filter searches around it
+        params = self.request.GET
+        location = params.get('location')
+        if location and not any(params.get(name) for name in ('near', 'lat', 'lon')) and geo.geocode(location):
+            params = params.copy()
+            params['near'] = location
+        return params
+
+    def serialize_row(self, post):
+        return {
+            'id': post.id,
+            'title': post.title,
+            'description': post.description,
+            'category_display': post.get_category_display(),
+            'condition_display': post.get_condition_display(),
+            'location': post.location,
+            'price': post.price,
+            'image': post.image.name,
+            'posted_by_id': post.posted_by_id,
+            'created_at': post.created_at,
+            'distance': getattr(post, 'distance', None),
+        }
+
+
+class BikePostDetailView(LoginRequiredMixin, ConditionalDetailMixin, DetailView):
     """
     Displays the details of a specific BikePost along with its comments.
+
+    Conditional requests are answered with 304 until the post changes or a
+    comment is added or removed.
     """
     model = BikePost
     template_name = 'posts/bikepost_detail.html'
     context_object_name = 'bike_post'
     login_url = 'users:login'
 
+    def get_validator_annotations(self):
+        return {'comment_count': Count('comments'), 'last_comment': Max('comments__created_at')}
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['comments'] = self.object.comments.all()  # Retrieve all comments related to this post
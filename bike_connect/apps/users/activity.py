@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.utils.timezone import localdate, now
+
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.posts.models import BikePost, Comment
+from .models import ActivitySummary
+
+# Items kept in a summary's recent list
+RECENT_ITEMS = 5
+
+# Upcoming joined events shown on the profile
+UPCOMING_EVENTS = 5
+
+# Counter of each kind of item
+COUNTERS = {
+    'joined': 'joined_count',
+    'organized': 'organized_count',
+    'post': 'post_count',
+    'comment': 'comment_count',
+}
+
+
+def _item(kind, item_id, target_id, title, at):
+    """
+    Returns a recent-list entry. `target_id` is the page it links to: the event
+    for 'joined' / 'organized', the bike post for 'post' / 'comment'.
+    """
+    return {'kind': kind, 'id': item_id, 'target': target_id, 'title': title, 'at': at.isoformat()}
+
+
+# -------------------------------
+# Full Rebuild
+# -------------------------------
+
+def _recent_items(user_id):
+    """
+    Reads the latest items of a user, each query bounded by `RECENT_ITEMS`.
+    """
+    items = [
+        _item('joined', p.event_id, p.event_id, p.event.title, p.created_at)
+        for p in Participation.objects.filter(user_id=user_id, status='joined')
+        .select_related('event').only('event_id', 'created_at', 'event__title').order_by('-created_at')[:RECENT_ITEMS]
+    ]
+    # Events carry no creation time; their last change stands in for it
+    items += [
+        _item('organized', event.pk, event.pk, event.title, event.updated_at)
+        for event in Event.objects.filter(organizer_id=user_id).only('title', 'updated_at')
+        .order_by('-updated_at')[:RECENT_ITEMS]
+    ]
+    items += [
+        _item('post', post.pk, post.pk, post.title, post.created_at)
+        for post in BikePost.objects.filter(posted_by_id=user_id).only('title', 'created_at')
+        .order_by('-created_at')[:RECENT_ITEMS]
+    ]
+    items += [
+        _item('comment', comment.pk, comment.bike_post_id, comment.bike_post.title, comment.created_at)
+        for comment in Comment.objects.filter(posted_by_id=user_id).select_related('bike_post')
+        .only('bike_post_id', 'created_at', 'bike_post__title').order_by('-created_at')[:RECENT_ITEMS]
+    ]
+    items.sort(key=lambda item: item['at'], reverse=True)
+    return items[:RECENT_ITEMS]
+
+
+def rebuild(user_id):
+    """
+    Recomputes the summary of a user from the event, post and comment tables.
+
+    Used for users without a summary yet, after bulk inserts and for changes
+    the incremental updates cannot follow (an event handed to another organizer).
+
+    Returns:
+        ActivitySummary: The saved summary.
+    """
+    summary, _ = ActivitySummary.objects.update_or_create(user_id=user_id, defaults={
+        'joined_count': Participation.objects.filter(user_id=user_id, status='joined').count(),
+        'organized_count': Event.objects.filter(organizer_id=user_id).count(),
+        'post_count': BikePost.objects.filter(posted_by_id=user_id).count(),
+        'comment_count': Comment.objects.filter(posted_by_id=user_id).count(),
+        'recent': _recent_items(user_id),
+    })
+    return summary
+
+
+# -------------------------------
+# Incremental Updates
+# -------------------------------
+
+def _apply(user_id, kind, item_id, delta, item=None):
+    """
+    Moves the counter of `kind` by `delta` and adds `item` to, or removes
+    the item from, the recent list, under a row lock.
+    """
+    with transaction.atomic():
+        summary = ActivitySummary.objects.select_for_update().filter(user_id=user_id).first()
+        if summary is None:
+            # Built on first use; a removal must not create rows while the
+            # user itself may be being deleted
+            if delta > 0:
+                rebuild(user_id)
+            return
+        field = COUNTERS[kind]
+        setattr(summary, field, max(getattr(summary, field) + delta, 0))
+        others = [entry for entry in summary.recent if (entry['kind'], entry['id']) != (kind, item_id)]
+        if item is not None:
+            summary.recent = [item, *others][:RECENT_ITEMS]
+        elif len(others) < len(summary.recent):
+            # The removed item was listed: refill the list
+            summary.recent = _recent_items(user_id)
+        summary.save(update_fields=[field, 'recent', 'updated_at'])
+
+
+def record(user_id, kind, item_id, target_id, title, at=None):
+    """
+    Counts a new item of a user and lists it first among the recent ones.
+
+    Titles are recorded as they were at that moment.
+    """
+    if user_id is not None:
+        _apply(user_id, kind, item_id, 1, _item(kind, item_id, target_id, title, at or now()))
+
+
+def forget(user_id, kind, item_id):
+    """
+    Uncounts a removed item of a user and drops it from the recent list.
+    """
+    if user_id is not None:
+        _apply(user_id, kind, item_id, -1)
+
+
+def record_join(user_id, event_id):
+    """
+    Records a join made through `events.participation`, which bypasses the
+    model signals.
+    """
+    title = Event.objects.filter(pk=event_id).values_list('title', flat=True).first()
+    if title is not None:
+        record(user_id, 'joined', event_id, event_id, title)
+
+
+# -------------------------------
+# Profile
+# -------------------------------
+
+def get_summary(user):
+    """
+    Returns the summary of a user, building it on first use.
+    """
+    return ActivitySummary.objects.filter(user_id=user.pk).first() or rebuild(user.pk)
+
+
+def upcoming_events(user, limit=UPCOMING_EVENTS):
+    """
+    Returns the next events the user has joined, soonest first, at most `limit`.
+    """
+    return (
+        Event.objects.filter(participants__user=user, participants__status='joined', date__gte=localdate())
+        .only('title', 'date', 'location').order_by('date', 'id')[:limit]
+    )
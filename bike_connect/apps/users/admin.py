@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser  # Import the CustomUser model
+from .models import ActivitySummary, CustomUser  # Import the user models
 
 # Register the CustomUser model with the admin site
 @admin.register(CustomUser)
@@ -9,3 +9,11 @@ class CustomUserAdmin(UserAdmin):  # Extends Django's built-in UserAdmin for cus
     list_display = ['username', 'email', 'first_name', 'last_name', 'is_active', 'is_staff']  # Fields displayed in the list view
     list_filter = ['is_active', 'is_staff', 'date_joined']  # Filters for the sidebar in the admin list view
     search_fields = ['username', 'email', 'first_name', 'last_name']  # Fields that can be searched in the admin interface
+
+
+# Read-only view of the precomputed profile summaries
+@admin.register(ActivitySummary)
+class ActivitySummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'joined_count', 'organized_count', 'post_count', 'comment_count', 'updated_at']  # Counters at a glance
+    search_fields = ['user__username']  # Find a user's summary
+    readonly_fields = ['joined_count', 'organized_count', 'post_count', 'comment_count', 'recent', 'updated_at']  # Maintained by users.activity
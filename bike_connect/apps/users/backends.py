@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import router
+from django.db.models.fields.files import FieldFile
+from django.utils.connection import ConnectionProxy
+
+# User rows are cached next to the sessions that reference them
+cache = ConnectionProxy(caches, 'sessions')
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drops the cached row of a user; called whenever the user is saved or deleted.
+    """
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves `request.user` from a short-lived cache.
+
+    The concrete field values of the user row are cached for `USER_CACHE_TIMEOUT`
+    seconds, so an authenticated request whose session is also cached runs no
+    query at all before the view. `CustomUser.save` and `delete` drop the
+    entry, so profile and permission changes are visible on the next request.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        key = user_cache_key(user_id)
+        field_names = [field.attname for field in UserModel._meta.concrete_fields]
+
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                values = [getattr(user, name) for name in field_names]
+                # Store plain values only; files are rebuilt from their name
+                values = [value.name if isinstance(value, FieldFile) else value for value in values]
+                cache.set(key, values, getattr(settings, 'USER_CACHE_TIMEOUT', 60))
+            return user
+
+        # Rebuild the instance as if it had been loaded from the database
+        user = UserModel.from_db(router.db_for_read(UserModel), field_names, values)
+        return user if self.user_can_authenticate(user) else None
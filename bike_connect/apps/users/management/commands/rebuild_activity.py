@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from bike_connect.apps.users import activity
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the activity summary of every user from the event, post and
+    comment tables.
+
+    Summaries are updated as users act; run this after bulk loads or
+    `refresh_participant_counts()`, which write around the signals.
+    """
+    help = "Rebuild the activity summaries shown on the profile pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="Only rebuild the summaries of these users.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+        rebuilt = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            activity.rebuild(user_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} activity summaries."))
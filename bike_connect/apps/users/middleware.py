@@ -0,0 +1,102 @@
+import logging
+import threading
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def auth_query_stats():
+    """
+    Returns the session / auth counters of this process.
+
+    Example:
+        {'requests': 120, 'zero_auth_queries': 117, 'auth_queries': 5}
+    """
+    with _stats_lock:
+        return {name: _stats[name] for name in ('requests', 'zero_auth_queries', 'auth_queries')}
+
+
+def reset_auth_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class AuthQueryMetricsMiddleware:
+    """
+    Counts the queries that hit the session or user tables while serving
+    requests that carry a session cookie.
+
+    With cached sessions and the cached user backend, an authenticated request
+    should not query either table; the share of requests served with zero
+    auth queries is a direct measure of the fast path. Must be placed before
+    SessionMiddleware so that session saves are counted too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.tables = (Session._meta.db_table, get_user_model()._meta.db_table)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _install(self, count):
+        """
+        Wraps the connections of the current thread; returns the ExitStack removing the wrappers.
+        """
+        def counter(execute, sql, params, many, context):
+            if any(table in sql for table in self.tables):
+                count[0] += 1
+            return execute(sql, params, many, context)
+
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        return stack
+
+    def _record(self, request, count):
+        with _stats_lock:
+            _stats['requests'] += 1
+            _stats['auth_queries'] += count[0]
+            if not count[0]:
+                _stats['zero_auth_queries'] += 1
+        if count[0]:
+            logger.debug("%s %s ran %d session/auth queries", request.method, request.path, count[0])
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return self.get_response(request)
+
+        count = [0]
+        with self._install(count):
+            response = self.get_response(request)
+        self._record(request, count)
+        return response
+
+    async def __acall__(self, request):
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return await self.get_response(request)
+
+        # Session and user lookups of async requests run in the request's
+        # thread-sensitive thread, so the counter is installed there
+        count = [0]
+        stack = await sync_to_async(self._install)(count)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self._record(request, count)
+        return response
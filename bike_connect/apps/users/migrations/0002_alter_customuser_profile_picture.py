@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:29
+
+import bike_connect.apps.core.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='profile_picture',
+            field=models.ImageField(blank=True, default='profile_pictures/default.jpg', help_text='Upload a profile picture (optional).', max_length=255, null=True, storage=bike_connect.apps.core.images.media_storage, upload_to='profile_pictures/', validators=[bike_connect.apps.core.images.validate_image]),
+        ),
+    ]
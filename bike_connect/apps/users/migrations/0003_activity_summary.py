@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_customuser_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivitySummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('joined_count', models.PositiveIntegerField(default=0, help_text='Events the user has currently joined.')),
+                ('organized_count', models.PositiveIntegerField(default=0, help_text='Events the user organizes.')),
+                ('post_count', models.PositiveIntegerField(default=0, help_text='Bike posts of the user.')),
+                ('comment_count', models.PositiveIntegerField(default=0, help_text='Comments of the user.')),
+                ('recent', models.JSONField(blank=True, default=list, help_text="Latest items, newest first: {'kind', 'id', 'title', 'at'} dicts.")),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Activity Summary',
+                'verbose_name_plural': 'Activity Summaries',
+            },
+        ),
+    ]
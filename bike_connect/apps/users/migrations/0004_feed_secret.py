@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:21
+
+import bike_connect.apps.users.models
+from django.db import migrations, models
+
+
+def give_each_user_a_secret(apps, schema_editor):
+    # AddField gave every existing row the same default
+    CustomUser = apps.get_model('users', 'CustomUser')
+    for user in CustomUser.objects.only('pk').iterator():
+        user.feed_secret = bike_connect.apps.users.models.new_feed_secret()
+        user.save(update_fields=['feed_secret'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_activity_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='feed_secret',
+            field=models.CharField(default=bike_connect.apps.users.models.new_feed_secret, editable=False, help_text='Part of the calendar feed links; replacing it revokes them.', max_length=32),
+        ),
+        migrations.RunPython(give_each_user_a_secret, migrations.RunPython.noop),
+    ]
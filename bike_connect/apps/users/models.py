@@ -1,7 +1,17 @@
-from cloudinary_storage.storage import MediaCloudinaryStorage
+import secrets  # Random feed secrets
+
 from django.contrib.auth.models import AbstractUser, BaseUserManager  # Import base classes for custom user models
 from django.db import models  # Import Django's models module
 
+from bike_connect.apps.core.images import media_storage, validate_image
+
+
+def new_feed_secret():
+    """
+    Returns a fresh random secret for a user's calendar feed links.
+    """
+    return secrets.token_urlsafe(16)
+
 
 class CustomUserManager(BaseUserManager):
     """
@@ -55,7 +65,8 @@ class CustomUser(AbstractUser):
 
     profile_picture = models.ImageField(
         upload_to='profile_pictures/',               # Cloudinary folder
-        storage=MediaCloudinaryStorage(),            # ➜ ключовото
+        storage=media_storage,                       # Cloudinary in production
+        validators=[validate_image],                 # Size and pixel limits
         null=True,
         blank=True,
         max_length=255,
@@ -63,8 +74,22 @@ class CustomUser(AbstractUser):
         help_text="Upload a profile picture (optional).",
     )
 
+    feed_secret = models.CharField(
+        max_length=32,
+        default=new_feed_secret,
+        editable=False,
+        help_text="Part of the calendar feed links; replacing it revokes them.",
+    )
+
     objects = CustomUserManager()
 
+    def rotate_feed_secret(self):
+        """
+        Replaces the feed secret, so that links handed out before stop working.
+        """
+        self.feed_secret = new_feed_secret()
+        self.save(update_fields=['feed_secret'])
+
     def save(self, *args, **kwargs):
         """
         Overrides the default save method to set is_staff and is_superuser flags
@@ -83,8 +108,56 @@ class CustomUser(AbstractUser):
 
         super().save(*args, **kwargs)
 
+        # Drop the cached row served to request.user by CachedModelBackend
+        from .backends import invalidate_cached_user
+        invalidate_cached_user(self.pk)
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the user and drops its cached row.
+        """
+        from .backends import invalidate_cached_user
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_cached_user(user_id)
+        return result
+
     def __str__(self):
         """
         String representation of the user, showing the username.
         """
         return self.username
+
+
+class ActivitySummary(models.Model):
+    """
+    Precomputed activity of a user, rendered by the profile page.
+
+    Counters and the list of recent items are maintained incrementally as the
+    user joins rides, organizes them, posts and comments (see `users.activity`),
+    so the profile reads this one row instead of counting and listing every
+    related table.
+    """
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='activity',
+    )
+    joined_count = models.PositiveIntegerField(default=0, help_text="Events the user has currently joined.")
+    organized_count = models.PositiveIntegerField(default=0, help_text="Events the user organizes.")
+    post_count = models.PositiveIntegerField(default=0, help_text="Bike posts of the user.")
+    comment_count = models.PositiveIntegerField(default=0, help_text="Comments of the user.")
+    recent = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Latest items, newest first: {'kind', 'id', 'title', 'at'} dicts.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Activity Summary"
+        verbose_name_plural = "Activity Summaries"
+
+    def __str__(self):
+        return f"Activity of {self.user_id}"
@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from bike_connect.apps.events import participation
+from bike_connect.apps.events.models import Event, Participation
+from bike_connect.apps.events.transfer import import_events
+from bike_connect.apps.posts.models import BikePost, Comment
+from bike_connect.apps.users import activity
+from bike_connect.apps.users.models import ActivitySummary
+
+User = get_user_model()
+
+
+class ActivitySummaryTest(TestCase):
+    """
+    Tests for the incrementally maintained activity summaries.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.other = User.objects.create_user(username='organizer', password='password123')
+        self.event = Event.objects.create(
+            title="Vitosha loop", description="Group ride", location="Sofia",
+            date=date.today() + timedelta(days=3), organizer=self.other,
+        )
+        self.summary = activity.get_summary(self.user)
+
+    def assertCounts(self, joined=0, organized=0, posts=0, comments=0):
+        summary = ActivitySummary.objects.get(user=self.user)
+        self.assertEqual(
+            (summary.joined_count, summary.organized_count, summary.post_count, summary.comment_count),
+            (joined, organized, posts, comments),
+        )
+        # The incremental updates agree with a full rebuild
+        rebuilt = activity.rebuild(self.user.pk)
+        self.assertEqual(
+            (rebuilt.joined_count, rebuilt.organized_count, rebuilt.post_count, rebuilt.comment_count),
+            (joined, organized, posts, comments),
+        )
+        self.assertEqual([(i['kind'], i['id']) for i in rebuilt.recent], [(i['kind'], i['id']) for i in summary.recent])
+        return summary
+
+    def test_join_and_leave(self):
+        self.assertEqual(participation.join(self.user, self.event.pk), participation.JOINED)
+        summary = self.assertCounts(joined=1)
+        self.assertEqual(summary.recent[0]['title'], "Vitosha loop")
+
+        participation.leave(self.user, self.event.pk)
+        self.assertEqual(self.assertCounts().recent, [])
+
+        # Participations written around the service go through the signals
+        Participation.objects.filter(user=self.user).delete()
+        Participation.objects.create(user=self.user, event=self.event)
+        self.assertCounts(joined=1)
+        Participation.objects.filter(user=self.user).delete()
+        self.assertCounts()
+
+    def test_posts_comments_and_events(self):
+        post = BikePost.objects.create(title="Steel frame", description="54cm", category='sell', posted_by=self.user)
+        Comment.objects.create(text="Still for sale?", bike_post=post, posted_by=self.user)
+        Event.objects.create(
+            title="Night ride", description="Lights on", location="Sofia", date=date.today(), organizer=self.user,
+        )
+        summary = self.assertCounts(organized=1, posts=1, comments=1)
+        self.assertEqual([item['kind'] for item in summary.recent], ['organized', 'comment', 'post'])
+        self.assertEqual(summary.recent[1]['target'], post.pk)
+
+        # Deleting the post takes its comments along
+        post.delete()
+        self.assertCounts(organized=1)
+
+    def test_event_handed_to_another_organizer(self):
+        event = Event.objects.create(
+            title="Night ride", description="Lights on", location="Sofia", date=date.today(), organizer=self.user,
+        )
+        self.assertCounts(organized=1)
+        event.organizer = self.other
+        event.save()
+        self.assertCounts()
+        self.assertEqual(ActivitySummary.objects.get(user=self.other).organized_count, 2)
+
+    def test_imported_events(self):
+        rows = [(i, {'title': f"Ride {i}", 'description': "Ride", 'date': '2030-01-01', 'location': "Sofia"})
+                for i in range(2)]
+        import_events(rows, organizer=self.user)
+        summary = self.assertCounts(organized=2)
+        self.assertEqual({item['title'] for item in summary.recent}, {"Ride 0", "Ride 1"})
+
+    def test_recent_list_is_bounded(self):
+        for i in range(activity.RECENT_ITEMS + 2):
+            BikePost.objects.create(title=f"Wheel {i}", description="700c", category='sell', posted_by=self.user)
+        summary = self.assertCounts(posts=activity.RECENT_ITEMS + 2)
+        self.assertEqual(len(summary.recent), activity.RECENT_ITEMS)
+        self.assertEqual(summary.recent[0]['title'], f"Wheel {activity.RECENT_ITEMS + 1}")
+
+        # Removing a listed item refills the list from the older ones
+        BikePost.objects.filter(title=f"Wheel {activity.RECENT_ITEMS + 1}").delete()
+        self.assertEqual(len(self.assertCounts(posts=activity.RECENT_ITEMS + 1).recent), activity.RECENT_ITEMS)
+
+    def test_deleting_the_user(self):
+        participation.join(self.user, self.event.pk)
+        BikePost.objects.create(title="Steel frame", description="54cm", category='sell', posted_by=self.user)
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertFalse(ActivitySummary.objects.filter(user_id=user_id).exists())
+
+        # Organizers' events go with them, and leave the participants' summaries consistent
+        participation.join(self.other, self.event.pk)
+        self.event.delete()
+        self.assertEqual(ActivitySummary.objects.get(user=self.other).joined_count, 0)
+
+    def test_profile_page(self):
+        participation.join(self.user, self.event.pk)
+        BikePost.objects.create(title="Steel frame", description="54cm", category='sell', posted_by=self.user)
+        self.client.force_login(self.user)
+        self.client.get(reverse('users:profile'))
+        # The summary row and the upcoming events; the session and user are cached
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('users:profile'))
+        self.assertContains(response, "1 joined")
+        self.assertContains(response, "Vitosha loop", count=2)
+        self.assertContains(response, reverse('posts:bikepost_detail', args=[BikePost.objects.get().pk]))
+
+    def test_rebuild_command(self):
+        BikePost.objects.bulk_create([
+            BikePost(title="Steel frame", description="54cm", category='sell', posted_by=self.user),
+        ])
+        call_command('rebuild_activity', stdout=StringIO())
+        self.assertEqual(ActivitySummary.objects.get(user=self.user).post_count, 1)
+        self.assertEqual(ActivitySummary.objects.count(), 2)
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bike_connect.apps.users.backends import CachedModelBackend, user_cache_key
+from bike_connect.apps.users.middleware import auth_query_stats, reset_auth_query_stats
+
+User = get_user_model()
+
+
+class CachedUserTest(TestCase):
+    """
+    Tests for the cached session / user fast path.
+    """
+
+    def setUp(self):
+        caches['sessions'].clear()
+        reset_auth_query_stats()
+        self.user = User.objects.create_user(username='rider', password='password123')
+        self.client.login(username='rider', password='password123')
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return [
+            query['sql'] for query in context.captured_queries
+            if 'django_session' in query['sql'] or 'users_customuser' in query['sql']
+        ]
+
+    def test_warm_request_runs_no_auth_queries(self):
+        self.client.get(reverse('home'))
+        self.assertEqual(self.auth_queries(reverse('home')), [])
+        stats = auth_query_stats()
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['zero_auth_queries'], 1)
+
+    def test_cached_user_is_a_full_instance(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = backend.get_user(self.user.pk)
+        self.assertEqual(user, self.user)
+        self.assertFalse(user._state.adding)
+        self.assertEqual(user.profile_picture.name, 'profile_pictures/default.jpg')
+
+    def test_save_invalidates_cached_user(self):
+        self.client.get(reverse('home'))
+        self.assertIsNotNone(caches['sessions'].get(user_cache_key(self.user.pk)))
+        self.user.first_name = "Ivan"
+        self.user.save()
+        self.assertIsNone(caches['sessions'].get(user_cache_key(self.user.pk)))
+
+    def test_deactivated_user_is_logged_out(self):
+        self.client.get(reverse('home'))
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('home'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
@@ -9,5 +9,6 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),                  # Logout functionality
     path('profile/', views.profile_view, name='profile'),                   # Profile page
     path('profile/edit/', views.edit_profile_view, name='edit_profile'),          # Edit profile page
+    path('profile/feeds/reset/', views.reset_feed_links_view, name='reset_feed_links'),  # Replace feed links
     path('password/change/', views.change_password_view, name='change_password'),     # Change password page
 ]
@@ -5,6 +5,10 @@ from .forms import CustomUserCreationForm, UserEditForm  # Import custom forms
 from django.contrib import messages  # Import messages framework for user notifications
 from django.conf import settings  # Import settings to access LOGIN_REDIRECT_URL
 from django.contrib.auth.decorators import login_required  # Import decorator to restrict access to logged-in users
+from django.views.decorators.http import require_POST  # Restrict state-changing views to POST
+from bike_connect.apps.events.feeds import FEED_KINDS, feed_url  # Personal calendar feed links
+from bike_connect.apps.core.profiling import query_budget  # Caps the queries a view may run
+from .activity import get_summary, upcoming_events  # Precomputed activity summary
 
 
 def login_view(request):
@@ -67,13 +71,21 @@ def logout_view(request):
 
 
 @login_required
+@query_budget(max_queries=2, max_duplicates=0)
 def profile_view(request):
     """
     Displays the user's profile. Requires the user to be logged in.
+
+    The activity counters and recent items come from the user's precomputed
+    summary row; only the upcoming joined events are queried, with a limit.
     """
     return render(request, 'users/profile.html', {
         'user': request.user,
-        'background_image': 'static/images/profile/login_bike.jpg'
+        'summary': get_summary(request.user),
+        'upcoming_events': upcoming_events(request.user),
+        'background_image': 'static/images/profile/login_bike.jpg',
+        # Subscribable calendar URLs (the token in them is the credential)
+        'feed_urls': {kind: feed_url(request, request.user, kind) for kind in FEED_KINDS},
     })
 
 
@@ -100,6 +112,17 @@ def edit_profile_view(request):
     })
 
 
+@login_required
+@require_POST
+def reset_feed_links_view(request):
+    """
+    Replaces the user's calendar feed links; the old ones stop working.
+    """
+    request.user.rotate_feed_secret()
+    messages.success(request, "Your calendar feed links have been replaced.")  # Success message
+    return redirect('users:profile')
+
+
 @login_required
 def change_password_view(request):
     """
@@ -0,0 +1,61 @@
+"""
+Builds Django `CACHES` entries from URLs, the way dj_database_url does for databases.
+
+Supported schemes:
+    locmem://[name]          Per-process memory; each alias gets its own store.
+    file:///absolute/path    Files shared by every worker of a single node.
+    db://table_name          A table in the default database (run `createcachetable`).
+    redis://host:port/db     Redis, shared by every node (`rediss://` for TLS).
+    dummy://                 Caches nothing.
+
+Query parameters `timeout`, `max_entries` and `cull_frequency` are passed on to
+the backend, e.g. `file:///var/tmp/bike_connect?timeout=600&max_entries=5000`.
+"""
+from urllib.parse import parse_qs, urlsplit
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+# Query parameters that end up in OPTIONS rather than at the top level
+OPTION_PARAMS = ('max_entries', 'cull_frequency')
+
+
+def parse_cache_url(url, alias='default'):
+    """
+    Returns the `CACHES` entry described by the URL.
+
+    Args:
+        url: Cache URL, see the module docstring for the supported schemes.
+        alias: Name of the cache; used as key prefix and as the default
+            LocMem location so that named caches never share keys.
+
+    Raises:
+        ValueError: If the scheme is not supported.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ValueError(f"Unsupported cache URL scheme: {url!r}")
+
+    config = {'BACKEND': BACKENDS[parts.scheme], 'KEY_PREFIX': alias}
+    if parts.scheme == 'locmem':
+        config['LOCATION'] = parts.netloc or alias
+    elif parts.scheme == 'file':
+        config['LOCATION'] = parts.netloc + parts.path
+    elif parts.scheme == 'db':
+        config['LOCATION'] = parts.netloc or 'cache_table'
+    elif parts.scheme in ('redis', 'rediss'):
+        config['LOCATION'] = parts._replace(query='').geturl()
+
+    params = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+    if 'timeout' in params:
+        config['TIMEOUT'] = int(params.pop('timeout'))
+    options = {name: int(params.pop(name)) for name in OPTION_PARAMS if name in params}
+    if options:
+        config['OPTIONS'] = options
+    return config
@@ -0,0 +1,78 @@
+"""
+Connection pooling for the PostgreSQL backend (psycopg 3 with psycopg_pool).
+
+Without a pool every gunicorn worker thread keeps its own connection, and a
+new TLS connection costs several round trips. With `OPTIONS["pool"]` Django
+borrows a connection from a per-process pool for each request and returns it
+afterwards, so a handful of connections serve all threads of a worker.
+
+Other engines (SQLite in development and tests) are left unpooled and use
+persistent connections with Django's own health checks.
+"""
+
+POSTGRESQL_ENGINES = ('django.db.backends.postgresql',)
+
+# psycopg_pool.ConnectionPool.get_stats() counters shown on the admin page
+STAT_KEYS = (
+    'pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting',
+    'requests_num', 'requests_queued', 'requests_wait_ms', 'requests_errors',
+    'connections_num', 'connections_ms', 'connections_errors', 'connections_lost',
+)
+
+
+def configure_database(database, pool=True, min_size=2, max_size=10, timeout=10.0, max_idle=600.0,
+                       max_lifetime=3600.0, health_checks=True):
+    """
+    Adds connection pooling (or persistent-connection health checks) to a
+    `DATABASES` entry, e.g. one built by dj_database_url.
+
+    Args:
+        database: The `DATABASES` entry; modified in place and returned.
+        pool: Pool PostgreSQL connections. Without a pool, connections persist
+            for the entry's CONN_MAX_AGE.
+        min_size / max_size: Connections kept open / opened at most, per process.
+        timeout: Seconds a request waits for a free connection before failing.
+        max_idle: Seconds an unused connection above `min_size` is kept.
+        max_lifetime: Seconds after which a connection is replaced.
+        health_checks: Check a connection is alive before handing it out.
+    """
+    # With a pool, Django passes the health checks on to psycopg_pool, which
+    # tests a connection before lending it and replaces it if the server or a
+    # load balancer closed it
+    database['CONN_HEALTH_CHECKS'] = health_checks
+    if not pool or database.get('ENGINE') not in POSTGRESQL_ENGINES:
+        return database
+
+    database.setdefault('OPTIONS', {})['pool'] = {
+        'min_size': min_size,
+        'max_size': max_size,
+        'timeout': timeout,
+        'max_idle': max_idle,
+        'max_lifetime': max_lifetime,
+    }
+    # The pool owns the connections: Django must return them after every request
+    database['CONN_MAX_AGE'] = 0
+    return database
+
+
+def pool_stats():
+    """
+    Returns the pool counters of this process, per database alias.
+
+    Aliases without a pool are listed with `pooled: False`. Pools are created
+    when first used, so a process that has not queried a database yet reports
+    an empty pool.
+    """
+    from django.db import connections
+
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+            stats[alias] = {'pooled': False, 'vendor': connection.vendor}
+            continue
+        counters = connection.pool.get_stats()
+        stats[alias] = {
+            'pooled': True, 'vendor': connection.vendor, **{key: counters.get(key, 0) for key in STAT_KEYS},
+        }
+    return stats
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
 from decouple import config
 
+from bike_connect.cache_urls import parse_cache_url
+from bike_connect.db_pool import configure_database
+
 # ──────────────────────────────
 # Paths
 # ──────────────────────────────
@@ -74,17 +78,32 @@ if all((CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET)):
         "API_KEY": CLOUDINARY_API_KEY,
         "API_SECRET": CLOUDINARY_API_SECRET,
     }
-    DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
+    MEDIA_STORAGE_BACKEND = "cloudinary_storage.storage.MediaCloudinaryStorage"
 else:
-    DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
+    MEDIA_STORAGE_BACKEND = "django.core.files.storage.FileSystemStorage"
+
+# ──────────────────────────────
+# Storages
+# ──────────────────────────────
+# `media` holds the uploaded images (and their processed variants) of every
+# model; see bike_connect.apps.core.images.media_storage. Static files are
+# compressed and fingerprinted by WhiteNoise at collectstatic time.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+    "media": {"BACKEND": MEDIA_STORAGE_BACKEND},
+}
 
 # ──────────────────────────────
 # Middleware
 # ──────────────────────────────
 MIDDLEWARE: list[str] = [
+    "bike_connect.apps.core.profiling.QueryProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "bike_connect.apps.users.middleware.AuthQueryMetricsMiddleware",
+    "bike_connect.apps.core.replicas.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -133,21 +152,78 @@ TEMPLATES: list[dict] = [
 # ──────────────────────────────
 # Database
 # ──────────────────────────────
+# PostgreSQL connections are pooled per process (see bike_connect.db_pool);
+# SQLite keeps persistent connections. Health checks test a connection before
+# it is reused, so connections dropped by the server are replaced.
+DATABASE_CONNECTION_OPTIONS = {
+    "pool": config("DATABASE_POOL", default=True, cast=bool),
+    "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+    "max_size": config("DATABASE_POOL_MAX_SIZE", default=10, cast=int),
+    "timeout": config("DATABASE_POOL_TIMEOUT", default=10.0, cast=float),
+    "max_idle": config("DATABASE_POOL_MAX_IDLE", default=600.0, cast=float),
+    "max_lifetime": config("DATABASE_POOL_MAX_LIFETIME", default=3600.0, cast=float),
+    "health_checks": config("CONN_HEALTH_CHECKS", default=True, cast=bool),
+}
 DATABASES = {
-    "default": dj_database_url.config(
-        default="sqlite:///db.sqlite3",
-        conn_max_age=600,
-        ssl_require=not DEBUG,
+    "default": configure_database(
+        dj_database_url.config(
+            default="sqlite:///db.sqlite3",
+            conn_max_age=config("CONN_MAX_AGE", default=600, cast=int),
+            ssl_require=not DEBUG,
+        ),
+        **DATABASE_CONNECTION_OPTIONS,
     )
 }
 
+# Read replica: list pages and API reads are answered from it (see
+# bike_connect.apps.core.replicas); writes always go to "default". Locally,
+# a copy of the SQLite file can stand in for it.
+DATABASE_REPLICA_URL: str = config("DATABASE_REPLICA_URL", default="")
+DATABASE_REPLICA_ALIAS: str = "replica" if DATABASE_REPLICA_URL else ""
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = configure_database(
+        dj_database_url.parse(
+            DATABASE_REPLICA_URL,
+            conn_max_age=config("CONN_MAX_AGE", default=600, cast=int),
+            ssl_require=not DEBUG,
+        ),
+        **DATABASE_CONNECTION_OPTIONS,
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS: list[str] = ["bike_connect.apps.core.replicas.ReplicaRouter"]
+# Seconds a client reads from the primary after a write, so it sees its own
+# changes while the replica catches up
+REPLICA_PIN_SECONDS: int = config("REPLICA_PIN_SECONDS", default=15, cast=int)
+
+# ──────────────────────────────
+# Caches
+# ──────────────────────────────
+# Every named cache is configured by a URL (see bike_connect/cache_urls.py):
+#   locmem://               per-process memory (development, tests)
+#   file:///var/tmp/bc      shared by the workers of a single node
+#   db://cache_table        shared through the database (run `createcachetable`)
+#   redis://host:6379/1     shared by every node (needs the `redis` package)
+# CACHE_URL configures `default`; <ALIAS>_CACHE_URL overrides a named cache.
+CACHE_URL: str = config("CACHE_URL", default="locmem://")
+CACHE_ALIASES = ("default", "sessions", "fragments")
+CACHES = {
+    alias: parse_cache_url(
+        CACHE_URL if alias == "default" else config(f"{alias.upper()}_CACHE_URL", default=CACHE_URL),
+        alias,
+    )
+    for alias in CACHE_ALIASES
+}
+# Calendar feed stamps and bodies, and the image manifests read in front of
+# their table, are kept apart from the fragments
+FEED_CACHE_ALIAS = "default"
+IMAGE_CACHE_ALIAS = "default"
+
 # ──────────────────────────────
 # Static / Media
 # ──────────────────────────────
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -156,6 +232,18 @@ MEDIA_ROOT = BASE_DIR / "media"
 # Authentication
 # ──────────────────────────────
 AUTH_USER_MODEL = "users.CustomUser"
+# The cached backend serves request.user from the "sessions" cache; ModelBackend
+# stays listed so that sessions created before the switch remain valid
+AUTHENTICATION_BACKENDS = [
+    "bike_connect.apps.users.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+# Seconds a user row is cached; CustomUser.save() drops it earlier
+USER_CACHE_TIMEOUT: int = config("USER_CACHE_TIMEOUT", default=60, cast=int)
+
+# Sessions are read from the "sessions" cache and written through to the database
+SESSION_ENGINE: str = config("SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db")
+SESSION_CACHE_ALIAS = "sessions"
 LOGIN_URL = "users:login"
 LOGIN_REDIRECT_URL = "users:profile"
 LOGOUT_REDIRECT_URL = "home"
@@ -193,9 +281,109 @@ LOGGING = {
     },
 }
 
+# ──────────────────────────────
+# News view counter
+# ──────────────────────────────
+# Seconds between automatic flushes of buffered news views to the database
+NEWS_VIEWS_FLUSH_INTERVAL: int = config("NEWS_VIEWS_FLUSH_INTERVAL", default=60, cast=int)
+
+# ──────────────────────────────
+# Fragment and list caches
+# ──────────────────────────────
+# Seconds cached page fragments and list pages stay fresh; saves invalidate
+# them earlier through model version stamps
+FRAGMENT_CACHE_TIMEOUT: int = config("FRAGMENT_CACHE_TIMEOUT", default=300, cast=int)
+LIST_CACHE_TIMEOUT: int = config("LIST_CACHE_TIMEOUT", default=300, cast=int)
+# Empty lists (e.g. searches without results) are cached for a shorter time
+LIST_CACHE_EMPTY_TIMEOUT: int = config("LIST_CACHE_EMPTY_TIMEOUT", default=30, cast=int)
+# Calendar feeds are cached until a participation or event change bumps their
+# version stamp; feeds above the size limit are streamed uncached
+FEED_CACHE_TIMEOUT: int = config("FEED_CACHE_TIMEOUT", default=24 * 3600, cast=int)
+FEED_CACHE_MAX_BYTES: int = config("FEED_CACHE_MAX_BYTES", default=1024 * 1024, cast=int)
+
+# ──────────────────────────────
+# Query profiling
+# ──────────────────────────────
+# Records query count, DB time and duplicated SQL per request, reported as a
+# Server-Timing header and a log line on the "bike_connect.queries" logger
+QUERY_PROFILING: bool = config("QUERY_PROFILING", default=False, cast=bool)
+# Raise instead of logging a warning when a view exceeds its query budget
+QUERY_BUDGET_RAISE: bool = config("QUERY_BUDGET_RAISE", default=False, cast=bool)
+
+# ──────────────────────────────
+# Fast JSON API
+# ──────────────────────────────
+# Read-only JSON list/detail responses are built from .values() rows instead of
+# serializer instances; the output is identical either way
+FAST_JSON_API: bool = config("FAST_JSON_API", default=True, cast=bool)
+# Encode with orjson when it is installed
+FAST_JSON_USE_ORJSON: bool = config("FAST_JSON_USE_ORJSON", default=True, cast=bool)
+
+# ──────────────────────────────
+# Async views
+# ──────────────────────────────
+# Threads of the pool async views hand storage uploads to. Uploads wait on the
+# network, not the CPU, so the pool is much larger than the default executor
+UPLOAD_THREADS: int = config("UPLOAD_THREADS", default=32, cast=int)
+
+# ──────────────────────────────
+# Image pipeline
+# ──────────────────────────────
+# Uploads above these limits are rejected by the form
+IMAGE_MAX_UPLOAD_BYTES: int = config("IMAGE_MAX_UPLOAD_BYTES", default=10 * 1024 * 1024, cast=int)
+IMAGE_MAX_PIXELS: int = config("IMAGE_MAX_PIXELS", default=40_000_000, cast=int)
+# Stored originals are re-encoded without metadata and capped to this size
+IMAGE_MAX_DIMENSION: int = config("IMAGE_MAX_DIMENSION", default=2560, cast=int)
+# Thumbnails and responsive variants are rendered by a background pool after
+# the upload is committed; eager processing renders them inline instead
+IMAGE_WORKERS: int = config("IMAGE_WORKERS", default=2, cast=int)
+IMAGE_PROCESSING_EAGER: bool = config("IMAGE_PROCESSING_EAGER", default=False, cast=bool)
+# Variant manifests are stored in the database and read through the cache;
+# images without variants are looked up again after this many seconds
+IMAGE_MANIFEST_MISS_TIMEOUT: int = config("IMAGE_MANIFEST_MISS_TIMEOUT", default=300, cast=int)
+# Resolved media URLs are memoized per process (least recently used evicted)
+IMAGE_URL_CACHE_SIZE: int = config("IMAGE_URL_CACHE_SIZE", default=10_000, cast=int)
+IMAGE_URL_CACHE_TIMEOUT: int = config("IMAGE_URL_CACHE_TIMEOUT", default=3600, cast=int)
+
+# ──────────────────────────────
+# Chunked uploads
+# ──────────────────────────────
+# Partial uploads are assembled here; every web process must see the same
+# directory. Empty means a folder in the system temp directory.
+UPLOAD_CHUNK_DIR: str = config("UPLOAD_CHUNK_DIR", default="")
+# Largest chunk accepted per request, and how long unfinished uploads are kept
+UPLOAD_CHUNK_SIZE: int = config("UPLOAD_CHUNK_SIZE", default=5 * 1024 * 1024, cast=int)
+UPLOAD_EXPIRY: int = config("UPLOAD_EXPIRY", default=24 * 3600, cast=int)
+
+# ──────────────────────────────
+# Geocoding
+# ──────────────────────────────
+# CSV of places (name, latitude, longitude, aliases) locations are geocoded
+# from; empty means the gazetteer bundled with bike_connect.apps.core
+GEO_GAZETTEER: str = config("GEO_GAZETTEER", default="")
+
 # ──────────────────────────────
 # Custom flags for CI / tests
 # ──────────────────────────────
 if os.getenv("GITHUB_ACTIONS") == "true":
-    DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    # The test database is a file, and transactions take the write lock when
+    # they begin, so that threads in TransactionTestCases wait on each other
+    # instead of failing with "database is locked" as in-memory SQLite does
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+        "TEST": {"NAME": os.path.join(tempfile.gettempdir(), "bike_connect_test.sqlite3")},
+    }
+    # The replica mirrors the test database; tests opt in to routing with
+    # override_settings(DATABASE_REPLICA_ALIAS="replica")
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICA_ALIAS = ""
     PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    # Images are written to a scratch directory instead of Cloudinary
+    STORAGES["media"] = {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": os.path.join(tempfile.gettempdir(), "bike_connect_test_media")},
+    }
+    # Tests run without collectstatic, so there is no manifest to read
+    STORAGES["staticfiles"] = {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}
@@ -8,6 +8,8 @@ from rest_framework.routers import DefaultRouter
 from bike_connect.apps.events.views import EventViewSet  # Event API viewset
 from bike_connect.apps.users.views import logout_view   # Custom logout view
 from bike_connect.apps.core.views import landing_page, custom_404_view  # Landing page and custom 404 view
+from bike_connect.apps.core.api_views import SearchAPI  # Unified search API
+from bike_connect.apps.core.admin_views import cache_stats_view  # Cache statistics admin page
 from bike_connect.apps.posts import views               # Placeholder import for clarity
 
 # -------------------------------
@@ -28,6 +30,9 @@ urlpatterns = [
     # Core app URLs (e.g., http://127.0.0.1:8000/core/)
     path('core/', include('bike_connect.apps.core.urls')),
 
+    # Cache statistics for staff (e.g., http://127.0.0.1:8000/admin/cache-stats/)
+    path('admin/cache-stats/', cache_stats_view, name='admin_cache_stats'),
+
     # Admin panel (e.g., http://127.0.0.1:8000/admin/)
     path('admin/', admin.site.urls),
 
@@ -43,6 +48,9 @@ urlpatterns = [
     # Custom logout route (e.g., http://127.0.0.1:8000/logout/)
     path('logout/', logout_view, name='logout'),
 
+    # Unified search API (e.g., http://127.0.0.1:8000/api/search/?q=gravel)
+    path('api/search/', SearchAPI.as_view(), name='api_search'),
+
     # REST API endpoints (e.g., http://127.0.0.1:8000/api/events/)
     path('api/', include(router.urls)),
 ]